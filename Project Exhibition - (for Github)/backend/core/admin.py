@@ -1,7 +1,13 @@
 from django.contrib import admin
-from .models import Faculty, Student, Project, Application
+from .models import Faculty, Student, Project, Application, Job
 
 admin.site.register(Faculty)
 admin.site.register(Student)
 admin.site.register(Project)
 admin.site.register(Application)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'attempts', 'run_after', 'created_at')
+    list_filter = ('status', 'kind')
@@ -0,0 +1,195 @@
+import heapq
+from collections import Counter, defaultdict, deque, namedtuple
+
+from django.db import transaction
+
+from . import events
+from .counters import rebuild_counters
+from .models import Application, Project
+
+
+# Batch allocation of students to projects.
+#
+# Student-proposing deferred acceptance (Gale-Shapley):
+#   * students rank their applications by `priority` (1 = first choice)
+#   * projects rank applicants by faculty preference: shortlisted first, then
+#     higher CGPA, then earlier application
+#   * each approved project accepts up to `seats` students
+# The result is stable and student-optimal, and fully deterministic because
+# every tie is broken by application id. Applications already `selected` by a
+# faculty member are kept and consume a seat; `rejected` ones are ignored.
+#
+# All rows are loaded with one values_list() query and written back with a
+# handful of set-based UPDATEs in a single transaction.
+
+App = namedtuple('App', 'id student_id project_id priority cgpa status applied_at')
+
+CHUNK_SIZE = 900  # stays under SQLite's bound-parameter limit
+
+
+def faculty_preference(app):
+    return (
+        app.status != 'shortlisted',
+        app.cgpa is None,
+        -(app.cgpa or 0.0),
+        app.applied_at,
+        app.id,
+    )
+
+
+def student_preference(app):
+    return (app.priority, app.applied_at, app.id)
+
+
+def stable_match(apps, capacities):
+    """Return the set of application ids accepted by deferred acceptance.
+
+    `apps` is an iterable of App, `capacities` maps project id -> free seats.
+    """
+    by_student = defaultdict(list)
+    by_project = defaultdict(list)
+    for app in apps:
+        by_student[app.student_id].append(app)
+        by_project[app.project_id].append(app)
+
+    # Turn each project's preference order into an integer rank (0 = best)
+    rank = {}
+    for project_apps in by_project.values():
+        project_apps.sort(key=faculty_preference)
+        for position, app in enumerate(project_apps):
+            rank[app.id] = position
+
+    for student_apps in by_student.values():
+        student_apps.sort(key=student_preference)
+
+    next_choice = dict.fromkeys(by_student, 0)
+    held = defaultdict(list)  # project id -> max-heap of (-rank, app)
+    free = deque(sorted(by_student))
+
+    while free:
+        student_id = free.popleft()
+        choices = by_student[student_id]
+        index = next_choice[student_id]
+        if index >= len(choices):
+            continue  # exhausted every choice: stays unmatched
+        next_choice[student_id] = index + 1
+
+        app = choices[index]
+        capacity = capacities.get(app.project_id, 0)
+        if capacity <= 0:
+            free.append(student_id)
+            continue
+
+        heap = held[app.project_id]
+        heapq.heappush(heap, (-rank[app.id], app))
+        if len(heap) > capacity:
+            _, bumped = heapq.heappop(heap)
+            free.append(bumped.student_id)
+
+    return {app.id for heap in held.values() for _, app in heap}
+
+
+class AllocationResult:
+    def __init__(self, changes, seats_available, total_applications, total_students, owners=None):
+        self.changes = changes                    # [(application id, old status, new status)]
+        self.owners = owners or {}                # application id -> (student id, project id) (changed only)
+        self.seats_available = seats_available    # project id -> new seats_available (changed only)
+        self.total_applications = total_applications
+        self.total_students = total_students
+        self.committed = False
+
+    def summary(self):
+        transitions = Counter(f"{old}->{new}" for _, old, new in self.changes)
+        new_statuses = Counter(new for _, _, new in self.changes)
+        return {
+            "committed": self.committed,
+            "applications": self.total_applications,
+            "students": self.total_students,
+            "changed": len(self.changes),
+            "selected": new_statuses.get("selected", 0),
+            "rejected": new_statuses.get("rejected", 0),
+            "transitions": dict(sorted(transitions.items())),
+            "projects_updated": len(self.seats_available),
+        }
+
+
+def compute_allocation():
+    """Compute the allocation without writing anything (dry run)."""
+    projects = {}
+    current_seats = {}
+    for pid, seats, seats_available in Project.objects.filter(is_approved=True).values_list(
+        'id', 'seats', 'seats_available'
+    ):
+        projects[pid] = seats
+        current_seats[pid] = seats_available
+    apps = [
+        App(*row) for row in Application.objects.filter(
+            project__is_approved=True
+        ).exclude(status='rejected').values_list(
+            'id', 'student_id', 'project_id', 'priority', 'cgpa', 'status', 'applied_at'
+        ).order_by('id')
+    ]
+
+    # Faculty selections are final: they keep their seat and take the student out of the pool
+    fixed_students = {app.student_id for app in apps if app.status == 'selected'}
+    fixed_seats = Counter(app.project_id for app in apps if app.status == 'selected')
+    capacities = {pid: seats - fixed_seats[pid] for pid, seats in projects.items()}
+    pool = [app for app in apps if app.student_id not in fixed_students]
+
+    accepted = stable_match(pool, capacities)
+
+    changes, owners = [], {}
+    selected_per_project = Counter(fixed_seats)
+    for app in apps:
+        if app.status == 'selected':
+            continue
+        new_status = 'selected' if app.id in accepted else 'rejected'
+        if new_status == 'selected':
+            selected_per_project[app.project_id] += 1
+        if new_status != app.status:
+            changes.append((app.id, app.status, new_status))
+            owners[app.id] = (app.student_id, app.project_id)
+
+    # Only projects whose seats_available actually changes are written back
+    seats_available = {}
+    for pid, seats in projects.items():
+        remaining = max(seats - selected_per_project[pid], 0)
+        if remaining != current_seats[pid]:
+            seats_available[pid] = remaining
+    return AllocationResult(
+        changes, seats_available,
+        total_applications=len(apps),
+        total_students=len({app.student_id for app in apps}),
+        owners=owners,
+    )
+
+
+def run_allocation(commit=False):
+    """Compute the allocation and, if `commit`, apply it in one transaction."""
+    if not commit:
+        return compute_allocation()
+
+    with transaction.atomic():
+        # Computed inside the transaction so it sees a consistent snapshot
+        result = compute_allocation()
+
+        for new_status in ('selected', 'rejected'):
+            ids = [app_id for app_id, _, status in result.changes if status == new_status]
+            for start in range(0, len(ids), CHUNK_SIZE):
+                Application.objects.filter(pk__in=ids[start:start + CHUNK_SIZE]).update(status=new_status)
+
+        projects = [
+            Project(pk=pid, seats_available=seats)
+            for pid, seats in result.seats_available.items()
+        ]
+        Project.objects.bulk_update(projects, ['seats_available'], batch_size=CHUNK_SIZE // 2)
+
+        # Status changes went through set-based UPDATEs, so recount rather than increment
+        rebuild_counters()
+        events.publish_many(
+            events.application_status(app_id, *result.owners[app_id], new_status)
+            for app_id, _, new_status in result.changes
+        )
+
+    result.committed = True
+    return result
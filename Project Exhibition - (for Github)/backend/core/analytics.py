@@ -0,0 +1,190 @@
+from collections import namedtuple
+
+from django.db.models import Count, Max, Min, Q, Sum
+from django.utils import timezone
+
+from .models import Application, Project
+
+
+# Application analytics for admins (GET /api/admin/analytics/).
+#
+# Demand per project (applications vs seats, oversubscription), CGPA
+# distributions and priority-rank histograms per project and department.
+#
+# Every per-project figure comes out of one GROUP BY project over the
+# applications table: the histograms are conditional counts (COUNT ... FILTER
+# / CASE), so the table is scanned once whatever the number of buckets. The
+# projects themselves are a second, narrow query; departments and totals are
+# sums over the per-project rows, in Python (a few thousand rows at most).
+#
+# The view caches the rendered report under the response cache version
+# (core/response_cache.py), which every Application / Project write bumps:
+# a report is computed once per write burst, not once per request.
+
+# Bucket edges: <5, 5-6, 6-7, 7-8, 8-9, >=9 (CGPA on a 10-point scale)
+CGPA_EDGES = (5, 6, 7, 8, 9)
+CGPA_LABELS = ['<5', '5-6', '6-7', '7-8', '8-9', '9-10']
+# Students rank their applications 1-3; anything else lands in 'other'
+PRIORITIES = (1, 2, 3)
+PRIORITY_LABELS = [str(priority) for priority in PRIORITIES] + ['other']
+
+ProjectStats = namedtuple('ProjectStats', 'applications selected cgpa_count cgpa_sum cgpa_min cgpa_max cgpa priority')
+
+
+def _cgpa_filters():
+    bounds = [None, *CGPA_EDGES, None]
+    filters = []
+    for low, high in zip(bounds, bounds[1:]):
+        condition = Q(cgpa__isnull=False)
+        if low is not None:
+            condition &= Q(cgpa__gte=low)
+        if high is not None:
+            condition &= Q(cgpa__lt=high)
+        filters.append(condition)
+    return filters
+
+
+def _aggregates():
+    aggregates = {
+        'applications': Count('pk'),
+        'selected': Count('pk', filter=Q(status='selected')),
+        'cgpa_count': Count('cgpa'),
+        'cgpa_sum': Sum('cgpa'),
+        'cgpa_min': Min('cgpa'),
+        'cgpa_max': Max('cgpa'),
+    }
+    for i, condition in enumerate(_cgpa_filters()):
+        aggregates[f'cgpa_{i}'] = Count('pk', filter=condition)
+    for priority in PRIORITIES:
+        aggregates[f'priority_{priority}'] = Count('pk', filter=Q(priority=priority))
+    aggregates['priority_other'] = Count('pk', filter=~Q(priority__in=PRIORITIES))
+    return aggregates
+
+
+def project_stats(department=None):
+    """{project id: ProjectStats} for projects with applications (one query)."""
+    aggregates = _aggregates()
+    rows = Application.objects.all()
+    if department:
+        rows = rows.filter(project__department=department)
+    rows = rows.order_by().values('project_id').annotate(**aggregates).values_list('project_id', *aggregates)
+    buckets, priorities = len(CGPA_LABELS), len(PRIORITY_LABELS)
+    stats = {}
+    for project_id, applications, selected, cgpa_count, cgpa_sum, cgpa_min, cgpa_max, *counts in rows:
+        stats[project_id] = ProjectStats(
+            applications, selected, cgpa_count, cgpa_sum or 0.0, cgpa_min, cgpa_max,
+            counts[:buckets], counts[buckets:buckets + priorities],
+        )
+    return stats
+
+
+def _ratio(part, whole):
+    return round(part / whole, 3) if whole else None
+
+
+def _mean(total, count):
+    return round(total / count, 2) if count else None
+
+
+def _add(into, counts):
+    for i, count in enumerate(counts):
+        into[i] += count
+
+
+class _Tally:
+    """Running sums of ProjectStats over a group of projects (a department, everything)."""
+
+    def __init__(self):
+        self.projects = self.seats = self.seats_available = 0
+        self.applications = self.selected = self.oversubscribed = 0
+        self.cgpa_count, self.cgpa_sum = 0, 0.0
+        self.cgpa = [0] * len(CGPA_LABELS)
+        self.priority = [0] * len(PRIORITY_LABELS)
+
+    def add(self, seats, seats_available, stats):
+        self.projects += 1
+        self.seats += seats
+        self.seats_available += seats_available
+        if stats is None:
+            return
+        self.applications += stats.applications
+        self.selected += stats.selected
+        self.oversubscribed += stats.applications > seats
+        self.cgpa_count += stats.cgpa_count
+        self.cgpa_sum += stats.cgpa_sum
+        _add(self.cgpa, stats.cgpa)
+        _add(self.priority, stats.priority)
+
+    def as_json(self):
+        return {
+            'projects': self.projects,
+            'seats': self.seats,
+            'seats_available': self.seats_available,
+            'applications': self.applications,
+            'selected': self.selected,
+            'oversubscription': _ratio(self.applications, self.seats),
+            'oversubscribed_projects': self.oversubscribed,
+            'cgpa': {
+                'mean': _mean(self.cgpa_sum, self.cgpa_count),
+                'missing': self.applications - self.cgpa_count,
+                'histogram': self.cgpa,
+            },
+            'priority_histogram': self.priority,
+        }
+
+
+def report(department=None, limit=100):
+    """The analytics report; `department` narrows everything to one department.
+
+    Totals and departments cover every matching project; `projects` lists the
+    `limit` most oversubscribed ones that have applications.
+    """
+    projects = Project.objects.order_by()
+    if department:
+        projects = projects.filter(department=department)
+    projects = list(projects.values_list('pk', 'title', 'department', 'status', 'seats', 'seats_available'))
+    stats = project_stats(department)
+
+    total = _Tally()
+    departments = {}
+    demand = []
+    for pk, title, project_department, status, seats, seats_available in projects:
+        item = stats.get(pk)
+        total.add(seats, seats_available, item)
+        departments.setdefault(project_department, _Tally()).add(seats, seats_available, item)
+        if item is not None:
+            demand.append((pk, title, project_department, status, seats, seats_available, item))
+
+    # Most oversubscribed first; projects without seats sort last
+    demand.sort(key=lambda row: (row[4] == 0, -(row[6].applications / (row[4] or 1)), row[0]))
+    return {
+        'generated_at': timezone.now().isoformat(),
+        'cgpa_buckets': CGPA_LABELS,
+        'priority_ranks': PRIORITY_LABELS,
+        'totals': total.as_json(),
+        'departments': [
+            {'department': name, **tally.as_json()} for name, tally in sorted(departments.items())
+        ],
+        'projects': [
+            {
+                'id': pk,
+                'title': title,
+                'department': project_department,
+                'status': status,
+                'seats': seats,
+                'seats_available': seats_available,
+                'applications': item.applications,
+                'selected': item.selected,
+                'oversubscription': _ratio(item.applications, seats),
+                'cgpa': {
+                    'mean': _mean(item.cgpa_sum, item.cgpa_count),
+                    'min': item.cgpa_min,
+                    'max': item.cgpa_max,
+                    'missing': item.applications - item.cgpa_count,
+                    'histogram': item.cgpa,
+                },
+                'priority_histogram': item.priority,
+            }
+            for pk, title, project_department, status, seats, seats_available, item in demand[:limit]
+        ],
+    }
@@ -0,0 +1,253 @@
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .filters import ProjectCatalogueFilter
+from .models import Application, DashboardCounter, Project
+from .pagination import ProjectCursorPagination, ReviewQueuePagination
+from . import eligibility, passwords, replicas, response_cache, throttling, tokens
+from .renderers import json_response
+from .roles import aget_role, aresolve_committee
+from .serializers import (
+    ApplicationListSerializer, DashboardCounterSerializer, ProjectSummarySerializer,
+    ReviewQueueSerializer, login_payload, requested_fields, with_faculty_name,
+)
+from .views import ProjectViewSet
+
+
+# Async views for the read-heavy endpoints (catalogue, my applications,
+# pending review, dashboard). Under ASGI (uvicorn / daphne) a single worker
+# multiplexes many slow clients on the event loop instead of parking a thread
+# per request; every query goes through Django's async ORM. Serializers only
+# touch select_related data, so they never hit the database from async code.
+# Writes stay on the DRF viewsets in core/views.py.
+
+NOT_AUTHENTICATED = {"detail": "Authentication credentials were not provided."}
+PERMISSION_DENIED = {"detail": "You do not have permission to perform this action."}
+INVALID_CREDENTIALS = {"detail": "No active account found with the given credentials"}
+ALLOWED_METHODS = ("GET", "HEAD", "OPTIONS")
+ALLOW = ", ".join(ALLOWED_METHODS)
+
+
+async def authenticate(request):
+    """Return (user, token) from a Bearer JWT or the session, or (None, None)."""
+    parts = request.headers.get("Authorization", "").split()
+    if len(parts) == 2 and parts[0] in jwt_settings.AUTH_HEADER_TYPES:
+        try:
+            token = AccessToken(parts[1])
+        except TokenError:
+            return None, None
+        # Every view here is a read: a token with current claims needs no User row (core/tokens.py)
+        if await tokens.ais_current(token) and settings.JWT_TOKEN_USER:
+            return jwt_settings.TOKEN_USER_CLASS(token), token
+        user = await User.objects.filter(
+            pk=token.get(jwt_settings.USER_ID_CLAIM), is_active=True
+        ).afirst()
+        return user, token
+
+    user = await request.auser()
+    return (user, None) if user.is_authenticated else (None, None)
+
+
+def throttled(wait):
+    retry_after = throttling.retry_after(wait)
+    return json_response(
+        {"detail": f"Request was throttled. Expected available in {retry_after} seconds."},
+        status=429, headers={"Retry-After": retry_after},
+    )
+
+
+def read_endpoint(role=None, throttle_scope=None, replica=False):
+    """Read-only async view (GET, HEAD, OPTIONS) with JWT/session auth, an optional required role and token buckets.
+
+    HEAD answers like GET without the body; OPTIONS describes the view, as
+    DRF's metadata does. With `replica`, the view's queries go to the read
+    replica unless the user has just written (core/replicas.py);
+    authentication and roles always use the primary.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ALLOWED_METHODS:
+                return json_response(
+                    {"detail": f'Method "{request.method}" not allowed.'}, status=405, headers={"Allow": ALLOW},
+                )
+            user, token = await authenticate(request)
+            if user is None:
+                return json_response(NOT_AUTHENTICATED, status=401)
+            # Same buckets as the DRF views (core/throttling.py)
+            for scope in ("user", throttle_scope):
+                wait = throttling.take(scope, user.pk) if scope else 0
+                if wait:
+                    return throttled(wait)
+            user_role = await aget_role(user, token)
+            if role is not None and user_role.role != role:
+                return json_response(PERMISSION_DENIED, status=403)
+            if request.method == "OPTIONS":
+                return json_response({
+                    "name": view.__name__.replace("_", " ").capitalize(),
+                    "description": (view.__doc__ or "").strip(),
+                    "renders": ["application/json"],
+                    "parses": [],
+                }, headers={"Allow": ALLOW})
+            request.user = user
+            use_replica = replica and replicas.enabled() and not await replicas.apinned(user.pk)
+            try:
+                with replicas.reads_from(use_replica):
+                    response = await view(request, user_role, *args, **kwargs)
+            except APIException as exc:
+                # e.g. NotFound for a malformed cursor
+                response = json_response({"detail": exc.detail}, status=exc.status_code)
+            if request.method == "HEAD":
+                response.content = b""
+            return response
+        return wrapper
+    return decorator
+
+
+@read_endpoint(throttle_scope="catalogue", replica=True)
+async def project_catalogue(request, role):
+    """Cursor-paginated project catalogue (same contract as ProjectViewSet.list).
+
+    Students also get `eligibility`: {project id: {applied, seats_full, limit_reached, can_apply}}.
+    """
+    # Pages are cached per role scope and query string (core/response_cache.py)
+    scope = "student" if role.is_student else "all"
+    version = await response_cache.aget_version()
+    key = response_cache.catalogue_key(version, scope, request.get_host(), request.GET)
+    entry = await response_cache.aload(key)
+    if entry is None:
+        queryset = Project.objects.select_related("faculty__user")
+        # Students can only see approved projects
+        if role.is_student:
+            queryset = queryset.filter(is_approved=True)
+        queryset = ProjectCatalogueFilter.apply(queryset, request.GET)
+        wanted = requested_fields(request)
+        if wanted is not None and "abstract" not in wanted:
+            # Sparse fieldset (?fields=): leave the long abstracts in the database
+            queryset = queryset.defer("abstract")
+
+        paginator = ProjectCursorPagination()
+        page = await paginator.apaginate_queryset(queryset, request)
+        data = ProjectSummarySerializer(page, many=True, context={"request": request}).data
+        entry = response_cache.make_entry(paginator.get_paginated_data(data))
+        entry["ids"] = [project.pk for project in page]
+        await response_cache.astore(key, entry)
+    if role.is_student:
+        # The page is shared; whether this student can apply to its projects is not (core/eligibility.py)
+        flags = await eligibility.acheck(role.student_id, entry["ids"])
+        entry = response_cache.with_member(entry, "eligibility", eligibility.as_json(flags))
+    return response_cache.respond(request, entry)
+
+
+project_list_create = ProjectViewSet.as_view({"get": "list", "post": "create"})
+
+
+@csrf_exempt
+async def projects_root(request):
+    """/api/projects/: async catalogue for GET / HEAD, DRF create for POST (and OPTIONS)."""
+    if request.method in ("GET", "HEAD"):
+        return await project_catalogue(request)
+    # DRF enforces CSRF itself for session-authenticated writes
+    return await sync_to_async(project_list_create)(request)
+
+
+@read_endpoint(role="faculty", replica=True)
+async def pending_review(request, role):
+    """Return the department's review queue (cursor-paginated) for committee members."""
+    committee_approved = await aresolve_committee(role)
+
+    # Check if user is a committee member
+    if committee_approved is None:
+        return json_response({"error": "Only committee members can review projects."}, status=403)
+
+    if not committee_approved:
+        return json_response({"error": "Only approved committee members can review projects."}, status=403)
+
+    # Same-department pending projects, oldest first, excluding own projects.
+    # Served by project_review_idx on (department, status, created_at, id)
+    pending_projects = with_faculty_name(
+        Project.objects.filter(department=role.department, status="pending", is_approved=False)
+        .exclude(faculty_id=role.faculty_id)
+    )
+
+    queue = ReviewQueuePagination()
+    page = await queue.apaginate_queryset(pending_projects, request)
+    return json_response(queue.get_paginated_data(ReviewQueueSerializer(page, many=True).data))
+
+
+@read_endpoint(role="student", replica=True)
+async def my_applications(request, role):
+    """Return applications submitted by the logged-in student."""
+    apps = Application.objects.filter(student_id=role.student_id).select_related(
+        "project__faculty__user", "student__user"
+    )
+    rows = [app async for app in apps]
+    return json_response(ApplicationListSerializer(rows, many=True, context={"request": request}).data)
+
+
+@read_endpoint(role="faculty", replica=True)
+async def dashboard(request, role):
+    """Dashboard tallies for the logged-in faculty (and their department for committee members)."""
+    is_committee = bool(await aresolve_committee(role))
+    lookup = Q(scope=DashboardCounter.SCOPE_FACULTY, key=str(role.faculty_id))
+    if is_committee:
+        lookup |= Q(scope=DashboardCounter.SCOPE_DEPARTMENT, key=role.department)
+    rows = {row.scope: row async for row in DashboardCounter.objects.filter(lookup)}
+
+    def tallies(scope, key):
+        row = rows.get(scope) or DashboardCounter(scope=scope, key=key)
+        return DashboardCounterSerializer(row).data
+
+    data = {"faculty": tallies(DashboardCounter.SCOPE_FACULTY, str(role.faculty_id)), "department": None}
+    if is_committee:
+        data["department"] = tallies(DashboardCounter.SCOPE_DEPARTMENT, role.department)
+    return json_response(data)
+
+
+@csrf_exempt
+async def login(request):
+    """JWT login: tokens plus the /api/me/ payload (same contract as simplejwt's view).
+
+    The password check is awaited on the hashing pool (core/passwords.py), so a
+    burst of logins neither blocks the event loop nor queues behind the single
+    thread Django runs sync views on.
+    """
+    if request.method != "POST":
+        return json_response({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return json_response({"detail": "JSON parse error"}, status=400)
+    else:
+        data = request.POST
+
+    errors = {field: ["This field is required."] for field in ("username", "password") if not data.get(field)}
+    if errors:
+        return json_response(errors, status=400)
+
+    # Password guessing: a bucket per client IP, and one per username against guesses spread over many IPs
+    for scope, ident in (
+        ("login", BaseThrottle().get_ident(request)), ("login_username", str(data["username"]).lower()),
+    ):
+        wait = throttling.take(scope, ident)
+        if wait:
+            return throttled(wait)
+
+    user = await passwords.aauthenticate(str(data["username"]), str(data["password"]))
+    if user is None:
+        return json_response(INVALID_CREDENTIALS, status=401)
+    return json_response(await sync_to_async(login_payload)(user))
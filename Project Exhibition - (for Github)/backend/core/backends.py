@@ -0,0 +1,25 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+from . import passwords
+
+
+# ModelBackend whose password checks run on the bounded hashing pool
+# (core/passwords.py), for every login that goes through django.contrib.auth:
+# the DRF / admin login forms and session logins.
+class PooledModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        user = passwords.authenticate(username, password)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        user = await passwords.aauthenticate(username, password)
+        return user if user is not None and self.user_can_authenticate(user) else None
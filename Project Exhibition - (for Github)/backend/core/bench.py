@@ -0,0 +1,64 @@
+import threading
+import time
+
+from django.db import close_old_connections, connection
+
+
+# Small helpers shared by the benchmark management commands (bench_*).
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_summary(latencies, elapsed):
+    """Throughput and latency percentiles (milliseconds) for a finished run."""
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "max_ms": round(max(latencies, default=0) * 1000, 2),
+    }
+
+
+def run_concurrently(work, items, threads):
+    """Run `work(item)` for every item on `threads` threads started together.
+
+    Returns (results, latencies, elapsed) where results[i] is work(items[i]).
+    Each thread closes its own database connection when done.
+    """
+    results = [None] * len(items)
+    latencies = [0.0] * len(items)
+    cursor = iter(range(len(items)))
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        close_old_connections()
+        barrier.wait()
+        try:
+            while True:
+                with lock:
+                    index = next(cursor, None)
+                if index is None:
+                    return
+                started = time.perf_counter()
+                results[index] = work(items[index])
+                latencies[index] = time.perf_counter() - started
+        finally:
+            connection.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return results, latencies, time.perf_counter() - started
@@ -0,0 +1,319 @@
+import json
+import time
+import tracemalloc
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .bench import percentile
+from .models import Application, Committee, Faculty, Project, Student
+from .roles import clear_role_cache
+from .seed import DEFAULT_PASSWORD
+from .serializers import RoleTokenObtainPairSerializer
+
+
+# Request-level benchmark suite over every API route (manage.py bench_api).
+#
+# Each Scenario drives one route through the DRF test client as a realistic
+# caller (student / faculty owner / committee member / admin / anonymous)
+# against whatever data is in the database, normally the seed_data dataset.
+# For every scenario it reports p50 / p95 latency, the number of queries of
+# one request and the peak memory allocated while serving it (tracemalloc,
+# measured on a separate run so tracing does not skew the timings).
+#
+# Writes run inside a transaction that is rolled back, so the dataset is the
+# same for every sample and every run. Results can be saved as a baseline and
+# later runs compared against it (see compare()).
+
+SCOPE = 'api/'
+# Routes outside core/urls.py that are part of the API surface too
+EXTRA_ROUTES = {'token_obtain_pair', 'token_refresh'}
+# Long-lived streams never finish a request: load-tested by bench_events instead
+STREAMING_ROUTES = {'events'}
+
+
+class Scenario:
+    def __init__(self, route, method, path, role=None, data=None, label=None, format='json',
+                 write=False, cold=False, heavy=False):
+        self.route = route              # URL name, for coverage
+        self.name = label or f"{method} {route}"
+        self.method = method.lower()
+        self.path = path                # str or callable(fixtures)
+        self.role = role
+        self.data = data                # dict or callable(fixtures)
+        self.format = format
+        self.write = write              # roll back after each request
+        self.cold = cold                # clear the response cache before each request
+        self.heavy = heavy              # whole-table endpoints: fewer samples
+
+    def request(self, client, fixtures):
+        path = self.path(fixtures) if callable(self.path) else self.path
+        data = self.data(fixtures) if callable(self.data) else self.data
+        response = getattr(client, self.method)(path, data, format=self.format)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+
+
+def upload(fixtures):
+    rows = "username,password,roll_number,course\n" + "".join(
+        f"{fixtures.tag}_import{i},pw-12345,{fixtures.tag[-8:]}{i},BTech\n" for i in range(50)
+    )
+    return {"file": SimpleUploadedFile("students.csv", rows.encode()), "dry_run": "true"}
+
+
+SCENARIOS = [
+    # Async read endpoints
+    Scenario('project-list', 'GET', '/api/projects/', 'student', label='GET project-list (catalogue)'),
+    Scenario('project-list', 'GET', '/api/projects/', 'student', label='GET project-list (catalogue, cold cache)',
+             cold=True),
+    Scenario('project-list', 'GET', '/api/projects/?difficulty=hard&has_seats=true&page_size=50', 'owner',
+             label='GET project-list (filtered, cold cache)', cold=True),
+    Scenario('project-pending-review', 'GET', '/api/projects/pending_review/', 'committee'),
+    Scenario('application-my', 'GET', '/api/applications/my/', 'student'),
+    Scenario('dashboard', 'GET', '/api/dashboard/', 'owner'),
+    # Projects
+    Scenario('project-list', 'POST', '/api/projects/', 'owner', write=True,
+             data={"title": "Benchmark project", "abstract": "Benchmark", "seats": 3}),
+    Scenario('project-detail', 'GET', lambda f: f"/api/projects/{f.project.pk}/", 'student'),
+    Scenario('project-detail', 'GET', lambda f: f"/api/projects/{f.project.pk}/", 'student',
+             label='GET project-detail (cold cache)', cold=True),
+    Scenario('project-detail', 'PATCH', lambda f: f"/api/projects/{f.project.pk}/", 'owner', write=True,
+             data={"timeline": "6 months"}),
+    Scenario('project-my', 'GET', '/api/projects/my/', 'owner'),
+    Scenario('project-search', 'GET', '/api/projects/search/?q=machine+learn', 'student',
+             label='GET project-search (cold cache)', cold=True),
+    Scenario('project-search', 'GET', '/api/projects/search/?q=robot&department=CSE&has_seats=true', 'student',
+             label='GET project-search (filtered, cold cache)', cold=True),
+    Scenario('project-approve', 'POST', lambda f: f"/api/projects/{f.pending.pk}/approve/", 'committee',
+             write=True),
+    Scenario('project-reject', 'POST', lambda f: f"/api/projects/{f.pending.pk}/reject/", 'committee',
+             write=True),
+    Scenario('project-review', 'POST', '/api/projects/review/', 'committee', write=True, data=lambda f: {
+        "reviews": [{"project": p.pk, "decision": "approve"} for p in f.pending_batch]
+    }),
+    # Applications
+    Scenario('application-list', 'GET', '/api/applications/', 'student', heavy=True),
+    Scenario('application-list', 'POST', '/api/applications/', 'applicant', write=True,
+             data=lambda f: {"project": f.project.pk, "priority": 1}),
+    Scenario('application-detail', 'GET', lambda f: f"/api/applications/{f.application.pk}/", 'student'),
+    Scenario('application-faculty-applications', 'GET', '/api/applications/faculty_applications/', 'owner'),
+    Scenario('application-select', 'POST', lambda f: f"/api/applications/{f.application.pk}/select/", 'owner',
+             write=True),
+    Scenario('application-reject', 'POST', lambda f: f"/api/applications/{f.application.pk}/reject/", 'owner',
+             write=True),
+    # Profiles
+    Scenario('faculty-list', 'GET', '/api/faculty/', 'owner', heavy=True),
+    Scenario('faculty-detail', 'GET', lambda f: f"/api/faculty/{f.owner.pk}/", 'owner'),
+    Scenario('student-list', 'GET', '/api/students/', 'student', heavy=True),
+    Scenario('student-detail', 'GET', lambda f: f"/api/students/{f.student.pk}/", 'student'),
+    Scenario('committee-list', 'GET', '/api/committees/', 'owner', heavy=True),
+    Scenario('committee-detail', 'GET', lambda f: f"/api/committees/{f.committee_profile.pk}/", 'committee'),
+    Scenario('committee-apply', 'POST', '/api/committees/apply/', 'candidate', write=True, data={
+        "degree": "PhD", "specialization": "Systems", "years_of_experience": 5,
+    }),
+    Scenario('me', 'GET', '/api/me/', 'student'),
+    Scenario('events-ticket', 'POST', '/api/events/ticket/', 'student'),
+    Scenario('api-root', 'GET', '/api/', 'student'),
+    # Auth (password hashing dominates: PASSWORD_HASHER / PASSWORD_HASH_COST)
+    Scenario('signup', 'POST', '/api/signup/', None, write=True, heavy=True, data=lambda f: {
+        "username": f"{f.tag}_signup", "password": "pw-12345", "role": "student",
+    }),
+    Scenario('token_obtain_pair', 'POST', '/api/auth/login/', None, heavy=True, data=lambda f: {
+        "username": f.student.user.username, "password": f.password,
+    }),
+    Scenario('token_refresh', 'POST', '/api/auth/refresh/', None, data=lambda f: {"refresh": f.refresh}),
+    # Admin
+    Scenario('allocation', 'POST', '/api/allocation/', 'admin', heavy=True, data={"commit": False}),
+    Scenario('bulk-import', 'POST', '/api/admin/import/students/', 'admin', write=True, format='multipart',
+             data=upload),
+    Scenario('bulk-export', 'GET', '/api/admin/export/applications.csv', 'admin', heavy=True),
+    Scenario('analytics', 'GET', '/api/admin/analytics/', 'admin'),
+    Scenario('analytics', 'GET', '/api/admin/analytics/', 'admin', label='GET analytics (cold cache)',
+             cold=True, heavy=True),
+    Scenario('metrics', 'GET', '/api/_metrics', 'admin'),
+]
+
+
+def api_routes():
+    """URL names of every API route (core/urls.py plus the auth endpoints)."""
+    def walk(patterns, prefix=''):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif isinstance(pattern, URLPattern) and pattern.name and (prefix + str(pattern.pattern)).startswith(SCOPE):
+                yield pattern.name
+    return set(walk(get_resolver().url_patterns))
+
+
+def uncovered_routes(scenarios=SCENARIOS):
+    return sorted((api_routes() | EXTRA_ROUTES) - STREAMING_ROUTES - {scenario.route for scenario in scenarios})
+
+
+class Fixtures:
+    """The callers and objects scenarios act on, picked from the existing data.
+
+    Adds a staff user and a student without applications (tagged, removed by
+    cleanup()); everything else must already exist (manage.py seed_data).
+    """
+
+    def __init__(self, password):
+        self.tag = f"bench_{uuid.uuid4().hex[:8]}"
+        self.password = password
+        self.student = Student.objects.filter(applications__isnull=False).select_related('user').first()
+        self.application = Application.objects.filter(
+            student=self.student, status__in=('pending', 'shortlisted')
+        ).select_related('project__faculty').first()
+        if self.application is None:
+            raise LookupError("No student with an open application: run manage.py seed_data first.")
+        self.project = self.application.project
+        self.owner = self.project.faculty
+        members = Committee.objects.filter(approved_by_admin=True, user__faculty__isnull=False)
+        self.committee_profile = None
+        for profile in members.select_related('user__faculty')[:200]:
+            pending = Project.objects.filter(
+                department=profile.user.faculty.department, status='pending'
+            ).exclude(faculty=profile.user.faculty).order_by('created_at', 'id')[:20]
+            if len(pending):
+                self.committee_profile, self.pending, self.pending_batch = profile, pending[0], list(pending)
+                break
+        if self.committee_profile is None:
+            raise LookupError("No approved committee member with pending projects in their department.")
+        self.committee = self.committee_profile.user.faculty
+        self.candidate = Faculty.objects.filter(user__committee_profile__isnull=True).select_related('user').first()
+        if self.candidate is None:
+            raise LookupError("No faculty member without a committee profile.")
+
+        self.admin = User.objects.create_user(f"{self.tag}_admin", is_staff=True)
+        applicant_user = User.objects.create_user(f"{self.tag}_applicant")
+        self.applicant = Student.objects.create(user=applicant_user, roll_number=self.tag, course="Bench")
+        self.refresh = str(RefreshToken.for_user(self.student.user))
+        self.users = {
+            'student': self.student.user, 'applicant': applicant_user, 'owner': self.owner.user,
+            'committee': self.committee_profile.user, 'candidate': self.candidate.user, 'admin': self.admin,
+        }
+
+    def client(self, role):
+        client = APIClient()
+        if role is not None:
+            token = RoleTokenObtainPairSerializer.get_token(self.users[role]).access_token
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def cleanup(self):
+        User.objects.filter(username__startswith=self.tag).delete()
+
+
+def run_once(scenario, client, fixtures):
+    if scenario.cold:
+        cache.clear()
+    if not scenario.write:
+        return scenario.request(client, fixtures)
+    with transaction.atomic():
+        response = scenario.request(client, fixtures)
+        transaction.set_rollback(True)
+    clear_role_cache()
+    return response
+
+
+def measure(scenario, fixtures, samples, warmup=2):
+    client = fixtures.client(scenario.role)
+    samples = max(3, samples // 5) if scenario.heavy else samples
+    for _ in range(0 if scenario.cold else warmup):
+        run_once(scenario, client, fixtures)
+
+    latencies, statuses = [], set()
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = run_once(scenario, client, fixtures)
+        latencies.append(time.perf_counter() - started)
+        statuses.add(response.status_code)
+
+    reset_queries()  # the log is capped; a full one would hide new queries
+    with CaptureQueriesContext(connection) as queries:
+        run_once(scenario, client, fixtures)
+    query_count = len(queries)  # read now: the next request resets the log
+
+    tracemalloc.start()
+    try:
+        run_once(scenario, client, fixtures)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "route": scenario.route,
+        "samples": samples,
+        "status": sorted(statuses),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "queries": query_count,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_suite(samples=20, password=DEFAULT_PASSWORD, only=None, log=None):
+    """Run every scenario (or those whose name contains `only`); returns {name: result}."""
+    fixtures = Fixtures(password)
+    results = {}
+    try:
+        for scenario in SCENARIOS:
+            if only and only not in scenario.name:
+                continue
+            results[scenario.name] = measure(scenario, fixtures, samples)
+            if log:
+                log(scenario.name, results[scenario.name])
+    finally:
+        fixtures.cleanup()
+        clear_role_cache()
+    return results
+
+
+def dataset_size():
+    return {
+        "students": Student.objects.count(),
+        "faculty": Faculty.objects.count(),
+        "projects": Project.objects.count(),
+        "applications": Application.objects.count(),
+    }
+
+
+def compare(results, baseline, threshold=0.25, min_ms=5.0, min_kib=64):
+    """Regressions of `results` against a baseline, as human-readable strings.
+
+    A scenario regresses when its p95 grows by more than `threshold` (and by
+    at least `min_ms`, so jitter on fast routes is ignored), when it runs more
+    queries than before (query counts are deterministic), or when its peak
+    memory grows by more than `threshold` (and `min_kib`).
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold) and result["p95_ms"] - base["p95_ms"] >= min_ms:
+            regressions.append(f"{name}: p95 {base['p95_ms']} -> {result['p95_ms']} ms")
+        if result["queries"] > base["queries"]:
+            regressions.append(f"{name}: queries {base['queries']} -> {result['queries']}")
+        if result["peak_kib"] > base["peak_kib"] * (1 + threshold) and result["peak_kib"] - base["peak_kib"] >= min_kib:
+            regressions.append(f"{name}: peak memory {base['peak_kib']} -> {result['peak_kib']} KiB")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save_baseline(path, results):
+    with open(path, "w") as handle:
+        json.dump({"dataset": dataset_size(), "results": results}, handle, indent=2, sort_keys=True)
+        handle.write("\n")
@@ -0,0 +1,388 @@
+import codecs
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+
+from .counters import record_project_changes
+from .models import Application, Faculty, Project, Student
+from . import events, passwords
+from .response_cache import bump_version
+from .search import index_projects
+
+
+# Bulk import / export of students, faculty and projects (CSV or JSONL).
+#
+# Imports stream the file: rows are read lazily, validated BATCH_SIZE at a time
+# (one lookup query per batch for duplicates / faculty), passwords are hashed
+# outside the transaction (a process pool for the import_data command, the
+# shared bounded hashing pool for admin uploads), and each valid batch is written
+# with bulk_create in its own transaction. Invalid rows are reported with
+# their line number and skipped; they never abort the rest of the file.
+#
+# Exports iterate the database cursor in chunks and yield one encoded line at
+# a time, so StreamingHttpResponse / stdout never hold the table in memory.
+
+FORMATS = ('csv', 'jsonl')
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(filename, default='csv'):
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    return extension if extension in FORMATS else default
+
+
+def is_utf8(upload):
+    """Whether an uploaded file decodes as UTF-8, checked chunk by chunk before any row is imported."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    try:
+        for chunk in upload.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        upload.seek(0)
+    return True
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, row dict or None) from a text stream."""
+    if fmt == 'jsonl':
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+    else:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class ImportResult:
+    def __init__(self, kind, dry_run=False):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.rows = 0
+        self.valid = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []   # first MAX_REPORTED_ERRORS (line, message)
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def summary(self):
+        return {
+            "kind": self.kind,
+            "dry_run": self.dry_run,
+            "rows": self.rows,
+            "valid": self.valid,
+            "created": self.created,
+            "error_count": self.error_count,
+            "errors": [{"line": line, "error": message} for line, message in sorted(self.errors)],
+        }
+
+
+def _init_hash_worker(settings_module):
+    # Needed where workers are spawned rather than forked (macOS / Windows)
+    if settings_module:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+@contextmanager
+def password_hasher(workers=None):
+    """Yield hash(passwords) -> hashes, spread over `workers` processes (1: inline).
+
+    Without `workers` (web requests) the hashes go to the process-wide
+    bounded hashing pool (core/passwords.py) that logins and signups share,
+    so an import never starts processes inside a web worker; hash_many keeps
+    half of that pool free for them.
+    """
+    if workers is None:
+        yield passwords.hash_many
+        return
+    if workers <= 1:
+        yield lambda values: [make_password(value) for value in values]
+        return
+
+    settings_module = os.environ.get('DJANGO_SETTINGS_MODULE')
+    with ProcessPoolExecutor(workers, initializer=_init_hash_worker, initargs=(settings_module,)) as pool:
+        def hash_passwords(passwords):
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(pool.map(make_password, passwords, chunksize=chunksize))
+        yield hash_passwords
+
+
+class Importer:
+    required = ()
+    max_lengths = {}
+    hashes_passwords = False
+
+    def __init__(self):
+        self.seen = set()   # keys already accepted earlier in the file
+
+    def clean(self, chunk, result):
+        """Normalise rows and check required fields / lengths; returns [(line, row)]."""
+        rows = []
+        for line, raw in chunk:
+            if raw is None:
+                result.error(line, "Not a JSON object.")
+                continue
+            row = {
+                str(key).strip(): str(value).strip() if value is not None else ''
+                for key, value in raw.items() if key
+            }
+            missing = [field for field in self.required if not row.get(field)]
+            if missing:
+                result.error(line, f"Missing {', '.join(missing)}.")
+                continue
+            too_long = [field for field, limit in self.max_lengths.items() if len(row.get(field, '')) > limit]
+            if too_long:
+                result.error(line, f"Too long: {', '.join(too_long)}.")
+                continue
+            rows.append((line, row))
+        return self.check(rows, result)
+
+    def check(self, rows, result):
+        return rows
+
+    def prepare(self, rows, hash_passwords):
+        pass
+
+    def create(self, rows):
+        raise NotImplementedError
+
+
+class UserImporter(Importer):
+    unique_profile_field = None
+
+    def check(self, rows, result):
+        usernames = {row['username'] for _, row in rows}
+        taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_profile = self.taken_profile_values(rows)
+        valid = []
+        for line, row in rows:
+            profile_key = ('profile', row.get(self.unique_profile_field))
+            if row['username'] in taken or row['username'] in self.seen:
+                result.error(line, f"Username '{row['username']}' already taken.")
+            elif self.unique_profile_field and (profile_key[1] in taken_profile or profile_key in self.seen):
+                result.error(line, f"{self.unique_profile_field} '{profile_key[1]}' already taken.")
+            else:
+                self.seen.add(row['username'])
+                self.seen.add(profile_key)
+                valid.append((line, row))
+        return valid
+
+    def taken_profile_values(self, rows):
+        return set()
+
+    def prepare(self, rows, hash_passwords):
+        # Empty password -> unusable password (user must reset it)
+        hashes = hash_passwords([row.get('password') or None for _, row in rows])
+        for (_, row), hashed in zip(rows, hashes):
+            row['password'] = hashed
+
+    def create(self, rows):
+        users = User.objects.bulk_create([
+            User(
+                username=row['username'], password=row['password'], email=row.get('email', ''),
+                first_name=row.get('first_name', ''), last_name=row.get('last_name', ''),
+            )
+            for _, row in rows
+        ])
+        profiles = self.model.objects.bulk_create([self.profile(user, row) for user, (_, row) in zip(users, rows)])
+        return len(profiles)
+
+
+class StudentImporter(UserImporter):
+    model = Student
+    required = ('username', 'roll_number')
+    max_lengths = {'username': 150, 'roll_number': 20, 'course': 100, 'first_name': 150, 'last_name': 150}
+    hashes_passwords = True
+    unique_profile_field = 'roll_number'
+
+    def taken_profile_values(self, rows):
+        return set(Student.objects.filter(
+            roll_number__in=[row['roll_number'] for _, row in rows]
+        ).values_list('roll_number', flat=True))
+
+    def profile(self, user, row):
+        return Student(user=user, roll_number=row['roll_number'], course=row.get('course') or 'Unknown')
+
+
+class FacultyImporter(UserImporter):
+    model = Faculty
+    required = ('username', 'department')
+    max_lengths = {'username': 150, 'department': 100, 'first_name': 150, 'last_name': 150}
+    hashes_passwords = True
+
+    def profile(self, user, row):
+        return Faculty(user=user, department=row['department'])
+
+
+class ProjectImporter(Importer):
+    required = ('faculty', 'title', 'abstract')
+    max_lengths = {'title': 255, 'timeline': 255}
+    difficulties = {choice for choice, _ in Project._meta.get_field('difficulty').choices}
+
+    def check(self, rows, result):
+        faculty = {
+            username: (pk, department)
+            for username, pk, department in Faculty.objects.filter(
+                user__username__in={row['faculty'] for _, row in rows}
+            ).values_list('user__username', 'id', 'department')
+        }
+        valid = []
+        for line, row in rows:
+            difficulty = row.get('difficulty') or 'medium'
+            try:
+                seats = int(row.get('seats') or 1)
+            except ValueError:
+                seats = 0
+            if row['faculty'] not in faculty:
+                result.error(line, f"Unknown faculty '{row['faculty']}'.")
+            elif difficulty not in self.difficulties:
+                result.error(line, f"Invalid difficulty '{difficulty}'.")
+            elif seats < 1:
+                result.error(line, "seats must be a positive integer.")
+            else:
+                row['faculty_id'], row['department'] = faculty[row['faculty']]
+                row['difficulty'], row['seats'] = difficulty, seats
+                valid.append((line, row))
+        return valid
+
+    def create(self, rows):
+        # Same starting state as ProjectViewSet.perform_create
+        projects = Project.objects.bulk_create([
+            Project(
+                faculty_id=row['faculty_id'], department=row['department'],
+                title=row['title'], abstract=row['abstract'], timeline=row.get('timeline', ''),
+                difficulty=row['difficulty'], seats=row['seats'], seats_available=row['seats'],
+                status='pending', is_approved=False,
+            )
+            for _, row in rows
+        ])
+        # bulk_create sends no signals: update the dashboard counters, search index, response cache
+        # and the reviewers' event streams here
+        record_project_changes((p.faculty_id, p.department, None, 'pending') for p in projects)
+        index_projects(projects)
+        bump_version()
+        events.publish_many(message for p in projects for message in events.project_messages(p, created=True))
+        return len(projects)
+
+
+IMPORTERS = {
+    'students': StudentImporter,
+    'faculty': FacultyImporter,
+    'projects': ProjectImporter,
+}
+
+
+def import_rows(kind, rows, workers=None, batch_size=BATCH_SIZE, dry_run=False):
+    """Import (line, row) pairs of the given kind; returns an ImportResult.
+
+    `workers`: password hashing processes (manage.py import_data); None uses
+    the shared hashing pool (admin uploads).
+    """
+    importer = IMPORTERS[kind]()
+    result = ImportResult(kind, dry_run)
+    hash_workers = workers if importer.hashes_passwords and not dry_run else 1
+    with password_hasher(hash_workers) as hash_passwords:
+        for chunk in chunked(rows, batch_size):
+            result.rows += len(chunk)
+            valid = importer.clean(chunk, result)
+            result.valid += len(valid)
+            if dry_run or not valid:
+                continue
+            importer.prepare(valid, hash_passwords)
+            try:
+                with transaction.atomic():
+                    result.created += importer.create(valid)
+            except IntegrityError as exc:
+                # Lost a race with another writer: report the batch, keep going
+                result.error(valid[0][0], f"Batch of {len(valid)} rows not imported: {exc}")
+    return result
+
+
+# ---- Exports ----
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer in generators."""
+    def write(self, value):
+        return value
+
+
+EXPORTS = {
+    'applications': (
+        lambda: Application.objects.order_by('id'),
+        [
+            ('id', 'id'), ('student', 'student__user__username'), ('roll_number', 'student__roll_number'),
+            ('project', 'project_id'), ('project_title', 'project__title'),
+            ('faculty', 'project__faculty__user__username'), ('department', 'project__department'),
+            ('priority', 'priority'), ('cgpa', 'cgpa'), ('status', 'status'), ('applied_at', 'applied_at'),
+        ],
+    ),
+    # Allocation results: who got which project
+    'allocation': (
+        lambda: Application.objects.filter(status='selected').order_by('project_id', 'id'),
+        [
+            ('project', 'project_id'), ('project_title', 'project__title'),
+            ('faculty', 'project__faculty__user__username'), ('department', 'project__department'),
+            ('student', 'student__user__username'), ('roll_number', 'student__roll_number'),
+            ('priority', 'priority'), ('cgpa', 'cgpa'), ('application', 'id'),
+        ],
+    ),
+}
+
+
+def _export(kind, fmt):
+    """(queryset, column lookups, header line or None, row -> line) of an export."""
+    queryset, columns = EXPORTS[kind]
+    names = [name for name, _ in columns]
+    lookups = [lookup for _, lookup in columns]
+    if fmt == 'jsonl':
+        return queryset(), lookups, None, lambda row: json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + '\n'
+    writer = csv.writer(Echo())
+    return queryset(), lookups, writer.writerow(names), writer.writerow
+
+
+def export_lines(kind, fmt, chunk_size=2000):
+    """Yield the export as text lines (CSV with a header row, or JSONL)."""
+    queryset, lookups, header, line = _export(kind, fmt)
+    if header is not None:
+        yield header
+    for row in queryset.values_list(*lookups).iterator(chunk_size=chunk_size):
+        yield line(row)
+
+
+async def aexport_lines(kind, fmt, chunk_size=2000):
+    """export_lines for ASGI, which would otherwise collect a sync iterator into a list first."""
+    queryset, lookups, header, line = _export(kind, fmt)
+    if header is not None:
+        yield header
+    # values(), not values_list(): the latter runs its query on the event loop under aiterator()
+    async for row in queryset.values(*lookups).aiterator(chunk_size=chunk_size):
+        yield line([row[lookup] for lookup in lookups])
@@ -0,0 +1,203 @@
+import functools
+import gzip
+import secrets
+import zlib
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import get_random_string
+from django.utils.decorators import sync_and_async_middleware
+
+try:
+    import brotli
+except ImportError:   # optional: gzip only
+    brotli = None
+
+
+# Response compression (settings.COMPRESSION_*), in place of Django's
+# GZipMiddleware: brotli when the client accepts it and the brotli package is
+# installed, gzip otherwise.
+#
+# Only text-like bodies (JSON, NDJSON, CSV, HTML...) of at least
+# COMPRESSION_MIN_BYTES are compressed: below that the saving is a few bytes
+# and not worth the CPU. Streaming responses (the CSV / JSONL exports) are
+# compressed chunk by chunk. The event stream (core/sse.py) never reaches
+# Django. As with GZipMiddleware, strong ETags become weak ones
+# (response_cache.respond compares weakly) and responses vary on
+# Accept-Encoding.
+#
+# BREACH: compressed sizes leak whether attacker-controlled input matches a
+# secret in the same body. Like GZipMiddleware, gzip output gets a random
+# filename of up to GZipMiddleware.max_random_bytes in its header, so sizes
+# vary between identical responses; brotli output starts with a metadata
+# meta-block of random length, which decoders skip. Views whose responses
+# carry tokens (login, token refresh) are never compressed at all: @uncompressed.
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+
+
+def accepted_encoding(header):
+    """'br' or 'gzip' from an Accept-Encoding header (q=0 refuses), or None."""
+    accepted = set()
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def random_filename():
+    # Same padding as django.utils.text.compress_string(max_random_bytes=...)
+    length = secrets.randbelow(GZipMiddleware.max_random_bytes) + 1
+    return get_random_string(length).encode() + b'\x00'
+
+
+def padded(compress_chunk, finish):
+    """Wrap a gzip stream so its header carries a random FNAME field."""
+    pending = True
+
+    def pad(data):
+        nonlocal pending
+        if pending and data:
+            # zlib writes the whole 10-byte header with the first output
+            pending = False
+            header = bytearray(data[:10])
+            header[3] |= gzip.FNAME
+            return bytes(header) + random_filename() + data[10:]
+        return data
+
+    return (lambda chunk: pad(compress_chunk(chunk))), (lambda: pad(finish()))
+
+
+def brotli_padding():
+    """A metadata meta-block of random length, which decoders skip.
+
+    ISLAST=0, MNIBBLES=0 (metadata), reserved 0, MSKIPBYTES=1 and MSKIPLEN-1,
+    LSB first, up to the next byte boundary; then MSKIPLEN random bytes.
+    """
+    metadata = secrets.token_bytes(secrets.randbelow(GZipMiddleware.max_random_bytes) + 1)
+    header = 0b0110 | 1 << 4 | (len(metadata) - 1) << 6
+    return header.to_bytes(2, 'little') + metadata
+
+
+def brotli_padded(stream):
+    """(compress(chunk), finish()) of a brotli stream that starts with brotli_padding().
+
+    Meta-blocks are bit-aligned; flush() on the fresh stream writes the window
+    header and an empty metadata block, so the padding starts byte-aligned.
+    """
+    prefix = stream.flush() + brotli_padding()
+
+    def pad(data):
+        nonlocal prefix
+        data, prefix = prefix + data, b''
+        return data
+
+    return (lambda chunk: pad(stream.process(chunk))), (lambda: pad(stream.finish()))
+
+
+def compressor(encoding):
+    """(compress(chunk), finish()) of a fresh compression stream."""
+    if encoding == 'br':
+        return brotli_padded(brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY))
+    stream = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip framing
+    return padded(stream.compress, stream.flush)
+
+
+def compress(encoding, body):
+    compress_chunk, finish = compressor(encoding)
+    return compress_chunk(body) + finish()
+
+
+def compress_chunks(encoding, chunks):
+    compress_chunk, finish = compressor(encoding)
+    for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_chunks(encoding, chunks):
+    compress_chunk, finish = compressor(encoding)
+    async for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def uncompressed(view):
+    """View decorator: never compress the view's responses (they carry secrets)."""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            response = await view(request, *args, **kwargs)
+            response.uncompressed = True
+            return response
+    else:
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            response.uncompressed = True
+            return response
+    return wrapper
+
+
+def compress_response(request, response):
+    if getattr(response, 'uncompressed', False):
+        return response
+    if response.has_header('Content-Encoding') or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = accepted_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = acompress_chunks(encoding, response.streaming_content)
+        else:
+            response.streaming_content = compress_chunks(encoding, response.streaming_content)
+        del response.headers['Content-Length']
+    else:
+        if len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            return response
+        compressed = compress(encoding, response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = 'W/' + etag
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@sync_and_async_middleware
+def CompressionMiddleware(get_response):
+    if not settings.COMPRESSION_ENABLED:
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            return compress_response(request, await get_response(request))
+    else:
+        def middleware(request):
+            return compress_response(request, get_response(request))
+    return middleware
@@ -0,0 +1,220 @@
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from . import jobs
+from .models import Application, DashboardCounter, Job, Project
+from .response_cache import bump_version
+
+
+# Incremental maintenance of the denormalized counters:
+#   * Project.applications_count / Project.selected_count
+#   * DashboardCounter rows per faculty and per department
+# Views call record_application_changes / record_project_change right after the
+# state change, inside the same transaction. Anything that bypasses them (bulk
+# allocation, Django admin edits, deletes) calls rebuild_counters instead.
+# Both also invalidate the response cache: the seat / status UPDATEs they
+# accompany send no model signals.
+#
+# The deltas are applied by background jobs (core/jobs.py, right away with
+# JOBS_EAGER): a worker sums the deltas of all queued jobs and writes each
+# project / counter row once, instead of every request updating the same hot
+# department row. A rebuild drops the queued ones (it counts their changes).
+#
+# A faculty moving department moves Project.department of their projects
+# (core/signals.py): record_department_move queues their tallies from the old
+# department rows to the new one.
+
+COUNTER_JOBS = ('counters.applications', 'counters.projects', 'counters.departments')
+
+def _bump(scope, key, deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows = DashboardCounter.objects.filter(scope=scope, key=key)
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            DashboardCounter.objects.create(scope=scope, key=key, **deltas)
+    except IntegrityError:
+        # Created concurrently: fall back to the increment
+        rows.update(**updates)
+
+
+def record_application_changes(changes):
+    """Queue application status transitions for every counter.
+
+    `changes` is an iterable of (project_id, old_status, new_status) where
+    old_status is None for a new application and new_status None for a deletion.
+    """
+    changes = [(project_id, old, new) for project_id, old, new in changes if old != new]
+    if not changes:
+        return
+    # Seats / statuses changed with them: cached pages are stale now, not once the job ran
+    bump_version()
+    # The owner goes into the job: the project may be deleted by the time it runs
+    owners = {
+        project_id: (faculty_id, department)
+        for project_id, faculty_id, department in Project.objects.filter(
+            pk__in={project_id for project_id, _, _ in changes}
+        ).values_list('id', 'faculty_id', 'department')
+    }
+    jobs.enqueue('counters.applications', {'changes': [
+        [project_id, *owners[project_id], old, new] for project_id, old, new in changes if project_id in owners
+    ]})
+
+
+def apply_application_changes(payloads):
+    """Job handler: apply the transitions of many record_application_changes calls at once."""
+    per_project = defaultdict(Counter)
+    per_faculty = defaultdict(Counter)
+    per_department = defaultdict(Counter)
+    for project_id, faculty_id, department, old, new in (
+        change for payload in payloads for change in payload['changes']
+    ):
+        deltas = Counter()
+        if old is None:
+            deltas['applications_total'] += 1
+        else:
+            deltas[f'applications_{old}'] -= 1
+        if new is None:
+            deltas['applications_total'] -= 1
+        else:
+            deltas[f'applications_{new}'] += 1
+        per_project[project_id].update(deltas)
+        per_faculty[faculty_id].update(deltas)
+        per_department[department].update(deltas)
+    if not per_project:
+        return
+    bump_version()
+
+    for project_id, deltas in per_project.items():
+        project_updates = {}
+        if deltas['applications_total']:
+            project_updates['applications_count'] = F('applications_count') + deltas['applications_total']
+        if deltas['applications_selected']:
+            project_updates['selected_count'] = F('selected_count') + deltas['applications_selected']
+        if project_updates:
+            Project.objects.filter(pk=project_id).update(**project_updates)
+
+    for faculty_id, deltas in per_faculty.items():
+        _bump(DashboardCounter.SCOPE_FACULTY, str(faculty_id), deltas)
+    for department, deltas in per_department.items():
+        _bump(DashboardCounter.SCOPE_DEPARTMENT, department, deltas)
+
+
+def record_project_change(faculty_id, department, old_status, new_status):
+    """Apply a project status transition (None = created / deleted) to the dashboard counters."""
+    record_project_changes([(faculty_id, department, old_status, new_status)])
+
+
+def record_project_changes(changes):
+    """Batch form of record_project_change, queued like record_application_changes."""
+    changes = [list(change) for change in changes if change[2] != change[3]]
+    if changes:
+        jobs.enqueue('counters.projects', {'changes': changes})
+
+
+def apply_project_changes(payloads):
+    """Job handler: one counter update per faculty / department for all queued project transitions."""
+    per_key = defaultdict(Counter)
+    for faculty_id, department, old_status, new_status in (
+        change for payload in payloads for change in payload['changes']
+    ):
+        for key in ((DashboardCounter.SCOPE_FACULTY, str(faculty_id)), (DashboardCounter.SCOPE_DEPARTMENT, department)):
+            deltas = per_key[key]
+            if old_status is None:
+                deltas['projects_total'] += 1
+            else:
+                deltas[f'projects_{old_status}'] -= 1
+            if new_status is None:
+                deltas['projects_total'] -= 1
+            else:
+                deltas[f'projects_{new_status}'] += 1
+    for (scope, key), deltas in per_key.items():
+        _bump(scope, key, deltas)
+
+
+def record_department_move(projects, department):
+    """Queue moving `projects` (a queryset, before its update) and their applications to `department`."""
+    deltas = defaultdict(Counter)
+
+    def move(old, field, n):
+        deltas[old][field] -= n
+        deltas[department][field] += n
+
+    for old, project_status, n in projects.values_list('department', 'status').annotate(n=Count('id')).order_by():
+        move(old, 'projects_total', n)
+        move(old, f'projects_{project_status}', n)
+    if not deltas:
+        return
+    for old, app_status, n in Application.objects.filter(project__in=projects).values_list(
+        'project__department', 'status'
+    ).annotate(n=Count('id')).order_by():
+        move(old, 'applications_total', n)
+        move(old, f'applications_{app_status}', n)
+    jobs.enqueue('counters.departments', {'deltas': {key: dict(tallies) for key, tallies in deltas.items()}})
+
+
+def apply_department_moves(payloads):
+    """Job handler: apply the department deltas of many record_department_move calls at once."""
+    per_department = defaultdict(Counter)
+    for payload in payloads:
+        for department, deltas in payload['deltas'].items():
+            per_department[department].update(deltas)
+    for department, deltas in per_department.items():
+        _bump(DashboardCounter.SCOPE_DEPARTMENT, department, deltas)
+
+
+def _keys(faculty_id, department):
+    return (DashboardCounter.SCOPE_FACULTY, str(faculty_id)), (DashboardCounter.SCOPE_DEPARTMENT, department)
+
+
+def rebuild_counters():
+    """Recompute every counter from scratch.
+
+    Queued counter jobs hold deltas the rebuild already counts: they are
+    locked and dropped in the same transaction, before counting, or a
+    worker would apply them a second time afterwards.
+    """
+    def count_of(**filters):
+        subquery = Application.objects.filter(project=OuterRef('pk'), **filters).order_by().values(
+            'project'
+        ).annotate(n=Count('id')).values('n')
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    with transaction.atomic():
+        # Waits for a worker running them (PostgreSQL); failed ones would be retried later
+        pending = Job.objects.select_for_update().filter(kind__in=COUNTER_JOBS)
+        Job.objects.filter(pk__in=list(pending.values_list('pk', flat=True))).delete()
+
+        # Departments are Project.department, the key of the incremental path
+        rows = defaultdict(Counter)
+        for faculty_id, department, status, n in Project.objects.values_list(
+            'faculty_id', 'department', 'status'
+        ).annotate(n=Count('id')).order_by():
+            for key in _keys(faculty_id, department):
+                rows[key]['projects_total'] += n
+                rows[key][f'projects_{status}'] += n
+        for faculty_id, department, status, n in Application.objects.values_list(
+            'project__faculty_id', 'project__department', 'status'
+        ).annotate(n=Count('id')).order_by():
+            for key in _keys(faculty_id, department):
+                rows[key]['applications_total'] += n
+                rows[key][f'applications_{status}'] += n
+
+        # One correlated UPDATE for all projects
+        Project.objects.update(
+            applications_count=count_of(),
+            selected_count=count_of(status='selected'),
+        )
+        DashboardCounter.objects.all().delete()
+        DashboardCounter.objects.bulk_create(
+            [DashboardCounter(scope=scope, key=key, **dict(tallies)) for (scope, key), tallies in rows.items()],
+            batch_size=500,
+        )
+        bump_version()
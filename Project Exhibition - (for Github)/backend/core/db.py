@@ -0,0 +1,13 @@
+from django.conf import settings
+
+
+# connection_created receiver: apply settings.SQLITE_PRAGMAS to each new SQLite connection
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,73 @@
+from collections import namedtuple
+
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+
+from .models import Application, Project
+
+
+# Can this student apply to these projects?
+#
+# One set-based query answers it for a whole catalogue page: per project its
+# approval and free seats, whether the student already applied to it, and how
+# many applications the student has in total (the unique (student, project)
+# index serves both subqueries). The catalogue returns the flags to students
+# (core/async_views.project_catalogue) so the UI can disable Apply up front;
+# ApplicationViewSet.perform_create runs the same query for its checks.
+
+APPLICATION_LIMIT = 3
+
+
+class Eligibility(namedtuple('Eligibility', 'approved seats_full applied limit_reached')):
+    @property
+    def refusal(self):
+        """Why an apply would be refused, in the order the API reports it, or None."""
+        if self.limit_reached:
+            return f"You cannot apply to more than {APPLICATION_LIMIT} projects."
+        if self.applied:
+            return "You have already applied to this project."
+        if not self.approved:
+            return "This project is not yet approved for applications."
+        if self.seats_full:
+            return "No seats available for this project."
+        return None
+
+
+def _queryset(student_id, project_ids):
+    own = Application.objects.filter(student_id=student_id)
+    applied_count = own.values('student_id').annotate(total=Count('pk')).values('total')
+    return Project.objects.filter(pk__in=project_ids).annotate(
+        applied=Exists(own.filter(project=OuterRef('pk'))),
+        applied_count=Subquery(applied_count, output_field=IntegerField()),
+    ).values_list('pk', 'is_approved', 'seats_available', 'applied', 'applied_count')
+
+
+def _flags(rows):
+    return {
+        pk: Eligibility(
+            approved=approved, seats_full=seats_available <= 0, applied=applied,
+            limit_reached=(applied_count or 0) >= APPLICATION_LIMIT,
+        )
+        for pk, approved, seats_available, applied, applied_count in rows
+    }
+
+
+def check(student_id, project_ids):
+    """{project id: Eligibility} of the student for existing projects among `project_ids`."""
+    return _flags(_queryset(student_id, project_ids))
+
+
+async def acheck(student_id, project_ids):
+    return _flags([row async for row in _queryset(student_id, project_ids)])
+
+
+def as_json(flags):
+    """Catalogue representation: {project id: {applied, seats_full, limit_reached, can_apply}}."""
+    return {
+        pk: {
+            'applied': item.applied,
+            'seats_full': item.seats_full,
+            'limit_reached': item.limit_reached,
+            'can_apply': item.refusal is None,
+        }
+        for pk, item in flags.items()
+    }
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+
+# In-process publish/subscribe for the server-sent event stream (/api/events/,
+# core/sse.py).
+#
+# Channels:
+#   student:<student id>       status changes of the student's applications
+#   faculty:<faculty id>       new applications to the faculty's projects,
+#                              status changes of their own projects
+#   committee:<department>     projects entering / leaving the department's
+#                              review queue (approved committee members only)
+#
+# Writes publish through publish() / publish_many(), which defer delivery to
+# transaction commit, so a rolled-back write never reaches a browser. Single
+# saves publish from signals (core/signals.py); set-based updates publish
+# themselves (selection, allocation, committee reviews, bulk import).
+#
+# Publishers run in sync threads; every stream (served by core/sse.py) is a
+# Subscription living on the event loop of the ASGI worker, so delivery hops
+# onto that loop with call_soon_threadsafe. An idle stream costs a coroutine
+# and an empty queue: no thread and no timer, one heartbeat task per event
+# loop pings them all. Each event is encoded once, whatever the number of
+# subscribers. The broker only reaches streams of the process that made the
+# write: run the stream on a single ASGI worker, or replace the broker with a
+# shared one.
+
+STREAM_RETRY_MS = 5000
+PING = (None, b": ping\n\n")
+
+
+def student_channel(student_id):
+    return f'student:{student_id}'
+
+
+def faculty_channel(faculty_id):
+    return f'faculty:{faculty_id}'
+
+
+def committee_channel(department):
+    return f'committee:{department}'
+
+
+def encode(event):
+    """One SSE frame: the event type and its JSON payload."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscription:
+    """A stream's queue of (event, frame). Fed on its own event loop."""
+
+    def __init__(self, channels, loop, maxsize):
+        self.channels = tuple(channels)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, event, frame):
+        try:
+            self.queue.put_nowait((event, frame))
+        except asyncio.QueueFull:
+            if event is None:
+                return   # a ping: the queue is not empty anyway
+            # The client stopped reading: end the stream, it reconnects and refetches
+            self.overflowed = True
+
+
+class Broker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.channels = {}
+        self.loops = {}   # event loop -> its subscriptions (heartbeat)
+        self.count = 0
+
+    def subscribe(self, channels, maxsize):
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(channels, loop, maxsize)
+        with self.lock:
+            for channel in subscription.channels:
+                self.channels.setdefault(channel, set()).add(subscription)
+            if loop not in self.loops:
+                self.loops[loop] = set()
+                loop.create_task(self.heartbeat(loop))
+            self.loops[loop].add(subscription)
+            self.count += 1
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscribers = self.channels.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.channels[channel]
+            self.loops.get(subscription.loop, set()).discard(subscription)
+            self.count -= 1
+
+    async def heartbeat(self, loop):
+        """Ping this loop's streams every EVENTS_HEARTBEAT_SECONDS; ends when they are all gone."""
+        while True:
+            await asyncio.sleep(settings.EVENTS_HEARTBEAT_SECONDS)
+            with self.lock:
+                subscriptions = list(self.loops[loop])
+                if not subscriptions:
+                    del self.loops[loop]
+                    return
+            for subscription in subscriptions:
+                subscription.deliver(*PING)
+
+    def publish(self, channel, event):
+        with self.lock:
+            subscribers = list(self.channels.get(channel, ()))
+        if not subscribers:
+            return
+        frame = encode(event)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event, frame)
+            except RuntimeError:
+                # Its event loop is gone (worker shutting down)
+                self.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+async def stream(channels, faculty_id=None, check=None):
+    """SSE body: frames published to `channels`, and the broker's heartbeats.
+
+    `check`, an async callable, runs on each heartbeat; the stream ends when it
+    returns False (core/sse.py: the subscriber's token no longer holds).
+    """
+    subscription = broker.subscribe(channels, settings.EVENTS_QUEUE_SIZE)
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n: connected\n\n".encode()
+        while not subscription.overflowed:
+            event, frame = await subscription.queue.get()
+            if event is None and check is not None and not await check():
+                return
+            # Reviewers are not asked to review their own submissions
+            if event is not None and event['type'] == 'project.pending' and event['faculty'] == faculty_id:
+                continue
+            yield frame
+    finally:
+        # Runs when the client disconnects too (core/sse.py cancels the stream)
+        broker.unsubscribe(subscription)
+
+
+def publish_many(messages):
+    """Publish [(channel, event)] once the current transaction commits."""
+    messages = list(messages)
+    if not messages:
+        return
+
+    def send():
+        for channel, event in messages:
+            broker.publish(channel, event)
+    transaction.on_commit(send)
+
+
+def publish(channel, event):
+    publish_many([(channel, event)])
+
+
+# ---- Event builders (payloads stay small: clients refetch what they show) ----
+
+def application_status(application_id, student_id, project_id, status):
+    return student_channel(student_id), {
+        'type': 'application.status', 'application': application_id, 'project': project_id, 'status': status,
+    }
+
+
+def application_created(application_id, faculty_id, project_id):
+    return faculty_channel(faculty_id), {
+        'type': 'application.created', 'application': application_id, 'project': project_id,
+    }
+
+
+def project_messages(project, created=False):
+    """A new pending project for the department's reviewers, or a decided one for its owner and reviewers."""
+    event = {'type': 'project.pending' if created else 'project.status', 'project': project.pk,
+             'faculty': project.faculty_id, 'department': project.department, 'status': project.status}
+    messages = [(committee_channel(project.department), event)]
+    if not created:
+        messages.append((faculty_channel(project.faculty_id), event))
+    return messages
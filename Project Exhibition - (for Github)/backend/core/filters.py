@@ -0,0 +1,42 @@
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+from . import search as fulltext
+
+
+# Server-side filters for the project catalogue:
+#   ?department=CSE&difficulty=hard&has_seats=true&search=robot
+class ProjectCatalogueFilter(BaseFilterBackend):
+    TRUE_VALUES = {'1', 'true', 'yes'}
+
+    def filter_queryset(self, request, queryset, view):
+        # Only the catalogue listing is filtered; custom actions manage their own querysets
+        if getattr(view, 'action', None) != 'list':
+            return queryset
+        return self.apply(queryset, request.query_params)
+
+    @classmethod
+    def apply(cls, queryset, params):
+        department = params.get('department')
+        if department:
+            queryset = queryset.filter(department=department)
+
+        difficulty = params.get('difficulty')
+        if difficulty:
+            queryset = queryset.filter(difficulty=difficulty)
+
+        if params.get('has_seats', '').lower() in cls.TRUE_VALUES:
+            queryset = queryset.filter(seats_available__gt=0)
+
+        search = params.get('search', '').strip()
+        if search:
+            # Prefix-matched words through the full-text index (core/search.py)
+            words = fulltext.terms(search)
+            if not fulltext.supported():
+                queryset = queryset.filter(Q(title__icontains=search) | Q(abstract__icontains=search))
+            elif words:
+                queryset = queryset.filter(pk__in=fulltext.matching_ids(words))
+            else:
+                queryset = queryset.none()
+
+        return queryset
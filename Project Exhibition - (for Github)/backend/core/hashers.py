@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher,
+)
+
+
+# Password hashers whose cost comes from settings.PASSWORD_HASH_COST instead
+# of class attributes, so it can be tuned per deployment (and per benchmark
+# run) without new hasher classes. They keep Django's algorithm names: hashes
+# stay interchangeable with the stock hashers, and a cost change makes
+# must_update() true, so passwords are re-hashed at the next login.
+
+def tunable(base, name):
+    default = getattr(base, name)
+
+    def get(self):
+        return settings.PASSWORD_HASH_COST.get(self.algorithm, {}).get(name, default)
+    return property(get)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = tunable(PBKDF2PasswordHasher, 'iterations')
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = tunable(ScryptPasswordHasher, 'work_factor')
+    block_size = tunable(ScryptPasswordHasher, 'block_size')
+    parallelism = tunable(ScryptPasswordHasher, 'parallelism')
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * n * r bytes; OpenSSL refuses more than 32 MiB
+        # unless told otherwise, so leave room for the configured cost
+        return 2 * 128 * self.work_factor * self.block_size
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    # Needs the argon2-cffi package
+    time_cost = tunable(Argon2PasswordHasher, 'time_cost')
+    memory_cost = tunable(Argon2PasswordHasher, 'memory_cost')
+    parallelism = tunable(Argon2PasswordHasher, 'parallelism')
+
@@ -0,0 +1,118 @@
+import logging
+import traceback
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+# Durable background jobs, stored in the core_job table.
+#
+# Request handlers commit only their primary state change and enqueue() the
+# follow-ups in the same transaction: a job exists exactly when the change
+# that asked for it committed. `manage.py run_jobs` workers claim due jobs in
+# batches and run them grouped by kind: a handler receives the payloads of
+# every job of its kind in the batch at once and coalesces them (counter
+# deltas of fifty applies to one project become one UPDATE).
+#
+# A batch's effects and the deletion of its jobs commit together, so a worker
+# that dies mid-batch leaves the jobs queued and no effect is applied twice.
+# A kind that raises is rolled back to its savepoint; its jobs are then run
+# one by one so a single bad payload cannot hold up the others, and the
+# failing ones are retried with exponential backoff. After JOBS_MAX_ATTEMPTS
+# a job is kept with status 'failed' (see the admin, `run_jobs --retry-failed`).
+#
+# Several workers may run at once: on PostgreSQL they skip each other's
+# locked rows, on SQLite the write lock runs one batch at a time.
+#
+# With JOBS_EAGER (the default) there is no worker: enqueue() runs the handler
+# right away in the caller's transaction.
+
+logger = logging.getLogger(__name__)
+
+# kind -> dotted path of handler(payloads), imported on first use
+HANDLERS = {
+    'counters.applications': 'core.counters.apply_application_changes',
+    'counters.projects': 'core.counters.apply_project_changes',
+    'counters.departments': 'core.counters.apply_department_moves',
+    'applications.reject_others': 'core.selection.reject_other_applications',
+}
+
+
+def handler_for(kind):
+    return import_string(HANDLERS[kind])
+
+
+def enqueue(kind, payload):
+    """Queue a follow-up of the current transaction (or run it now with JOBS_EAGER)."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'.")
+    if settings.JOBS_EAGER:
+        handler_for(kind)([payload])
+        return None
+    return Job.objects.create(kind=kind, payload=payload)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def _failed(job, now):
+    job.attempts += 1
+    job.last_error = traceback.format_exc(limit=5)
+    if job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+        job.status = Job.FAILED
+    else:
+        job.run_after = now + retry_delay(job.attempts)
+    logger.warning("Job %s #%s failed (attempt %s)", job.kind, job.pk, job.attempts, exc_info=True)
+    return job
+
+
+def run_batch(limit=None):
+    """Claim and run one batch of due jobs. Returns (jobs run, jobs failed)."""
+    limit = limit or settings.JOBS_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.QUEUED, run_after__lte=now)
+            .order_by('id')[:limit]
+        )
+        by_kind = defaultdict(list)
+        for job in jobs:
+            by_kind[job.kind].append(job)
+
+        done, failed = [], []
+        for kind, group in by_kind.items():
+            try:
+                with transaction.atomic():
+                    handler_for(kind)([job.payload for job in group])
+            except Exception:
+                if len(group) == 1:
+                    failed.append(_failed(group[0], now))
+                    continue
+                # Find the bad payloads: run the group's jobs one at a time
+                for job in group:
+                    try:
+                        with transaction.atomic():
+                            handler_for(kind)([job.payload])
+                    except Exception:
+                        failed.append(_failed(job, now))
+                    else:
+                        done.append(job)
+            else:
+                done.extend(group)
+
+        Job.objects.filter(pk__in=[job.pk for job in done]).delete()
+        Job.objects.bulk_update(failed, ['status', 'attempts', 'run_after', 'last_error'])
+    return len(done), len(failed)
+
+
+def retry_failed():
+    """Queue the failed jobs again with a fresh set of attempts."""
+    return Job.objects.filter(status=Job.FAILED).update(status=Job.QUEUED, attempts=0, run_after=timezone.now())
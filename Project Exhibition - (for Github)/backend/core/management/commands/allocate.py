@@ -0,0 +1,35 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.allocation import run_allocation
+
+
+class Command(BaseCommand):
+    help = "Allocate students to projects with a stable matching (dry run unless --commit)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--commit", action="store_true",
+                            help="Write the allocation to the database.")
+        parser.add_argument("--show", type=int, default=20,
+                            help="Number of individual application changes to print.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = run_allocation(commit=options["commit"])
+        elapsed = time.perf_counter() - started
+
+        summary = result.summary()
+        summary["seconds"] = round(elapsed, 3)
+        self.stdout.write(json.dumps(summary, indent=2))
+
+        for app_id, old, new in result.changes[:options["show"]]:
+            self.stdout.write(f"  application {app_id}: {old} -> {new}")
+        if len(result.changes) > options["show"]:
+            self.stdout.write(f"  ... {len(result.changes) - options['show']} more")
+
+        if not result.committed:
+            self.stdout.write(self.style.WARNING("Dry run: nothing written. Re-run with --commit to apply."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Allocation committed."))
@@ -0,0 +1,69 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core import benchmarks, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every API route through the DRF test client against the current "
+        "database (seed it with seed_data): p50/p95 latency, queries and peak memory "
+        "per scenario. Compares with a stored baseline and fails on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=20, help="Timed requests per scenario.")
+        parser.add_argument("--only", help="Only scenarios whose name contains this text.")
+        parser.add_argument("--baseline", default=str(settings.BASE_DIR / "bench_baseline.json"))
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+        parser.add_argument("--threshold", type=float, default=0.25,
+                            help="Allowed p95 / memory growth over the baseline (0.25 = 25%%).")
+        parser.add_argument("--min-ms", type=float, default=5.0,
+                            help="p95 growth below this many milliseconds is never a regression.")
+        parser.add_argument("--password", default=seed.DEFAULT_PASSWORD, help="Password of the seeded users.")
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        uncovered = benchmarks.uncovered_routes()
+        if uncovered:
+            raise CommandError(f"Routes without a benchmark scenario: {', '.join(uncovered)}")
+
+        def log(name, result):
+            if not options["json"]:
+                self.stdout.write(
+                    f"{name:<52} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                    f"{result['queries']:>7} {result['peak_kib']:>10.1f}  {','.join(map(str, result['status']))}"
+                )
+
+        if not options["json"]:
+            self.stdout.write(f"{'scenario':<52} {'p50 ms':>9} {'p95 ms':>9} {'queries':>7} {'peak KiB':>10}  status")
+        # DEBUG off as in production (no query log, no debug tracebacks); no rate limits on the samples
+        with override_settings(DEBUG=False, THROTTLE_ENABLED=False,
+                               ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            try:
+                results = benchmarks.run_suite(options["samples"], options["password"], options["only"], log)
+            except LookupError as exc:
+                raise CommandError(str(exc))
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+
+        if options["save_baseline"]:
+            benchmarks.save_baseline(options["baseline"], results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+        try:
+            baseline = benchmarks.load_baseline(options["baseline"])
+        except FileNotFoundError:
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save-baseline to create one.")
+            return
+        if baseline.get("dataset") != benchmarks.dataset_size():
+            self.stderr.write(self.style.WARNING(
+                f"Dataset differs from the baseline's {baseline.get('dataset')}; comparisons may be off."
+            ))
+        regressions = benchmarks.compare(results, baseline["results"], options["threshold"], options["min_ms"])
+        if regressions:
+            raise CommandError("Performance regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,86 @@
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from core.bench import latency_summary, run_concurrently
+from core.models import Application, Faculty, Project, Student
+from core.roles import clear_role_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent applies against the configured database "
+        "(DB_ENGINE=sqlite|postgres, SQLITE_TUNED=true|false). "
+        "Creates its own throwaway users/projects and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=400)
+        parser.add_argument("--projects", type=int, default=40)
+        parser.add_argument("--seats", type=int, default=5)
+        parser.add_argument("--threads", type=int, default=32)
+
+    def handle(self, *args, **options):
+        tag = f"bench_{uuid.uuid4().hex[:8]}"
+        owner_user = User.objects.create(username=f"{tag}_faculty")
+        owner = Faculty.objects.create(user=owner_user, department=tag)
+        projects = Project.objects.bulk_create([
+            Project(faculty=owner, title=f"{tag} {i}", abstract="Benchmark", status="approved",
+                    is_approved=True, seats=options["seats"], seats_available=options["seats"])
+            for i in range(options["projects"])
+        ])
+        users = User.objects.bulk_create([
+            User(username=f"{tag}_s{i}") for i in range(options["students"])
+        ])
+        Student.objects.bulk_create([
+            Student(user=user, roll_number=f"{tag}_{i}", course="Bench") for i, user in enumerate(users)
+        ])
+        users = list(User.objects.filter(username__startswith=f"{tag}_s"))
+
+        # Every student applies to three projects, so seats are heavily contended
+        project_ids = [p.pk for p in Project.objects.filter(faculty=owner)]
+        calls = [
+            (user, project_ids[(i * 7 + k) % len(project_ids)])
+            for i, user in enumerate(users) for k in range(3)
+        ]
+        clear_role_cache()
+        # Refused applies are expected; keep the 400 warnings out of the report
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+
+        def apply(call):
+            user, project_id = call
+            client = APIClient(SERVER_NAME="localhost")
+            client.force_authenticate(user)
+            return client.post("/api/applications/", {"project": project_id}, format="json").status_code
+
+        try:
+            # Measures the write path itself: no rate limits, no admission queue (see bench_overload)
+            with override_settings(THROTTLE_ENABLED=False, ADMISSION_CONTROL=False):
+                statuses, latencies, elapsed = run_concurrently(apply, calls, options["threads"])
+
+            booked = Application.objects.filter(project__faculty=owner).count()
+            capacity = options["projects"] * options["seats"]
+            report = {
+                "vendor": connection.vendor,
+                "sqlite_tuned": connection.vendor == "sqlite" and bool(settings.SQLITE_PRAGMAS),
+                "pooled": bool(connection.settings_dict.get("OPTIONS", {}).get("pool")),
+                "threads": options["threads"],
+                **latency_summary(latencies, elapsed),
+                "created": statuses.count(201),
+                "refused": statuses.count(400),
+                "errors": len(statuses) - statuses.count(201) - statuses.count(400),
+                "booked": booked,
+                "capacity": capacity,
+                "overbooked": booked > capacity,
+            }
+            self.stdout.write(json.dumps(report, indent=2))
+        finally:
+            Application.objects.filter(project__faculty=owner).delete()
+            User.objects.filter(username__startswith=tag).delete()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import resource
+import time
+import uuid
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.bench import latency_summary
+from core.models import Faculty, Project, Student
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the read endpoints of a running server with many concurrent "
+        "keep-alive connections, e.g. runserver/gunicorn (WSGI) vs uvicorn (ASGI). "
+        "Creates its own throwaway student/projects in the server's database and "
+        "deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/api/projects/")
+        parser.add_argument("--connections", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=5, help="requests per connection")
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--timeout", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        # Every connection is a socket: make sure the process may open that many
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = options["connections"] + 256
+        if soft < wanted:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+        tag = f"bench_{uuid.uuid4().hex[:8]}"
+        owner = Faculty.objects.create(user=User.objects.create(username=f"{tag}_faculty"), department=tag)
+        Project.objects.bulk_create([
+            Project(faculty=owner, title=f"{tag} {i}", abstract="Benchmark", status="approved",
+                    is_approved=True, seats=5, seats_available=5)
+            for i in range(options["projects"])
+        ])
+        student = Student.objects.create(
+            user=User.objects.create(username=f"{tag}_student"), roll_number=tag, course="Bench"
+        )
+        token = str(AccessToken.for_user(student.user))
+
+        try:
+            report = asyncio.run(self.load(options, token))
+            report.update(url=options["url"], connections=options["connections"])
+            self.stdout.write(json.dumps(report, indent=2))
+        finally:
+            User.objects.filter(username__startswith=tag).delete()
+
+    async def load(self, options, token):
+        url = urlsplit(options["url"])
+        path = url.path + (f"?{url.query}" if url.query else "")
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\n"
+            f"Authorization: Bearer {token}\r\nConnection: keep-alive\r\n\r\n"
+        ).encode()
+        latencies, statuses, failures = [], {}, []
+        start = asyncio.Event()
+
+        async def client():
+            await start.wait()
+            try:
+                reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+            except OSError as exc:
+                failures.append(type(exc).__name__)
+                return
+            try:
+                for _ in range(options["requests"]):
+                    started = time.perf_counter()
+                    writer.write(request)
+                    await writer.drain()
+                    status, keep_alive = await read_response(reader)
+                    latencies.append(time.perf_counter() - started)
+                    statuses[status] = statuses.get(status, 0) + 1
+                    if not keep_alive:
+                        writer.close()
+                        reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                failures.append(type(exc).__name__)
+            finally:
+                writer.close()
+
+        tasks = [asyncio.create_task(client()) for _ in range(options["connections"])]
+        started = time.perf_counter()
+        start.set()
+        await asyncio.wait(tasks, timeout=options["timeout"])
+        elapsed = time.perf_counter() - started
+        timed_out = sum(not task.done() for task in tasks)
+        for task in tasks:
+            task.cancel()
+
+        return {
+            **latency_summary(latencies, elapsed),
+            "statuses": {str(code): n for code, n in sorted(statuses.items())},
+            "failed_connections": len(failures),
+            "timed_out_connections": timed_out,
+        }
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; returns (status code, connection kept alive)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get("connection", "").lower() != "close"
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import resource
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import events
+from core.bench import percentile
+from core.models import Committee, Faculty, Project
+from core.roles import clear_role_cache
+from exhibition_backend.asgi import application
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold many idle /api/events/ streams open on one worker (the project's ASGI "
+        "application, in process) and report memory and threads per stream and the "
+        "fan-out latency of a project submission to all of them. "
+        "Creates its own throwaway faculty and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=2000)
+        parser.add_argument("--events", type=int, default=5, help="Submissions fanned out to every stream.")
+        parser.add_argument("--timeout", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        tag = f"bench_{uuid.uuid4().hex[:8]}"
+        reviewer = Faculty.objects.create(user=User.objects.create(username=f"{tag}_reviewer"), department=tag)
+        Committee.objects.create(
+            user_id=reviewer.user_id, degree="PhD", specialization="Bench",
+            years_of_experience=1, approved_by_admin=True,
+        )
+        owner = Faculty.objects.create(user=User.objects.create(username=f"{tag}_owner"), department=tag)
+        token = str(AccessToken.for_user(reviewer.user))
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                report = asyncio.run(self.load(options, token, owner, tag))
+            self.stdout.write(json.dumps(report, indent=2))
+        finally:
+            User.objects.filter(username__startswith=tag).delete()
+            clear_role_cache()
+
+    async def load(self, options, token, owner, tag):
+        disconnect = asyncio.Event()
+        connected, received, statuses = [], [], {}
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/api/events/", "raw_path": b"/api/events/",
+            "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())], "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+
+        async def connection(i):
+            requested = False
+            ready = asyncio.Event()
+
+            async def receive():
+                nonlocal requested
+                if not requested:
+                    requested = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses[message["status"]] = statuses.get(message["status"], 0) + 1
+                    if message["status"] != 200:
+                        ready.set()
+                elif message["type"] == "http.response.body":
+                    body = message.get("body", b"")
+                    if not ready.is_set():
+                        ready.set()
+                        connected.append(time.perf_counter())
+                    elif body.startswith(b"event: "):
+                        received.append((i, time.perf_counter()))
+
+            task = asyncio.ensure_future(application(dict(scope), receive, send))
+            await ready.wait()
+            return task
+
+        # Warm up (imports, role cache) before measuring
+        warm = await connection(-1)
+        rss_before = rss_kib()
+        started = time.perf_counter()
+        tasks = await asyncio.wait_for(
+            asyncio.gather(*(connection(i) for i in range(options["connections"]))), options["timeout"]
+        )
+        connect_seconds = time.perf_counter() - started
+        rss_after = rss_kib()
+        open_streams = events.broker.count
+        threads = threading.active_count()
+
+        # Each submission is a real Project save: signal -> on_commit -> broker -> every stream
+        fanouts = []
+        for n in range(options["events"]):
+            received.clear()
+            began = time.perf_counter()
+            await sync_to_async(Project.objects.create)(
+                faculty=owner, department=tag, title=f"{tag} {n}", abstract="Benchmark",
+            )
+            deadline = began + options["timeout"]
+            while len(received) < open_streams and time.perf_counter() < deadline:
+                await asyncio.sleep(0.001)
+            latencies = sorted(at - began for _, at in received)
+            fanouts.append({
+                "delivered": len(received),
+                "first_ms": round(latencies[0] * 1000, 2) if latencies else None,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+                "last_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+            })
+
+        disconnect.set()
+        await asyncio.gather(warm, *tasks, return_exceptions=True)
+        streams = len(tasks)
+        return {
+            "connections": streams,
+            "statuses": statuses,
+            "open_streams": open_streams,
+            "threads": threads,
+            "connect_seconds": round(connect_seconds, 2),
+            "rss_kib_per_stream": round((rss_after - rss_before) / max(streams, 1), 1),
+            "fanout": fanouts,
+            "streams_left_after_disconnect": events.broker.count,
+        }
+
+
+def rss_kib():
+    """Current resident set size (Linux), else the peak."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.utils.module_loading import import_string
+
+from core.bench import latency_summary
+from core.models import Student
+from core.roles import clear_role_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark logins (POST /api/auth/login/ through the ASGI handler) for one "
+        "or more password hashers and report logins/sec per core. "
+        "Creates its own throwaway students and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasher", action="append", choices=sorted(settings.PASSWORD_HASHER_CHOICES),
+            help="Hasher to measure; repeat to compare (default: the configured PASSWORD_HASHER).",
+        )
+        parser.add_argument(
+            "--cost", action="append", default=[], metavar="KEY=VALUE",
+            help="Cost parameter override, e.g. --cost iterations=600000 or --cost work_factor=65536.",
+        )
+        parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS,
+                            help="Hashing pool size (PASSWORD_HASH_WORKERS).")
+        parser.add_argument("--logins", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=50, help="Logins in flight at once.")
+        parser.add_argument("--users", type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            cost = {key: int(value) for key, value in (item.split("=", 1) for item in options["cost"])}
+        except ValueError:
+            raise CommandError("--cost expects KEY=INTEGER")
+
+        tag = f"bench_{uuid.uuid4().hex[:8]}"
+        users = User.objects.bulk_create([User(username=f"{tag}_{i}") for i in range(options["users"])])
+        Student.objects.bulk_create([
+            Student(user=user, roll_number=f"{tag}_{i}", course="Bench") for i, user in enumerate(users)
+        ])
+        reports = []
+        try:
+            for name in options["hasher"] or [settings.PASSWORD_HASHER]:
+                reports.append(self.measure(name, cost, tag, options))
+        finally:
+            User.objects.filter(username__startswith=tag).delete()
+            clear_role_cache()
+        self.stdout.write(json.dumps(reports if len(reports) > 1 else reports[0], indent=2))
+
+    def measure(self, name, cost, tag, options):
+        algorithm, path = settings.PASSWORD_HASHER_CHOICES[name]
+        hasher_class = import_string(path)
+        costs = {key: dict(value) for key, value in settings.PASSWORD_HASH_COST.items()}
+        costs[algorithm] = {
+            **costs.get(algorithm, {}),
+            **{key: value for key, value in cost.items() if hasattr(hasher_class, key)},
+        }
+        with override_settings(
+            PASSWORD_HASHERS=[path], PASSWORD_HASH_COST=costs, PASSWORD_HASH_WORKERS=options["workers"],
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], THROTTLE_ENABLED=False,
+        ):
+            hasher = get_hasher(algorithm)
+            report = {
+                "hasher": algorithm,
+                "cost": {key: getattr(hasher, key) for key in costs[algorithm]},
+            }
+            # Every user shares one hash: setup stays cheap, verification cost is the same
+            password = "bench-password"
+            started = time.perf_counter()
+            try:
+                encoded = make_password(password)
+            except ValueError as exc:
+                # e.g. argon2-cffi not installed
+                return {**report, "error": str(exc)}
+            hash_seconds = time.perf_counter() - started
+            User.objects.filter(username__startswith=tag).update(password=encoded)
+
+            latencies, statuses, elapsed = asyncio.run(self.login_burst(tag, password, options))
+
+        cores = min(options["workers"], os.cpu_count() or 1)
+        summary = latency_summary(latencies, elapsed)
+        return {
+            **report,
+            "workers": options["workers"],
+            "cores": cores,
+            "concurrency": options["concurrency"],
+            "hash_ms": round(hash_seconds * 1000, 2),
+            **summary,
+            "per_core_per_second": round(summary["per_second"] / cores, 1),
+            "errors": len(statuses) - statuses.count(200),
+        }
+
+    async def login_burst(self, tag, password, options):
+        client = AsyncClient()
+        gate = asyncio.Semaphore(options["concurrency"])
+        latencies, statuses = [], []
+
+        async def login(i):
+            async with gate:
+                began = time.perf_counter()
+                response = await client.post(
+                    "/api/auth/login/",
+                    {"username": f"{tag}_{i % options['users']}", "password": password},
+                    content_type="application/json",
+                )
+                latencies.append(time.perf_counter() - began)
+                statuses.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(options["logins"])))
+        return latencies, statuses, time.perf_counter() - started
@@ -0,0 +1,112 @@
+import json
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from core.bench import latency_summary, run_concurrently
+from core.models import Application, Faculty, Project, Student
+from core.roles import clear_role_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Overload test of POST /api/applications/: the same number of applies at the "
+        "base concurrency, then at --factor times the concurrency without and with "
+        "admission control (core/throttling.py). Clients retry shed applies after "
+        "Retry-After. Reports goodput (created per second) and the client-side latency "
+        "of successful applies. Rate limits are off, so only admission "
+        "control sheds load. Creates its own throwaway users/projects and deletes them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Base concurrency.")
+        parser.add_argument("--factor", type=int, default=10, help="Overload factor.")
+        parser.add_argument("--requests", type=int, default=600, help="Applies per phase.")
+        parser.add_argument("--projects", type=int, default=20)
+        parser.add_argument("--retries", type=int, default=20, help="Retries of a shed apply before giving up.")
+
+    def handle(self, *args, **options):
+        # Shed / refused requests are expected; keep the warnings out of the report
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        overload = options["threads"] * options["factor"]
+        phases = [
+            ("baseline", options["threads"], False),
+            ("overload", overload, False),
+            ("overload_admission", overload, True),
+        ]
+        report = {
+            "vendor": connection.vendor,
+            "admission": {
+                "max_concurrent": settings.ADMISSION_MAX_CONCURRENT,
+                "queue_size": settings.ADMISSION_QUEUE_SIZE,
+                "max_wait": settings.ADMISSION_MAX_WAIT,
+            },
+        }
+        for name, threads, admission in phases:
+            with override_settings(THROTTLE_ENABLED=False, ADMISSION_CONTROL=admission):
+                report[name] = self.phase(threads, options)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def phase(self, threads, options):
+        tag = f"bench_{uuid.uuid4().hex[:8]}"
+        owner = Faculty.objects.create(user=User.objects.create(username=f"{tag}_faculty"), department=tag)
+        # Enough seats for everyone: every admitted apply is a real write
+        Project.objects.bulk_create([
+            Project(faculty=owner, title=f"{tag} {i}", abstract="Benchmark", status="approved",
+                    is_approved=True, seats=options["requests"], seats_available=options["requests"])
+            for i in range(options["projects"])
+        ])
+        students = -(-options["requests"] // 3)
+        User.objects.bulk_create([User(username=f"{tag}_s{i}") for i in range(students)])
+        users = list(User.objects.filter(username__startswith=f"{tag}_s").order_by("id"))
+        Student.objects.bulk_create([
+            Student(user=user, roll_number=f"{tag}_{i}", course="Bench") for i, user in enumerate(users)
+        ])
+        project_ids = list(Project.objects.filter(faculty=owner).values_list("id", flat=True))
+        calls = [
+            (user, project_ids[(i * 7 + k) % len(project_ids)])
+            for i, user in enumerate(users) for k in range(3)
+        ][:options["requests"]]
+        clear_role_cache()
+
+        def apply(call):
+            # A well-behaved client: on 503 it waits Retry-After and tries again
+            user, project_id = call
+            client = APIClient(SERVER_NAME="localhost")
+            client.raise_request_exception = False
+            client.force_authenticate(user)
+            shed = 0
+            while True:
+                response = client.post("/api/applications/", {"project": project_id}, format="json")
+                if response.status_code != 503 or shed >= options["retries"]:
+                    return response.status_code, shed
+                shed += 1
+                time.sleep(float(response["Retry-After"]))
+
+        try:
+            results, latencies, elapsed = run_concurrently(apply, calls, threads)
+            statuses = [status for status, _ in results]
+            # Latency as the client sees it: from the first attempt until created, waits included
+            created = [latency for status, latency in zip(statuses, latencies) if status == 201]
+            summary = latency_summary(created, elapsed)
+            return {
+                "threads": threads,
+                "seconds": round(elapsed, 3),
+                "goodput_per_second": summary["per_second"],
+                "created_p50_ms": summary["p50_ms"],
+                "created_p95_ms": summary["p95_ms"],
+                "created_max_ms": summary["max_ms"],
+                "created": statuses.count(201),
+                "shed_responses": sum(shed for _, shed in results),
+                "errors": len(statuses) - statuses.count(201),
+            }
+        finally:
+            Application.objects.filter(project__faculty=owner).delete()
+            User.objects.filter(username__startswith=tag).delete()
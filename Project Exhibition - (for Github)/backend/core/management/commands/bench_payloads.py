@@ -0,0 +1,77 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from core import compression, renderers
+from core.bench import percentile
+from core.models import Application, Project
+from core.serializers import ApplicationListSerializer, ProjectSummarySerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure response bytes and serialization / rendering / compression time of the "
+        "largest list payloads (catalogue page, sparse catalogue page, application list) "
+        "over the current database (seed it with seed_data): stock json.dumps and DRF "
+        "JSONRenderer against the compact renderer (core/renderers.py), gzip and brotli."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="Rows per payload (the largest page size).")
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--fields", default="id,title,seats_available,difficulty,faculty_name",
+                            help="Sparse fieldset of the catalogue card view.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        projects = list(Project.objects.filter(is_approved=True).select_related("faculty__user")
+                        .order_by("-created_at", "-id")[:rows])
+        applications = list(Application.objects.select_related("project__faculty__user", "student__user")
+                            .order_by("-id")[:rows])
+        if len(projects) < rows or len(applications) < rows:
+            raise CommandError(f"Needs {rows} approved projects and applications: run seed_data first.")
+
+        factory = RequestFactory()
+        sparse = factory.get("/api/projects/", {"fields": options["fields"]})
+        payloads = {
+            "catalogue": lambda: ProjectSummarySerializer(projects, many=True).data,
+            "catalogue_sparse": lambda: ProjectSummarySerializer(
+                projects, many=True, context={"request": sparse}
+            ).data,
+            "applications": lambda: ApplicationListSerializer(applications, many=True).data,
+        }
+        encoders = {
+            # What the response cache and the async views used before
+            "json_dumps": lambda data: json.dumps(data, cls=DjangoJSONEncoder).encode(),
+            "drf_json_renderer": lambda data: JSONRenderer().render(data),
+            "compact": renderers.dumps,
+        }
+
+        report = {"orjson": renderers.orjson is not None, "brotli": compression.brotli is not None, "rows": rows}
+        for name, serialize in payloads.items():
+            data = serialize()
+            result = {"serialize_ms": timed(serialize, repeat)}
+            for encoder, encode in encoders.items():
+                result[encoder] = {"bytes": len(encode(data)), "render_ms": timed(lambda: encode(data), repeat)}
+            body = renderers.dumps(data)
+            for encoding in ("gzip", "br") if compression.brotli is not None else ("gzip",):
+                result[encoding] = {
+                    "bytes": len(compression.compress(encoding, body)),
+                    "compress_ms": timed(lambda: compression.compress(encoding, body), repeat),
+                }
+            report[name] = result
+        self.stdout.write(json.dumps(report, indent=2))
+
+
+def timed(work, repeat):
+    """Median milliseconds of `work()` over `repeat` runs."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        work()
+        samples.append(time.perf_counter() - started)
+    return round(percentile(samples, 50) * 1000, 3)
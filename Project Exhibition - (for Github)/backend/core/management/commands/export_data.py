@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.bulk import EXPORTS, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Stream applications or allocation results (selected applications) as CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout).")
+
+    def handle(self, *args, **options):
+        lines = export_lines(options["kind"], options["format"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as out:
+                out.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.bulk import BATCH_SIZE, FORMATS, IMPORTERS, detect_format, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import students, faculty or projects from a CSV or JSONL file ('-' for stdin). "
+        "Columns - students: username,password,roll_number,course[,first_name,last_name,email]; "
+        "faculty: username,password,department[,...]; "
+        "projects: faculty (username),title,abstract[,timeline,difficulty,seats]."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS,
+                            help="Defaults to the file extension, else csv.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Password hashing processes (default: CPU count, 1 = inline).")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing.")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+        started = time.perf_counter()
+        if options["path"] == "-":
+            result = self.run(sys.stdin, fmt, options)
+        else:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = self.run(stream, fmt, options)
+
+        summary = result.summary()
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        self.stdout.write(json.dumps(summary, indent=2))
+        if result.error_count:
+            self.stdout.write(self.style.WARNING(f"{result.error_count} rows skipped."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Import finished."))
+
+    def run(self, stream, fmt, options):
+        return import_rows(
+            options["kind"], read_rows(stream, fmt),
+            workers=options["workers"] or os.cpu_count() or 1, batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
@@ -0,0 +1,50 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (core/jobs.py) until stopped, or until the "
+        "queue is drained with --once. Several workers may run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due.")
+        parser.add_argument("--batch-size", type=int, default=settings.JOBS_BATCH_SIZE)
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--retry-failed", action="store_true",
+                            help="Queue the jobs that ran out of attempts again first.")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            self.stdout.write(f"{jobs.retry_failed()} failed jobs queued again.")
+
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True   # finish the current batch, then exit
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        total_done = total_failed = 0
+        while not stopping:
+            close_old_connections()
+            done, failed = jobs.run_batch(options["batch_size"])
+            total_done += done
+            total_failed += failed
+            if done or failed:
+                self.stdout.write(f"{done} jobs done, {failed} failed")
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Stopped: {total_done} jobs done, {total_failed} failed."))
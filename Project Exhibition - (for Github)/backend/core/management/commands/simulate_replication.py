@@ -0,0 +1,42 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import replicas
+
+
+class Command(BaseCommand):
+    help = (
+        "Replication simulator for local SQLite setups: copy the primary database "
+        "into the 'replica' one (core/replicas.py) every --lag seconds, so the "
+        "replica is up to that far behind, until stopped. --once copies once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lag", type=float, default=2.0, help="Seconds between copies.")
+        parser.add_argument("--once", action="store_true", help="Copy once and exit.")
+
+    def handle(self, *args, **options):
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        copies = 0
+        while not stopping:
+            started = time.monotonic()
+            try:
+                replicas.replicate()
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            copies += 1
+            if options["once"]:
+                break
+            time.sleep(max(0.0, options["lag"] - (time.monotonic() - started)))
+
+        self.stdout.write(self.style.SUCCESS(f"Stopped: {copies} copies made."))
@@ -0,0 +1,258 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.decorators import sync_and_async_middleware
+
+
+# Per-route request metrics, exposed in Prometheus text format at /api/_metrics.
+#
+# MetricsMiddleware times every request and records, per (route, method):
+# a latency histogram, a histogram of DB queries per request, total DB time
+# and a response size histogram, plus request counts by status code.
+# Queries are counted by an execute wrapper installed on every new database
+# connection (connection_created, see core/apps.py); it reports to the
+# request in flight through a ContextVar, which asgiref copies into
+# sync_to_async threads, so queries of async views are counted as well.
+#
+# Requests slower than SLOW_REQUEST_MS are logged (logger "core.metrics")
+# with their SQL. The time spent in this bookkeeping is itself exported
+# (metrics_overhead_seconds_total) so its cost can be compared to the
+# request time it measures. Metrics are per process: scrape each worker.
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+MAX_LOGGED_STATEMENTS = 50
+UNMATCHED_ROUTE = "<unmatched>"
+# Any other method string (405s of made-up methods) is recorded as OTHER:
+# every label value is a RouteStats entry kept for the life of the process
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"))
+OTHER_METHOD = "OTHER"
+# A request relayed by a proxy: its REMOTE_ADDR is the proxy's, not the client's
+FORWARDED_HEADERS = ("HTTP_FORWARDED", "HTTP_X_FORWARDED_FOR", "HTTP_X_REAL_IP")
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot: above every bound (+Inf)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            yield bound, total
+
+
+class RouteStats:
+    __slots__ = ("latency", "queries", "db_seconds", "size", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_seconds = 0.0
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.overhead = 0.0
+        self.slow_requests = 0
+
+    def record(self, route, method, status, seconds, collector, size):
+        with self.lock:
+            stats = self.routes.get((route, method))
+            if stats is None:
+                stats = self.routes[(route, method)] = RouteStats()
+            stats.latency.observe(seconds)
+            stats.queries.observe(collector.queries)
+            stats.db_seconds += collector.db_seconds
+            if size is not None:
+                stats.size.observe(size)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def count_slow(self):
+        with self.lock:
+            self.slow_requests += 1
+
+    def add_overhead(self, seconds):
+        with self.lock:
+            self.overhead += seconds
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+            self.overhead = 0.0
+            self.slow_requests = 0
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self.lock:
+            routes = sorted(self.routes.items())
+            lines = []
+
+            def header(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            def histogram(name, attribute):
+                for (route, method), stats in routes:
+                    hist = getattr(stats, attribute)
+                    labels = f'route="{escape(route)}",method="{method}"'
+                    for bound, total in hist.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+            header("http_requests_total", "counter", "Requests by route, method and status code.")
+            for (route, method), stats in routes:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f'http_requests_total{{route="{escape(route)}",method="{method}",status="{status}"}} {count}'
+                    )
+            header("http_request_duration_seconds", "histogram", "Request latency by route.")
+            histogram("http_request_duration_seconds", "latency")
+            header("http_request_db_queries", "histogram", "Database queries per request by route.")
+            histogram("http_request_db_queries", "queries")
+            header("http_request_db_seconds_total", "counter", "Time spent in database queries by route.")
+            for (route, method), stats in routes:
+                lines.append(
+                    f'http_request_db_seconds_total{{route="{escape(route)}",method="{method}"}} {stats.db_seconds}'
+                )
+            header("http_response_size_bytes", "histogram", "Response body size by route (non-streaming).")
+            histogram("http_response_size_bytes", "size")
+            header("http_slow_requests_total", "counter", "Requests slower than SLOW_REQUEST_MS.")
+            lines.append(f"http_slow_requests_total {self.slow_requests}")
+            header("metrics_overhead_seconds_total", "counter", "Time spent recording these metrics.")
+            lines.append(f"metrics_overhead_seconds_total {self.overhead}")
+        return "\n".join(lines) + "\n"
+
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+class RequestCollector:
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self, keep_statements):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = [] if keep_statements else None
+
+
+_collector = ContextVar("metrics_collector", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    collector = _collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        collector.queries += 1
+        collector.db_seconds += elapsed
+        if collector.statements is not None and len(collector.statements) < MAX_LOGGED_STATEMENTS:
+            collector.statements.append((elapsed, sql))
+
+
+# connection_created receiver: count queries on every new connection
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def route_of(request):
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None and match.route else UNMATCHED_ROUTE
+
+
+@sync_and_async_middleware
+def MetricsMiddleware(get_response):
+    if not getattr(settings, "METRICS_ENABLED", True):
+        raise MiddlewareNotUsed
+    slow_seconds = (getattr(settings, "SLOW_REQUEST_MS", 0) or 0) / 1000
+
+    def begin():
+        collector = RequestCollector(keep_statements=bool(slow_seconds))
+        return collector, _collector.set(collector), time.perf_counter()
+
+    def finish(request, response, collector, token, started):
+        finished = time.perf_counter()
+        _collector.reset(token)
+        seconds = finished - started
+        size = None if response.streaming else len(response.content)
+        route = route_of(request)
+        method = request.method if request.method in METHODS else OTHER_METHOD
+        registry.record(route, method, response.status_code, seconds, collector, size)
+        if slow_seconds and seconds >= slow_seconds:
+            registry.count_slow()
+            log_slow_request(request, route, response, seconds, collector)
+        registry.add_overhead(time.perf_counter() - finished)
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            collector, token, started = begin()
+            response = await get_response(request)
+            finish(request, response, collector, token, started)
+            return response
+    else:
+        def middleware(request):
+            collector, token, started = begin()
+            response = get_response(request)
+            finish(request, response, collector, token, started)
+            return response
+    return middleware
+
+
+def log_slow_request(request, route, response, seconds, collector):
+    statements = "".join(
+        f"\n  {elapsed * 1000:8.2f} ms  {sql}"
+        for elapsed, sql in sorted(collector.statements, key=lambda item: item[0], reverse=True)
+    )
+    logger.warning(
+        "Slow request %s %s (%s) -> %s in %.1f ms, %d queries / %.1f ms%s",
+        request.method, request.get_full_path(), route, response.status_code, seconds * 1000,
+        collector.queries, collector.db_seconds * 1000, statements,
+    )
+
+
+def metrics_view(request):
+    """GET /api/_metrics: Prometheus scrape endpoint (METRICS_ALLOWED_IPS or staff sessions).
+
+    Behind a reverse proxy on the same host every request comes from
+    127.0.0.1: forwarded requests never pass the address check, so the proxy
+    must set X-Forwarded-For (or X-Real-IP / Forwarded), as nginx setups do.
+    """
+    forwarded = any(header in request.META for header in FORWARDED_HEADERS)
+    allowed = not forwarded and request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", ())
+    if not (allowed or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2025-09-20 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_committee'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='faculty',
+            name='department',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_approved', '-created_at', '-id'], name='project_catalogue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['difficulty', '-created_at', '-id'], name='project_difficulty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['seats_available'], name='project_seats_idx'),
+        ),
+    ]
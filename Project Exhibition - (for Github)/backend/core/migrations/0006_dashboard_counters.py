@@ -0,0 +1,82 @@
+# Generated by Django 5.2.6 on 2025-09-22 09:30
+
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    # core.counters.rebuild_counters as of this migration, on the historical
+    # models. Projects have no department column yet: it is the faculty's.
+    Project = apps.get_model('core', 'Project')
+    Application = apps.get_model('core', 'Application')
+    DashboardCounter = apps.get_model('core', 'DashboardCounter')
+
+    def count_of(**filters):
+        subquery = Application.objects.filter(project=OuterRef('pk'), **filters).order_by().values(
+            'project'
+        ).annotate(n=Count('id')).values('n')
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    rows = defaultdict(Counter)
+    for faculty_id, department, status, n in Project.objects.values_list(
+        'faculty_id', 'faculty__department', 'status'
+    ).annotate(n=Count('id')).order_by():
+        for key in (('faculty', str(faculty_id)), ('department', department)):
+            rows[key]['projects_total'] += n
+            rows[key][f'projects_{status}'] += n
+    for faculty_id, department, status, n in Application.objects.values_list(
+        'project__faculty_id', 'project__faculty__department', 'status'
+    ).annotate(n=Count('id')).order_by():
+        for key in (('faculty', str(faculty_id)), ('department', department)):
+            rows[key]['applications_total'] += n
+            rows[key][f'applications_{status}'] += n
+
+    Project.objects.update(applications_count=count_of(), selected_count=count_of(status='selected'))
+    DashboardCounter.objects.bulk_create(
+        [DashboardCounter(scope=scope, key=key, **dict(tallies)) for (scope, key), tallies in rows.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_project_catalogue_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='selected_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('faculty', 'Faculty'), ('department', 'Department')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('projects_total', models.IntegerField(default=0)),
+                ('projects_pending', models.IntegerField(default=0)),
+                ('projects_approved', models.IntegerField(default=0)),
+                ('projects_rejected', models.IntegerField(default=0)),
+                ('applications_total', models.IntegerField(default=0)),
+                ('applications_pending', models.IntegerField(default=0)),
+                ('applications_shortlisted', models.IntegerField(default=0)),
+                ('applications_selected', models.IntegerField(default=0)),
+                ('applications_rejected', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('scope', 'key')},
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2025-09-23 10:15
+
+from django.db import migrations, models
+
+
+def copy_department(apps, schema_editor):
+    Faculty = apps.get_model('core', 'Faculty')
+    Project = apps.get_model('core', 'Project')
+    Project.objects.update(
+        department=models.Subquery(
+            Faculty.objects.filter(pk=models.OuterRef('faculty_id')).values('department')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_dashboard_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='department',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(copy_department, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['department', 'status', 'created_at', 'id'], name='project_review_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2025-09-24 11:40
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_votes(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    ProjectReview = apps.get_model('core', 'ProjectReview')
+
+    def tally(decision):
+        reviews = ProjectReview.objects.filter(project=models.OuterRef('pk'), decision=decision).order_by().values(
+            'project'
+        ).annotate(n=models.Count('id')).values('n')
+        return Coalesce(
+            models.Subquery(reviews, output_field=models.IntegerField()), models.Value(0)
+        )
+
+    Project.objects.update(approve_votes=tally('approve'), disapprove_votes=tally('disapprove'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_project_department'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='approve_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='disapprove_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_votes, migrations.RunPython.noop),
+    ]
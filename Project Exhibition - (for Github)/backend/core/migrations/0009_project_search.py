@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2025-09-26 10:15
+
+from django.db import migrations
+
+
+# Full-text index over project titles / abstracts (core/search.py).
+# SQLite: FTS5 table kept in sync by the application.
+# PostgreSQL: generated, weighted tsvector column with a GIN index.
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE core_project_fts USING fts5(title, abstract, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO core_project_fts (rowid, title, abstract) SELECT id, title, abstract FROM core_project"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "ALTER TABLE core_project ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(abstract, '')), 'B')) STORED"
+        )
+        schema_editor.execute("CREATE INDEX project_search_idx ON core_project USING GIN (search_vector)")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS core_project_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS project_search_idx")
+        schema_editor.execute("ALTER TABLE core_project DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_review_votes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,10 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 # Faculty model (extends default User)
 class Faculty(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    department = models.CharField(max_length=100)
+    department = models.CharField(max_length=100, db_index=True)
 
     def __str__(self):
         return self.user.get_full_name() or self.user.username
@@ -23,6 +24,7 @@ class Student(models.Model):
 # Project proposed by a faculty. It is reviewed by a committee (other faculties).
 class Project(models.Model):
     faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='proposals')
+    department = models.CharField(max_length=100, blank=True)     # copy of faculty.department, kept in sync by core/signals.py
     title = models.CharField(max_length=255)
     abstract = models.TextField()
     timeline = models.CharField(max_length=255, blank=True)
@@ -42,6 +44,21 @@ class Project(models.Model):
     is_discarded = models.BooleanField(default=False)              # True if rejected by committee
     committee = models.ManyToManyField(Faculty, related_name='committee_projects', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    applications_count = models.PositiveIntegerField(default=0)   # maintained by core/counters.py
+    selected_count = models.PositiveIntegerField(default=0)       # maintained by core/counters.py
+    approve_votes = models.PositiveIntegerField(default=0)        # committee tallies, maintained by core/reviews.py
+    disapprove_votes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # Composite indexes backing the cursor-paginated catalogue (newest first)
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+            models.Index(fields=['is_approved', '-created_at', '-id'], name='project_catalogue_idx'),
+            models.Index(fields=['difficulty', '-created_at', '-id'], name='project_difficulty_idx'),
+            models.Index(fields=['seats_available'], name='project_seats_idx'),
+            # Committee review queue: one department's pending projects, oldest first
+            models.Index(fields=['department', 'status', 'created_at', 'id'], name='project_review_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -109,3 +126,65 @@ class Committee(models.Model):
 
     def __str__(self):
         return f"{self.user.username} ({self.degree})"
+
+
+# Denormalized dashboard tallies, one row per faculty member and one per department.
+# Updated incrementally by core/counters.py; `manage.py rebuild_counters` recomputes them.
+class DashboardCounter(models.Model):
+    SCOPE_FACULTY = 'faculty'
+    SCOPE_DEPARTMENT = 'department'
+
+    scope = models.CharField(max_length=20, choices=[(SCOPE_FACULTY, 'Faculty'), (SCOPE_DEPARTMENT, 'Department')])
+    key = models.CharField(max_length=100)       # faculty id or department name
+
+    projects_total = models.IntegerField(default=0)
+    projects_pending = models.IntegerField(default=0)
+    projects_approved = models.IntegerField(default=0)
+    projects_rejected = models.IntegerField(default=0)
+
+    applications_total = models.IntegerField(default=0)
+    applications_pending = models.IntegerField(default=0)
+    applications_shortlisted = models.IntegerField(default=0)
+    applications_selected = models.IntegerField(default=0)
+    applications_rejected = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('scope', 'key')
+
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
+
+
+
+# Background job (core/jobs.py): enqueued by request handlers in their own
+# transaction, run and deleted by `manage.py run_jobs`. Jobs that keep failing
+# stay behind with status 'failed' and their last error.
+class Job(models.Model):
+    QUEUED = 'queued'
+    FAILED = 'failed'
+
+    kind = models.CharField(max_length=50)          # key of core.jobs.HANDLERS
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=[(QUEUED, 'Queued'), (FAILED, 'Failed')], default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)     # pushed back after a failure
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Workers claim the oldest due jobs: WHERE status = 'queued' AND run_after <= now ORDER BY id
+        indexes = [models.Index(fields=['status', 'run_after', 'id'], name='job_queue_idx')]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+# Generation of a user's token claims (core/tokens.py). Access tokens carry the
+# generation they were issued at; bumping it (role, committee approval or
+# account changes) makes the claims of every older token stale.
+class TokenGeneration(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='token_generation')
+    generation = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.generation}"
@@ -0,0 +1,157 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# Keyset ("cursor") pagination for the project catalogue.
+# Rows are ordered newest first on (created_at, id) (oldest first with
+# newest_first = False, see ReviewQueuePagination) and the cursor encodes the
+# last row of the previous page, so every page is a single indexed range scan
+# no matter how deep the client scrolls (no OFFSET).
+# Works with DRF requests and, through apaginate_queryset, plain Django
+# requests in the async views (core/async_views.py).
+class ProjectCursorPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+    newest_first = True
+
+    def encode_cursor(self, obj):
+        raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def query_params(request):
+        return getattr(request, 'query_params', request.GET)
+
+    def decode_cursor(self, request):
+        encoded = self.query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, pk = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_page_size(self, request):
+        try:
+            size = int(self.query_params(request).get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            created_at, pk = cursor
+            if self.newest_first:
+                after = Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+            else:
+                after = Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            queryset = queryset.filter(after)
+
+        ordering = ('-created_at', '-id') if self.newest_first else ('created_at', 'id')
+        # Fetch one extra row to know whether a next page exists
+        return queryset.order_by(*ordering)[:self.page_size_value + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+# Committee review queue: the longest-waiting submissions come first
+class ReviewQueuePagination(ProjectCursorPagination):
+    page_size = 50
+    newest_first = False
+
+
+# Ranked full-text results (core/search.py) have no stable key to seek from,
+# so they are paged by number: ?page=2&page_size=20. Relevance queries stop
+# after a few pages in practice and the index does the heavy lifting.
+class SearchPagination:
+    page_query_param = 'page'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    max_page = 50
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_page_number(self, request):
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except (TypeError, ValueError):
+            raise NotFound('Invalid page.')
+        if not 1 <= number <= self.max_page:
+            raise NotFound('Invalid page.')
+        return number
+
+    def paginate(self, request, fetch):
+        """Call fetch(limit, offset) for this page (plus one row to detect a next page)."""
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.number = self.get_page_number(request)
+        rows = fetch(self.page_size_value + 1, (self.number - 1) * self.page_size_value)
+        self.has_next = len(rows) > self.page_size_value and self.number < self.max_page
+        return rows[:self.page_size_value]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.number + 1)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'results': data,
+        }
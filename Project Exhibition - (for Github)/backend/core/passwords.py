@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+# Bounded pool for password hashing and verification.
+#
+# Every signup hashes and every login verifies a password, each costing tens
+# to hundreds of milliseconds of CPU. Run on request threads, a login burst
+# pegs every worker and starves cheap requests; under ASGI the sync login view
+# even serializes all logins on the one thread Django uses for sync views.
+# Here hashing runs on PASSWORD_HASH_WORKERS threads (hashlib's pbkdf2/scrypt
+# and argon2-cffi release the GIL, so they use one core each): excess work
+# queues instead of oversubscribing the CPU, and async callers await the
+# result without blocking the event loop.
+#
+# The pool is first in, first out: bulk hashing (admin imports, hash_many)
+# keeps at most half of its workers busy, so logins and signups wait for one
+# hash at most, not for a whole import batch.
+
+_pool = None
+_bulk_slots = None
+_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(settings.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+        return _pool
+
+
+def _get_bulk_slots():
+    global _bulk_slots
+    with _lock:
+        if _bulk_slots is None:
+            _bulk_slots = threading.BoundedSemaphore(max(1, settings.PASSWORD_HASH_WORKERS // 2))
+        return _bulk_slots
+
+
+@receiver(setting_changed)
+def reset_pool(*, setting, **kwargs):
+    global _pool, _bulk_slots
+    if setting == 'PASSWORD_HASH_WORKERS':
+        with _lock:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = _bulk_slots = None
+
+
+def hash_password(password):
+    return get_pool().submit(make_password, password).result()
+
+
+async def ahash_password(password):
+    return await asyncio.wrap_future(get_pool().submit(make_password, password))
+
+
+def hash_many(passwords):
+    """Hash a batch on the pool, never more than half its workers at a time."""
+    pool, slots = get_pool(), _get_bulk_slots()
+    futures = []
+    for password in passwords:
+        slots.acquire()
+        try:
+            future = pool.submit(make_password, password)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+    return [future.result() for future in futures]
+
+
+def check(user, password):
+    """(is_correct, must_update) for `user`; None still runs a dummy hash so unknown usernames take as long."""
+    return get_pool().submit(verify_password, password, user.password if user else "").result()
+
+
+async def acheck(user, password):
+    return await asyncio.wrap_future(
+        get_pool().submit(verify_password, password, user.password if user else "")
+    )
+
+
+def authenticate(username, password):
+    """Active user with these credentials, or None. Re-hashes outdated hashes."""
+    user = User.objects.filter(username=username).first()
+    is_correct, must_update = check(user, password)
+    if not (is_correct and user.is_active):
+        return None
+    if must_update:
+        # Hasher or cost changed since this password was set
+        user.password = hash_password(password)
+        user.save(update_fields=['password'])
+    return user
+
+
+async def aauthenticate(username, password):
+    user = await User.objects.filter(username=username).afirst()
+    is_correct, must_update = await acheck(user, password)
+    if not (is_correct and user.is_active):
+        return None
+    if must_update:
+        user.password = await ahash_password(password)
+        await user.asave(update_fields=['password'])
+    return user
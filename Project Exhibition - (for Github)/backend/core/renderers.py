@@ -0,0 +1,48 @@
+import json
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:   # optional: falls back to the standard library encoder
+    orjson = None
+
+
+# Compact JSON for every API response: the DRF renderer (FastJSONRenderer),
+# the async views (json_response) and the response cache entries all go
+# through dumps(). orjson is used when installed; types it does not know
+# (Decimal, lazy translations, datetimes...) go through DRF's encoder, so the
+# output is the same either way.
+
+_encoder = JSONEncoder()
+if orjson is not None:
+    # Datetimes are formatted by DRF's encoder, as with the stock renderer
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """UTF-8 JSON bytes of `data`, without whitespace."""
+    if orjson is not None:
+        body = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+    else:
+        body = json.dumps(
+            data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+        ).encode()
+    # Like DRF: U+2028 / U+2029 are valid JSON but end a line in JavaScript source
+    return body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer through dumps() (orjson when installed)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
+
+
+def json_response(data, status=200, headers=None):
+    """JsonResponse through dumps(); `data` may be any JSON value."""
+    return HttpResponse(dumps(data), content_type='application/json', status=status, headers=headers)
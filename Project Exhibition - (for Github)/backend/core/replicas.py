@@ -0,0 +1,145 @@
+import contextvars
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Read replica routing (settings.REPLICA_READS, database alias 'replica').
+#
+# Only the read endpoints that tolerate a little staleness read from the
+# replica: the project viewset's GETs (detail, search, my projects), the
+# faculty's applications, and the async catalogue / review queue / my
+# applications / dashboard (core/async_views.py). They switch to it after
+# authentication; ReplicaRouter then sends every read of the request there.
+# Everything else, and every write, uses 'default'.
+#
+# Read-your-writes: a successful write request pins its user to the primary
+# for REPLICA_PIN_SECONDS (a cache entry, see PinMiddleware), which should
+# cover the replication lag. Response cache entries filled from the replica
+# are kept apart from the primary's and only live that long too
+# (core/response_cache.py), so a pinned user never gets a replica page.
+#
+# Locally the replica is a second SQLite file kept up to date by
+# `manage.py simulate_replication` (replicate() below), with a lag of your choice.
+
+REPLICA = 'replica'
+
+_reading = contextvars.ContextVar('replica_reads', default=False)
+
+
+def enabled():
+    return settings.REPLICA_READS and REPLICA in settings.DATABASES
+
+
+def reading_replica():
+    """Whether the current request reads from the replica."""
+    return _reading.get()
+
+
+def _pin_key(user_id):
+    return f'replica:pin:{user_id}'
+
+
+def pin(user_id):
+    cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def pinned(user_id):
+    return cache.get(_pin_key(user_id)) is not None
+
+
+async def apinned(user_id):
+    return await cache.aget(_pin_key(user_id)) is not None
+
+
+@contextmanager
+def reads_from(replica):
+    """Route the reads of the block to the replica (True) or the primary (False)."""
+    token = _reading.set(replica)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return REPLICA if _reading.get() else None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both sides
+        return True
+
+
+class ReplicaReadsMixin:
+    """Viewset mixin: safe-method requests of `replica_actions` read from the replica unless the user is pinned."""
+
+    replica_actions = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            enabled() and self.action in self.replica_actions and request.method in SAFE_METHODS
+            and not pinned(request.user.pk)
+        ):
+            self._replica_reads = _reading.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_reads', None)
+        if token is not None:
+            _reading.reset(token)
+            self._replica_reads = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def successful_write(request, response):
+    return request.method not in SAFE_METHODS and response.status_code < 400
+
+
+def pin_writer(request):
+    # DRF sets request.user; otherwise it is the session's (lazy, may query)
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        pin(user.pk)
+
+
+@sync_and_async_middleware
+def PinMiddleware(get_response):
+    """Pins the user of a successful write request to the primary (read-your-writes)."""
+    if not enabled():
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            response = await get_response(request)
+            if successful_write(request, response):
+                await sync_to_async(pin_writer)(request)
+            return response
+    else:
+        def middleware(request):
+            response = get_response(request)
+            if successful_write(request, response):
+                pin_writer(request)
+            return response
+    return middleware
+
+
+# ---- Replication simulator (SQLite) ----
+
+def replicate(source='default', target=REPLICA):
+    """Copy the primary SQLite database into the replica (a consistent snapshot, schema included)."""
+    primary, replica = connections[source], connections[target]
+    if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+        raise ValueError('The replication simulator needs SQLite on both sides.')
+    primary.ensure_connection()
+    replica.ensure_connection()
+    primary.connection.backup(replica.connection)
@@ -0,0 +1,126 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+
+from . import replicas
+from .renderers import dumps
+
+
+# Response cache for the project catalogue and project detail.
+#
+# Entries hold the rendered JSON body and its ETag, keyed on a global version
+# counter that lives in the cache itself. Every Project / Application write
+# bumps the version once its transaction commits (core/signals.py, plus the
+# update()-based paths in core/counters.py), so old entries are never read
+# again and simply age out after CATALOGUE_CACHE_TTL.
+#
+# Clients that send If-None-Match with the current ETag get a bodiless 304.
+#
+# Entries filled by a request reading from the read replica (core/replicas.py)
+# may be behind the version they are stored under: they get their own keys and
+# only live REPLICA_PIN_SECONDS.
+
+VERSION_KEY = 'catalogue:version'
+
+
+def _ttl():
+    return getattr(settings, 'CATALOGUE_CACHE_TTL', 600)
+
+
+def _initial_version():
+    # Start from the clock so a lost counter (eviction/restart) never reuses old keys
+    return time.time_ns() // 1000
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _initial_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, _initial_version(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def _incr_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, _initial_version(), timeout=None)
+
+
+def bump_version():
+    """Invalidate every cached page; runs after commit so readers never cache pre-commit data."""
+    transaction.on_commit(_incr_version)
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def catalogue_key(version, scope, host, params):
+    """Key for one catalogue page: role scope, host (next links are absolute) and query params."""
+    query = '&'.join(f'{name}={value}' for name, value in sorted(params.items()))
+    return f'catalogue:{version}:{scope}:{_digest(f"{host}?{query}")}'
+
+
+def project_key(version, scope, pk, fields=''):
+    """Key for one project detail; `fields` is the ?fields= sparse fieldset, if any."""
+    key = f'project:{version}:{scope}:{pk}'
+    return f'{key}:{_digest(fields)}' if fields else key
+
+
+def make_entry(data):
+    body = dumps(data)
+    return {'etag': f'"{hashlib.md5(body).hexdigest()}"', 'body': body}
+
+
+def _source(key):
+    return (f'{key}:replica', settings.REPLICA_PIN_SECONDS) if replicas.reading_replica() else (key, _ttl())
+
+
+def with_member(entry, name, value):
+    """`entry` (a JSON object) with one more top-level member, e.g. per-user data on a shared page."""
+    extra = dumps(value)
+    body = entry['body']
+    body = body[:-1] + (b',' if body != b'{}' else b'') + dumps(name) + b':' + extra + b'}'
+    return {'etag': f'"{hashlib.md5(entry["etag"].encode() + extra).hexdigest()}"', 'body': body}
+
+
+def load(key):
+    return cache.get(_source(key)[0])
+
+
+async def aload(key):
+    return await cache.aget(_source(key)[0])
+
+
+def store(key, entry):
+    key, ttl = _source(key)
+    cache.set(key, entry, ttl)
+
+
+async def astore(key, entry):
+    key, ttl = _source(key)
+    await cache.aset(key, entry, ttl)
+
+
+def respond(request, entry):
+    """200 with the cached body, or 304 if the client already holds this ETag."""
+    headers = {'ETag': entry['etag'], 'Cache-Control': 'private, no-cache'}
+    if_none_match = request.headers.get('If-None-Match', '')
+    # Weak comparison: compressing middleware may have turned the ETag into W/"..."
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    if entry['etag'] in tags or '*' in tags:
+        return HttpResponseNotModified(headers=headers)
+    return HttpResponse(entry['body'], content_type='application/json', headers=headers)
@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.db import transaction
+
+from . import events
+from .counters import record_project_changes
+from .models import Project, ProjectReview
+from .response_cache import bump_version
+
+
+# Committee voting on pending projects.
+#
+# Every decision is a ProjectReview row (one per reviewer and project; voting
+# again replaces the earlier vote). Project.approve_votes / disapprove_votes
+# are updated incrementally alongside, so resolving the quorum only looks at
+# the locked project row, never re-counts reviews.
+#
+# Quorum: a project is decided once one side holds a majority of
+# REVIEW_QUORUM_SIZE votes (e.g. 2 of 3). With the default of 1 the first vote
+# decides, as the single-click approve/reject did before.
+
+DECISIONS = ('approve', 'disapprove')
+
+
+def votes_needed():
+    return getattr(settings, 'REVIEW_QUORUM_SIZE', 1) // 2 + 1
+
+
+def resolve_status(approve_votes, disapprove_votes):
+    needed = votes_needed()
+    if approve_votes >= needed:
+        return 'approved'
+    if disapprove_votes >= needed:
+        return 'rejected'
+    return 'pending'
+
+
+class ReviewError(Exception):
+    def __init__(self, project_id, message):
+        super().__init__(message)
+        self.project_id = project_id
+        self.message = message
+
+
+def cast_votes(role, decisions):
+    """Record a reviewer's decisions for many projects in one transaction.
+
+    `decisions` is an iterable of (project_id, decision, comment). Returns
+    (projects, errors): the updated Project rows of accepted votes and a
+    ReviewError per project that cannot be voted on (not found, not pending,
+    other department, own project). Accepted votes are written even if other
+    entries fail.
+    """
+    latest = {}
+    for project_id, decision, comment in decisions:
+        latest[project_id] = (decision, comment)  # last decision per project wins
+
+    errors = []
+    with transaction.atomic():
+        # Row locks (PostgreSQL) / the IMMEDIATE write lock (SQLite) keep the
+        # tallies consistent with concurrent votes on the same project
+        projects = Project.objects.select_for_update().in_bulk(list(latest))
+        for project_id in latest:
+            project = projects.get(project_id)
+            if project is None:
+                errors.append(ReviewError(project_id, "Project not found."))
+            elif project.department != role.department:
+                errors.append(ReviewError(project_id, "You can only review projects from your department."))
+            elif project.faculty_id == role.faculty_id:
+                errors.append(ReviewError(project_id, "You cannot review your own project."))
+            elif project.status != 'pending':
+                errors.append(ReviewError(project_id, f"Project is already {project.status}."))
+        for error in errors:
+            projects.pop(error.project_id, None)
+        if not projects:
+            return [], errors
+
+        previous = {
+            review.project_id: review
+            for review in ProjectReview.objects.filter(reviewer_id=role.faculty_id, project_id__in=projects)
+        }
+        new_reviews, changed_reviews, written = [], [], []
+        for project_id, project in projects.items():
+            decision, comment = latest[project_id]
+            review = previous.get(project_id)
+            if review is None:
+                new_reviews.append(ProjectReview(
+                    project_id=project_id, reviewer_id=role.faculty_id, decision=decision, comment=comment,
+                ))
+            else:
+                if review.decision == decision and review.comment == comment:
+                    continue
+                _count(project, review.decision, -1)
+                review.decision, review.comment = decision, comment
+                changed_reviews.append(review)
+            _count(project, decision, +1)
+            written.append(project)
+        if not written:
+            # Every vote repeats an earlier one: nothing to write, cached pages stay valid
+            return list(projects.values()), errors
+
+        ProjectReview.objects.bulk_create(new_reviews)
+        ProjectReview.objects.bulk_update(changed_reviews, ['decision', 'comment'])
+
+        resolved = []
+        for project in written:
+            new_status = resolve_status(project.approve_votes, project.disapprove_votes)
+            if new_status != project.status:
+                resolved.append((project, project.status))
+                project.status = new_status
+                project.is_approved = new_status == 'approved'
+                project.is_discarded = new_status == 'rejected'
+        Project.objects.bulk_update(
+            written, ['approve_votes', 'disapprove_votes', 'status', 'is_approved', 'is_discarded']
+        )
+        record_project_changes(
+            (project.faculty_id, project.department, old_status, project.status) for project, old_status in resolved
+        )
+        # bulk_update sends no post_save
+        bump_version()
+        events.publish_many(
+            message for project, _ in resolved for message in events.project_messages(project)
+        )
+
+    return list(projects.values()), errors
+
+
+def _count(project, decision, delta):
+    field = 'approve_votes' if decision == 'approve' else 'disapprove_votes'
+    setattr(project, field, getattr(project, field) + delta)
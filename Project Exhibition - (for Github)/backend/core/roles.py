@@ -0,0 +1,181 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Role resolution for the current user.
+#
+# Looking up "is this user a student / faculty / committee member?" used to cost
+# one query per permission check plus one per view action. It is now resolved at
+# most once per request and served from, in order:
+#   1. the request itself (memoized by get_role)
+#   2. claims embedded in the JWT access token (role, profile ids, department,
+#      committee approval), as long as the token's generation is current
+#      (core/tokens.py marks it on the token)
+#   3. a process-local TTL cache keyed on user id
+#   4. a single User query joining all three profile tables
+# Profile saves/deletes invalidate the cache entry and bump the token
+# generation (see core/signals.py).
+
+UNRESOLVED = object()
+
+_cache = {}
+_lock = threading.Lock()
+
+
+class RoleContext:
+    def __init__(self, user_id, role=None, student_id=None, faculty_id=None,
+                 department=None, committee_approved=UNRESOLVED):
+        self.user_id = user_id
+        self.role = role                      # 'student', 'faculty' or None
+        self.student_id = student_id
+        self.faculty_id = faculty_id
+        self.department = department
+        # None: no committee profile, False: applied but not approved, True: approved
+        self._committee_approved = committee_approved
+
+    @property
+    def is_student(self):
+        return self.role == 'student'
+
+    @property
+    def is_faculty(self):
+        return self.role == 'faculty'
+
+    @property
+    def committee_approved(self):
+        if self._committee_approved is UNRESOLVED:
+            self._committee_approved = resolve_user_role(self.user_id).committee_approved
+        return self._committee_approved
+
+    @property
+    def is_committee(self):
+        return bool(self.committee_approved)
+
+    def claims(self):
+        """Token claims describing this role (see RoleTokenObtainPairSerializer)."""
+        return {
+            'role': self.role,
+            'student_id': self.student_id,
+            'faculty_id': self.faculty_id,
+            'department': self.department,
+            'committee_approved': self.committee_approved,
+        }
+
+    @classmethod
+    def from_claims(cls, user_id, token):
+        return cls(
+            user_id,
+            role=token.get('role'),
+            student_id=token.get('student_id'),
+            faculty_id=token.get('faculty_id'),
+            department=token.get('department'),
+            committee_approved=token.get('committee_approved', UNRESOLVED),
+        )
+
+
+def trusts_claims(token):
+    """Whether the role claims of an access token are current (see core/tokens.py)."""
+    return token is not None and getattr(token, 'current', False)
+
+
+def role_of(user):
+    """RoleContext of a User loaded with select_related('student', 'faculty', 'committee_profile')."""
+    student = getattr(user, 'student', None)
+    faculty = getattr(user, 'faculty', None)
+    committee = getattr(user, 'committee_profile', None)
+    role = 'faculty' if faculty is not None else 'student' if student is not None else None
+    return RoleContext(
+        user.pk,
+        role=role,
+        student_id=student.pk if student else None,
+        faculty_id=faculty.pk if faculty else None,
+        department=faculty.department if faculty else None,
+        committee_approved=committee.approved_by_admin if committee else None,
+    )
+
+
+def _load_role(user_id):
+    # Permissions hang on it: always the primary, never the read replica (core/replicas.py)
+    user = (
+        User.objects.using(DEFAULT_DB_ALIAS).select_related('student', 'faculty', 'committee_profile')
+        .filter(pk=user_id)
+        .first()
+    )
+    if user is None:
+        return RoleContext(user_id, committee_approved=None)
+    return role_of(user)
+
+
+def cached_role(user_id):
+    """Return the cached RoleContext for a user id, or None if missing/expired."""
+    with _lock:
+        entry = _cache.get(user_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def resolve_user_role(user_id):
+    """Return the RoleContext for a user id, using the process-local TTL cache."""
+    role = cached_role(user_id)
+    if role is not None:
+        return role
+
+    now = time.monotonic()
+    role = _load_role(user_id)
+    ttl = getattr(settings, 'ROLE_CACHE_TTL', 300)
+    with _lock:
+        _cache[user_id] = (now + ttl, role)
+    return role
+
+
+def invalidate_role(user_id):
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def clear_role_cache():
+    with _lock:
+        _cache.clear()
+
+
+def get_role(request):
+    """Resolve the role of request.user once per request."""
+    django_request = getattr(request, '_request', request)
+    role = getattr(django_request, '_role_context', None)
+    if role is not None:
+        return role
+
+    user = request.user
+    if not user or not user.is_authenticated:
+        role = RoleContext(None, committee_approved=None)
+    else:
+        token = getattr(request, 'auth', None)
+        if trusts_claims(token):
+            role = RoleContext.from_claims(user.pk, token)
+        else:
+            role = resolve_user_role(user.pk)
+
+    django_request._role_context = role
+    return role
+
+
+async def aget_role(user, token=None):
+    """Async counterpart of get_role for the async views (core/async_views.py)."""
+    if trusts_claims(token):
+        return RoleContext.from_claims(user.pk, token)
+    # Cache hits are served on the event loop; only a miss needs a worker thread
+    return cached_role(user.pk) or await sync_to_async(resolve_user_role)(user.pk)
+
+
+async def aresolve_committee(role):
+    """Resolve committee approval without touching the DB from async code."""
+    if role._committee_approved is UNRESOLVED:
+        resolved = cached_role(role.user_id) or await sync_to_async(resolve_user_role)(role.user_id)
+        role._committee_approved = resolved.committee_approved
+    return role.committee_approved
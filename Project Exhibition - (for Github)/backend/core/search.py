@@ -0,0 +1,144 @@
+import html
+import re
+
+from django.core.exceptions import EmptyResultSet, FullResultSet
+from django.db import connection, connections
+from django.db.models.expressions import RawSQL
+
+
+# Full-text search over project titles and abstracts.
+#
+# SQLite: an FTS5 table core_project_fts (rowid = project id, porter stemming)
+#   holding a copy of title / abstract. It is kept in sync by the Project
+#   signals (core/signals.py) and by the bulk paths that bypass them
+#   (core/bulk.py, core/seed.py); `manage.py rebuild_search_index` rebuilds it.
+# PostgreSQL: a generated tsvector column core_project.search_vector (title
+#   weighted A, abstract B) with a GIN index, maintained by the database.
+# Both are created by migration 0009_project_search.
+#
+# Every word of the query must match, as a prefix ("robo vis" finds "Robotic
+# vision"). Results are ranked (BM25 / ts_rank_cd, title matches count more)
+# and carry HTML-escaped highlights with <mark>...</mark> around the hits.
+
+FTS_TABLE = 'core_project_fts'
+TITLE_WEIGHT = 10.0
+MAX_TERMS = 8
+SNIPPET_WORDS = 24
+# Control characters mark hits inside the database; the text is escaped
+# before they become <mark> tags, so titles can never inject HTML
+MARK_START, MARK_END = '\x02', '\x03'
+TERM_RE = re.compile(r'\w+')
+
+
+def supported():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def terms(text):
+    return TERM_RE.findall(text.lower())[:MAX_TERMS]
+
+
+def match_expression(words):
+    if connection.vendor == 'postgresql':
+        return ' & '.join(f'{word}:*' for word in words)
+    return ' AND '.join(f'"{word}"*' for word in words)
+
+
+def matching_ids(words):
+    """RawSQL of the ids of projects matching every word (for pk__in filters)."""
+    if connection.vendor == 'postgresql':
+        return RawSQL(
+            "SELECT id FROM core_project WHERE search_vector @@ to_tsquery('english', %s)",
+            [match_expression(words)],
+        )
+    return RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match_expression(words)])
+
+
+def mark(text):
+    return html.escape(text or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def _where(queryset):
+    """SQL of the queryset's WHERE clause (only core_project columns), or ('', [])."""
+    query = queryset.query
+    compiler = query.get_compiler(using=queryset.db)
+    try:
+        return compiler.compile(query.where)
+    except FullResultSet:
+        return '', []
+
+
+def search(queryset, words, limit, offset=0):
+    """Rank projects of `queryset` (plain column filters only) matching `words`.
+
+    Returns [(project id, score, title highlight, abstract snippet)], best
+    first; a higher score is a better match.
+    """
+    try:
+        where, where_params = _where(queryset)
+    except EmptyResultSet:
+        return []
+    where = f'AND {where}' if where else ''
+    query = match_expression(words)
+    # The queryset's database: the read replica when the request reads from it (core/replicas.py)
+    database = connections[queryset.db]
+
+    if database.vendor == 'postgresql':
+        title_options = f'StartSel={MARK_START}, StopSel={MARK_END}, HighlightAll=true'
+        abstract_options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=8'
+        sql = f"""
+            SELECT core_project.id, ts_rank_cd(core_project.search_vector, q) AS score,
+                   ts_headline('english', core_project.title, q, %s),
+                   ts_headline('english', core_project.abstract, q, %s)
+            FROM core_project, to_tsquery('english', %s) q
+            WHERE core_project.search_vector @@ q {where}
+            ORDER BY score DESC, core_project.id
+            LIMIT %s OFFSET %s
+        """
+        params = [title_options, abstract_options, query, *where_params, limit, offset]
+    else:
+        sql = f"""
+            SELECT core_project.id, -bm25({FTS_TABLE}, %s, 1.0) AS score,
+                   highlight({FTS_TABLE}, 0, %s, %s),
+                   snippet({FTS_TABLE}, 1, %s, %s, '…', %s)
+            FROM {FTS_TABLE} JOIN core_project ON core_project.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s {where}
+            ORDER BY score DESC, core_project.id
+            LIMIT %s OFFSET %s
+        """
+        params = [
+            TITLE_WEIGHT, MARK_START, MARK_END, MARK_START, MARK_END, SNIPPET_WORDS,
+            query, *where_params, limit, offset,
+        ]
+    with database.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(pk, score, mark(title), mark(abstract)) for pk, score, title, abstract in cursor.fetchall()]
+
+
+# ---- SQLite index maintenance (PostgreSQL maintains its generated column) ----
+
+def index_projects(projects):
+    """(Re)index the title / abstract of these Project instances."""
+    if connection.vendor != 'sqlite':
+        return
+    rows = [(project.pk, project.title, project.abstract) for project in projects]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk, _, _ in rows])
+        cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, title, abstract) VALUES (%s, %s, %s)", rows)
+
+
+def remove_projects(ids):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in ids])
+
+
+def rebuild():
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, title, abstract) SELECT id, title, abstract FROM core_project")
@@ -0,0 +1,161 @@
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .counters import rebuild_counters
+from .models import Application, Committee, Faculty, Project, ProjectReview, Student
+from .roles import clear_role_cache
+from .search import index_projects
+
+
+# Synthetic data at realistic volumes for benchmarks (manage.py seed_data,
+# manage.py bench_api). Everything is created with bulk_create, which sends
+# no signals, so denormalized fields (department copies, vote tallies, seat
+# counts) are filled in here, projects are added to the search index and the
+# counters are rebuilt at the end.
+#
+# The shape mirrors an application window before allocation: most projects
+# approved, the rest pending or rejected; every student holds up to three
+# applications to approved projects of any department; applications beyond
+# a project's seats were refused ("rejected"), so seats_available stays
+# consistent with the apply flow. A share of the faculty are approved
+# committee members, and decided projects carry one committee vote.
+
+DEPARTMENTS = ['CSE', 'ECE', 'EEE', 'ME', 'CE', 'IT', 'BT', 'CH', 'MME', 'PHY']
+COURSES = ['BTech', 'MTech', 'MSc', 'PhD']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+# Abstracts draw from a small vocabulary so full-text queries have realistic selectivity
+TOPICS = [
+    'machine learning', 'computer vision', 'robotics', 'embedded systems', 'signal processing',
+    'power electronics', 'renewable energy', 'structural analysis', 'fluid dynamics', 'thermal design',
+    'wireless networks', 'cryptography', 'databases', 'compilers', 'distributed systems',
+    'bioinformatics', 'drug delivery', 'catalysis', 'materials characterization', 'quantum optics',
+]
+BATCH_SIZE = 2000
+DEFAULT_PASSWORD = 'seed-password'
+
+
+def department_names(count):
+    return [DEPARTMENTS[i] if i < len(DEPARTMENTS) else f'D{i}' for i in range(count)]
+
+
+def seed(students=20000, faculty=2000, projects=5000, applications=60000, departments=10,
+         committee_share=0.2, prefix='seed_', password=DEFAULT_PASSWORD, random_seed=1, log=None):
+    """Create the dataset; returns {model name: rows created}. Usernames start with `prefix`."""
+    rng = random.Random(random_seed)
+    log = log or (lambda message: None)
+    # One hash shared by every user: seeding stays fast, logins cost what they do in production
+    hashed = make_password(password)
+    names = department_names(departments)
+    created = {}
+
+    with transaction.atomic():
+        log(f"{faculty} faculty")
+        faculty_users = User.objects.bulk_create([
+            User(username=f'{prefix}f{i:05d}', password=hashed, first_name='Faculty', last_name=str(i))
+            for i in range(faculty)
+        ], batch_size=BATCH_SIZE)
+        faculty_rows = Faculty.objects.bulk_create([
+            Faculty(user=user, department=names[i % len(names)]) for i, user in enumerate(faculty_users)
+        ], batch_size=BATCH_SIZE)
+        created['faculty'] = len(faculty_rows)
+
+        members = [f for f in faculty_rows if rng.random() < committee_share]
+        Committee.objects.bulk_create([
+            Committee(
+                user_id=member.user_id, degree='PhD', specialization='General',
+                years_of_experience=rng.randint(3, 30), approved_by_admin=rng.random() < 0.9,
+            )
+            for member in members
+        ], batch_size=BATCH_SIZE)
+        created['committee'] = len(members)
+        reviewers = {}
+        for member in members:
+            reviewers.setdefault(member.department, []).append(member)
+
+        log(f"{students} students")
+        student_users = User.objects.bulk_create([
+            User(username=f'{prefix}s{i:05d}', password=hashed, first_name='Student', last_name=str(i))
+            for i in range(students)
+        ], batch_size=BATCH_SIZE)
+        student_rows = Student.objects.bulk_create([
+            Student(user=user, roll_number=f'{prefix}{i:05d}', course=rng.choice(COURSES))
+            for i, user in enumerate(student_users)
+        ], batch_size=BATCH_SIZE)
+        created['students'] = len(student_rows)
+
+        log(f"{projects} projects")
+        project_rows = []
+        for i in range(projects):
+            owner = rng.choice(faculty_rows)
+            status = rng.choices(['approved', 'pending', 'rejected'], weights=[70, 20, 10])[0]
+            seats = rng.randint(5, 20)
+            project_rows.append(Project(
+                faculty=owner, department=owner.department,
+                title=f'Project {i}: {rng.choice(["Analysis", "Design", "Study", "System"])} of {owner.department}',
+                abstract=' '.join(
+                    f'Synthetic project {i} on {topic} for benchmarking.' for topic in rng.sample(TOPICS, 3)
+                ) * 2,
+                timeline=f'{rng.randint(2, 12)} months', difficulty=rng.choice(DIFFICULTIES),
+                status=status, is_approved=status == 'approved', is_discarded=status == 'rejected',
+                seats=seats, seats_available=seats,
+            ))
+        project_rows = Project.objects.bulk_create(project_rows, batch_size=BATCH_SIZE)
+        index_projects(project_rows)
+        created['projects'] = len(project_rows)
+
+        # One committee vote on each decided project, from another member of its department
+        reviews, voted = [], []
+        for project in project_rows:
+            candidates = [m for m in reviewers.get(project.department, ()) if m.pk != project.faculty_id]
+            if project.status == 'pending' or not candidates:
+                continue
+            decision = 'approve' if project.status == 'approved' else 'disapprove'
+            reviews.append(ProjectReview(project=project, reviewer=rng.choice(candidates), decision=decision))
+            if decision == 'approve':
+                project.approve_votes = 1
+            else:
+                project.disapprove_votes = 1
+            voted.append(project)
+        ProjectReview.objects.bulk_create(reviews, batch_size=BATCH_SIZE)
+        Project.objects.bulk_update(voted, ['approve_votes', 'disapprove_votes'], batch_size=BATCH_SIZE)
+        created['reviews'] = len(reviews)
+
+        log(f"{applications} applications")
+        open_projects = [p for p in project_rows if p.status == 'approved']
+        per_student = min(3, len(open_projects))
+        application_rows = []
+        if open_projects and per_student:
+            for i in range(min(applications, len(student_rows) * per_student)):
+                student = student_rows[i // per_student]
+                if i % per_student == 0:
+                    choices = rng.sample(open_projects, per_student)
+                project = choices[i % per_student]
+                if project.seats_available:
+                    project.seats_available -= 1
+                    status = 'shortlisted' if rng.random() < 0.15 else 'pending'
+                else:
+                    status = 'rejected'
+                application_rows.append(Application(
+                    student=student, project=project, priority=i % per_student + 1,
+                    cgpa=round(rng.uniform(5.0, 10.0), 2), status=status,
+                ))
+        Application.objects.bulk_create(application_rows, batch_size=BATCH_SIZE)
+        Project.objects.bulk_update(open_projects, ['seats_available'], batch_size=BATCH_SIZE)
+        created['applications'] = len(application_rows)
+
+        log("counters")
+        rebuild_counters()
+    clear_role_cache()
+    return created
+
+
+def clear(prefix='seed_'):
+    """Delete every seeded user (profiles, projects and applications cascade)."""
+    with transaction.atomic():
+        deleted, _ = User.objects.filter(username__startswith=prefix).delete()
+        rebuild_counters()
+    clear_role_cache()
+    return deleted
@@ -0,0 +1,48 @@
+from collections import Counter, defaultdict
+
+from django.db.models import F
+
+from . import events
+from .counters import record_application_changes
+from .models import Application, Project, Student
+
+
+# Follow-up of a faculty selecting a student (ApplicationViewSet.select):
+# the student's other applications are rejected and their seats released.
+# The request only commits the selection and queues this (core/jobs.py);
+# until it runs the other applications stay as they were, and the student
+# cannot be selected twice since select checks for an existing selection.
+
+def reject_other_applications(payloads):
+    """Job handler: payloads are {"student": id, "selected": application id}."""
+    selected = {payload['student']: payload['selected'] for payload in payloads}
+    # Serialise with applies / selections of these students, as the views do
+    list(Student.objects.select_for_update().filter(pk__in=selected).values_list('pk', flat=True))
+    # A selection undone in the meantime (rejected, withdrawn) rejects nothing
+    still_selected = dict(
+        Application.objects.filter(pk__in=selected.values(), status='selected').values_list('student_id', 'pk')
+    )
+    if not still_selected:
+        return
+
+    others = Application.objects.filter(student_id__in=still_selected).exclude(
+        pk__in=still_selected.values()
+    ).exclude(status='rejected')
+    released = list(others.values_list('id', 'student_id', 'project_id', 'status'))
+    if not released:
+        return
+    Application.objects.filter(pk__in=[app_id for app_id, _, _, _ in released]).update(status='rejected')
+
+    # One UPDATE per distinct number of seats given back
+    seats = Counter(project_id for _, _, project_id, _ in released)
+    by_count = defaultdict(list)
+    for project_id, n in seats.items():
+        by_count[n].append(project_id)
+    for n, project_ids in by_count.items():
+        Project.objects.filter(pk__in=project_ids).update(seats_available=F('seats_available') + n)
+
+    record_application_changes((project_id, status, 'rejected') for _, _, project_id, status in released)
+    events.publish_many(
+        events.application_status(app_id, student_id, project_id, 'rejected')
+        for app_id, student_id, project_id, _ in released
+    )
@@ -1,5 +1,37 @@
+from django.contrib.auth.models import User, update_last_login
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from rest_framework import serializers
-from .models import Faculty, Student, Project, Application, Committee
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .models import Faculty, Student, Project, Application, Committee, DashboardCounter
+from .reviews import DECISIONS
+from .tokens import RoleRefreshToken, stamp
+
+
+def display_name(user):
+    return f"{user.first_name} {user.last_name}".strip() or user.username
+
+
+def requested_fields(request):
+    """Field names of a ?fields=id,title,... sparse fieldset, or None for every field."""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    value = getattr(request, 'query_params', request.GET).get('fields', '')
+    names = {name.strip() for name in value.split(',')} - {''}
+    return names or None
+
+
+# Serializers that honour ?fields= on reads (the request comes from the
+# serializer context): unnamed fields are dropped, unknown names ignored
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'))
+        if wanted is not None:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
 
 class FacultySerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,7 +43,7 @@ class StudentSerializer(serializers.ModelSerializer):
         model = Student
         fields = '__all__'
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = "__all__"
@@ -19,14 +51,106 @@ class ProjectSerializer(serializers.ModelSerializer):
             "faculty",       # ✅ set automatically, not from user
             "created_at",    # ✅ timestamp should be backend only
             "committee",     # ✅ decided by reviewers
+            "status",        # ✅ set by the review quorum (core/reviews.py)
+            "is_approved",
             "is_discarded",  # ✅ backend only
-            "seats_available"  # ✅ system-managed
+            "seats_available",  # ✅ system-managed
+            "applications_count",  # ✅ maintained by core/counters.py
+            "selected_count",
+            "department",    # ✅ copied from the faculty
+            "approve_votes",     # ✅ maintained by core/reviews.py
+            "disapprove_votes",
+        ]
+
+# Compact read-only shape for list endpoints; expects faculty__user to be select_related
+class ProjectSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    faculty_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project
+        fields = [
+            "id", "title", "abstract", "timeline", "difficulty", "status",
+            "seats", "seats_available", "is_approved", "created_at",
+            "faculty", "faculty_name", "department", "applications_count", "selected_count",
+        ]
+        read_only_fields = fields
+
+    def get_faculty_name(self, obj):
+        return display_name(obj.faculty.user)
+
+def with_faculty_name(queryset):
+    """Annotate faculty_name (same rule as display_name) in SQL instead of joining whole rows."""
+    full_name = Trim(Concat('faculty__user__first_name', Value(' '), 'faculty__user__last_name'))
+    return queryset.annotate(
+        faculty_name=Coalesce(NullIf(full_name, Value('')), 'faculty__user__username')
+    )
+
+# Committee review queue rows; expects the queryset to go through with_faculty_name
+class ReviewQueueSerializer(serializers.ModelSerializer):
+    faculty_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Project
+        fields = [
+            "id", "title", "abstract", "timeline", "difficulty", "status",
+            "seats", "created_at", "faculty", "faculty_name", "department",
+            "approve_votes", "disapprove_votes",
         ]
+        read_only_fields = fields
+
+# One entry of a committee member's bulk review (POST /api/projects/review/)
+class ReviewDecisionSerializer(serializers.Serializer):
+    project = serializers.IntegerField()
+    decision = serializers.ChoiceField(choices=DECISIONS)
+    comment = serializers.CharField(required=False, allow_blank=True, default="")
 
-class ApplicationSerializer(serializers.ModelSerializer):
+# Vote tallies returned after reviewing
+class ProjectTallySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        fields = ["id", "title", "status", "approve_votes", "disapprove_votes"]
+        read_only_fields = fields
+
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = '__all__'
+        read_only_fields = [
+            "student",     # ✅ the logged-in student, set in perform_create
+            "status",      # ✅ changed only through select/reject
+            "applied_at",
+        ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # The project is chosen when applying; moving an application would skip the seat accounting
+        if self.instance is not None:
+            fields["project"].read_only = True
+        return fields
+
+# Application with the project title/faculty and student name embedded, so
+# list pages need no follow-up fetches; expects project__faculty__user and
+# student__user to be select_related
+class ApplicationListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    project_title = serializers.CharField(source="project.title", read_only=True)
+    faculty_name = serializers.SerializerMethodField()
+    student_name = serializers.SerializerMethodField()
+    roll_number = serializers.CharField(source="student.roll_number", read_only=True)
+
+    class Meta:
+        model = Application
+        fields = [
+            "id", "student", "student_name", "roll_number",
+            "project", "project_title", "faculty_name",
+            "priority", "cgpa", "skills", "status", "applied_at",
+        ]
+        read_only_fields = fields
+
+    def get_faculty_name(self, obj):
+        return display_name(obj.project.faculty.user)
+
+    def get_student_name(self, obj):
+        return display_name(obj.student.user)
 
 class CommitteeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -34,3 +158,82 @@ class CommitteeSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ["approved_by_admin", "user"]
 
+class DashboardCounterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DashboardCounter
+        exclude = ["id"]
+
+# Current user with role and all profiles; expects student, faculty and
+# committee_profile to be select_related (see load_me)
+class MeSerializer(serializers.ModelSerializer):
+    role = serializers.SerializerMethodField()
+    name = serializers.SerializerMethodField()
+    student = serializers.SerializerMethodField()
+    faculty = serializers.SerializerMethodField()
+    committee = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "name", "first_name", "last_name", "email",
+                  "role", "student", "faculty", "committee"]
+
+    def get_role(self, user):
+        if getattr(user, "faculty", None) is not None:
+            return "faculty"
+        if getattr(user, "student", None) is not None:
+            return "student"
+        return None
+
+    def get_name(self, user):
+        return display_name(user)
+
+    def get_student(self, user):
+        student = getattr(user, "student", None)
+        return StudentSerializer(student).data if student is not None else None
+
+    def get_faculty(self, user):
+        faculty = getattr(user, "faculty", None)
+        return FacultySerializer(faculty).data if faculty is not None else None
+
+    def get_committee(self, user):
+        committee = getattr(user, "committee_profile", None)
+        if committee is None:
+            return None
+        return {"id": committee.id, "approved_by_admin": committee.approved_by_admin}
+
+
+def load_me(user_id):
+    """Fetch a user together with every profile in a single query."""
+    return User.objects.select_related("student", "faculty", "committee_profile").get(pk=user_id)
+
+
+# Login serializer that embeds the user's role claims in the issued tokens so
+# permission checks can authorize without a profile lookup, and returns the
+# /api/me/ payload alongside the tokens so login is a single round-trip
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Role, profile, committee and staff claims plus the token generation (core/tokens.py)
+        return stamp(super().get_token(user), user.pk)
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        data["me"] = MeSerializer(load_me(self.user.pk)).data
+        return data
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    # New access tokens get the current claims, not the ones copied into the refresh token
+    token_class = RoleRefreshToken
+
+
+def login_payload(user):
+    """Tokens plus the /api/me/ payload for an authenticated user (async login view)."""
+    refresh = RoleTokenObtainPairSerializer.get_token(user)
+    if jwt_settings.UPDATE_LAST_LOGIN:
+        update_last_login(None, user)
+    return {
+        "refresh": str(refresh),
+        "access": str(refresh.access_token),
+        "me": MeSerializer(load_me(user.pk)).data,
+    }
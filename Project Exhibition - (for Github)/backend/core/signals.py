@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import events, search, tokens
+from .counters import record_department_move
+from .models import Application, Committee, Faculty, Project, Student
+from .response_cache import bump_version
+from .roles import invalidate_role
+
+
+# Any change to a user's profiles changes their role, so drop the cached entry
+# and the claims of their access tokens (core/tokens.py)
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Faculty)
+@receiver([post_save, post_delete], sender=Committee)
+def invalidate_cached_role(sender, instance, **kwargs):
+    invalidate_role(instance.user_id)
+    tokens.bump_generation(instance.user_id)
+
+
+# Token claims also hold the account: username, staff flags, and a deactivated
+# or deleted user must not keep reading with token users. Logins only save last_login.
+TOKEN_USER_FIELDS = {'username', 'password', 'is_active', 'is_staff', 'is_superuser'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    if not created and (update_fields is None or TOKEN_USER_FIELDS & set(update_fields)):
+        tokens.bump_generation(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    tokens.bump_generation(instance.pk)
+
+
+# Catalogue pages / project detail embed projects, their seats and faculty
+# names: any write to those invalidates the response cache (core/response_cache.py).
+# Set-based update()s send no signal and bump it themselves (core/counters.py).
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Application)
+@receiver([post_save, post_delete], sender=Faculty)
+@receiver(m2m_changed, sender=Project.committee.through)
+def invalidate_response_cache(sender, **kwargs):
+    bump_version()
+
+
+# Project.department mirrors faculty.department (review queue / catalogue filter index)
+@receiver(pre_save, sender=Project)
+def fill_project_department(sender, instance, **kwargs):
+    if not instance.department and instance.faculty_id:
+        instance.department = Faculty.objects.values_list('department', flat=True).get(pk=instance.faculty_id)
+
+
+# and the department dashboard counters follow the projects
+@receiver(post_save, sender=Faculty)
+def sync_project_department(sender, instance, **kwargs):
+    moved = Project.objects.filter(faculty=instance).exclude(department=instance.department)
+    record_department_move(moved, instance.department)
+    moved.update(department=instance.department)
+
+
+# Full-text index (SQLite FTS5, see core/search.py); bulk paths index themselves
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'title', 'abstract'} & set(update_fields):
+        search.index_projects([instance])
+
+
+@receiver(post_delete, sender=Project)
+def unindex_project(sender, instance, **kwargs):
+    search.remove_projects([instance.pk])
+
+
+# Live updates for /api/events/ (core/events.py), sent on commit.
+# Set-based status updates (selection, allocation, reviews) publish themselves.
+@receiver(post_save, sender=Application)
+def publish_application(sender, instance, created, update_fields=None, **kwargs):
+    if not (created or update_fields is None or 'status' in update_fields):
+        return
+    messages = [events.application_status(instance.pk, instance.student_id, instance.project_id, instance.status)]
+    if created:
+        # The apply path already holds the project, so this is no extra query
+        messages.append(events.application_created(instance.pk, instance.project.faculty_id, instance.project_id))
+    events.publish_many(messages)
+
+
+@receiver(post_save, sender=Project)
+def publish_new_project(sender, instance, created, **kwargs):
+    if created and instance.status == 'pending':
+        events.publish_many(events.project_messages(instance, created=True))
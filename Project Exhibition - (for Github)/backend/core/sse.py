@@ -0,0 +1,219 @@
+import asyncio
+import json
+import secrets
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.http import JsonResponse
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import events, tokens
+from .compression import uncompressed
+from .roles import RoleContext, resolve_user_role, trusts_claims
+
+
+# GET /api/events/: server-sent events for the logged-in user (core/events.py).
+#
+# Served by EventStreamApp, a bare ASGI app in front of Django
+# (exhibition_backend/asgi.py), not by a Django view: Django's ASGI handler
+# gives every request its own worker thread (and database connection) for as
+# long as the response lasts, i.e. one idle thread per open stream. Here the
+# user is resolved on the shared executor, the connection released, and an
+# open stream is two small tasks on the event loop.
+#
+# Authenticated by a Bearer access token or, since browsers' EventSource
+# cannot send headers, by ?ticket=: a random single-use ticket from
+# POST /api/events/ticket/, valid EVENTS_TICKET_SECONDS, so access tokens stay
+# out of URLs and access logs. The ticket stands for the access token it was
+# issued with; every heartbeat re-checks that token (expiry, generation,
+# active user, channels) and ends the stream once it no longer holds. The
+# stream starts with a `retry:` hint; clients refetch what they display on
+# (re)connect, events only say what changed. Under WSGI the route answers 501
+# (see unavailable below).
+
+NOT_AUTHENTICATED = {"detail": "Authentication credentials were not provided."}
+PERMISSION_DENIED = {"detail": "You do not have permission to perform this action."}
+
+
+def _ticket_key(ticket):
+    return f'sse:ticket:{ticket}'
+
+
+@api_view(["POST"])
+# A ticket stands for the caller's access token: session logins have none to hand over
+@authentication_classes([tokens.TokenUserAuthentication])
+@permission_classes([IsAuthenticated])
+@uncompressed
+def ticket(request):
+    """A single-use ticket opening one event stream as the caller (GET /api/events/?ticket=)."""
+    value = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(value), str(request.auth), settings.EVENTS_TICKET_SECONDS)
+    return Response({"ticket": value, "expires_in": settings.EVENTS_TICKET_SECONDS})
+
+
+def redeem(ticket):
+    """The access token a ticket was issued with, or None; a ticket is spent by its first use."""
+    key = _ticket_key(ticket)
+    raw_token = cache.get(key)
+    # Only the connection whose delete removed the entry gets it
+    if raw_token is None or not cache.delete(key):
+        return None
+    return raw_token
+
+
+def channels_of(token):
+    """(channels, faculty id) of the user behind a validated access token, or None."""
+    if tokens.is_current(token):
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    else:
+        user_id = User.objects.filter(
+            pk=token.get(jwt_settings.USER_ID_CLAIM), is_active=True
+        ).values_list("pk", flat=True).first()
+    if user_id is None:
+        return None
+    role = RoleContext.from_claims(user_id, token) if trusts_claims(token) else resolve_user_role(user_id)
+    channels = []
+    if role.is_student:
+        channels.append(events.student_channel(role.student_id))
+    if role.is_faculty:
+        channels.append(events.faculty_channel(role.faculty_id))
+        if role.is_committee:
+            channels.append(events.committee_channel(role.department))
+    return channels, role.faculty_id
+
+
+def subscriber(raw_token=None, ticket=None):
+    """(token, channels, faculty id) of the user behind an access token or a stream ticket, or None."""
+    try:
+        if raw_token is None:
+            raw_token = redeem(ticket)
+            if raw_token is None:
+                return None
+        token = AccessToken(raw_token)
+        found = channels_of(token)
+        return None if found is None else (token, *found)
+    except TokenError:
+        return None
+    finally:
+        close_old_connections()
+
+
+def still_subscribed(token, channels):
+    """Heartbeat check: the stream's token has not expired and still grants `channels`."""
+    try:
+        token.check_exp()
+        if token.get("gen") is not None:
+            # A role, committee or account change bumped the generation since the last check
+            token.current = None   # is_current remembers its answer on the token
+            if not tokens.is_current(token):
+                return False
+        found = channels_of(token)
+        return found is not None and found[0] == channels
+    except TokenError:
+        return False
+    finally:
+        close_old_connections()
+
+
+def cors_headers(origin):
+    allowed = getattr(settings, "CORS_ALLOW_ALL_ORIGINS", False) or origin in getattr(settings, "CORS_ALLOWED_ORIGINS", ())
+    if origin and allowed:
+        return [(b"access-control-allow-origin", origin.encode("latin-1")), (b"vary", b"origin")]
+    return []
+
+
+async def respond(send, status, data, headers=()):
+    body = json.dumps(data).encode()
+    await send({
+        "type": "http.response.start", "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def serve(scope, receive, send):
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+    cors = cors_headers(headers.get("origin"))
+    if scope["method"] == "OPTIONS":
+        # Preflight of a fetch() with an Authorization header
+        return await respond(send, 200, {}, [
+            *cors, (b"access-control-allow-methods", b"GET"), (b"access-control-allow-headers", b"authorization"),
+        ])
+    if scope["method"] != "GET":
+        return await respond(send, 405, {"detail": f'Method "{scope["method"]}" not allowed.'}, cors)
+
+    parts = headers.get("authorization", "").split()
+    if len(parts) == 2 and parts[0] in jwt_settings.AUTH_HEADER_TYPES:
+        credentials = {"raw_token": parts[1]}
+    else:
+        credentials = {"ticket": parse_qs(scope.get("query_string", b"").decode("latin-1")).get("ticket", [""])[0]}
+    # thread_sensitive=False: the shared executor, no thread tied to this stream
+    found = await sync_to_async(subscriber, thread_sensitive=False)(**credentials)
+    if found is None:
+        return await respond(send, 401, NOT_AUTHENTICATED, cors)
+    token, channels, faculty_id = found
+    if not channels:
+        return await respond(send, 403, PERMISSION_DENIED, cors)
+    if events.broker.count >= settings.EVENTS_MAX_CONNECTIONS:
+        retry_after = str(events.STREAM_RETRY_MS // 1000).encode()
+        return await respond(send, 503, {"error": "Too many open event streams, retry later."},
+                             [*cors, (b"retry-after", retry_after)])
+
+    await send({
+        "type": "http.response.start", "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),   # nginx: pass events through unbuffered
+            *cors,
+        ],
+    })
+    check = sync_to_async(still_subscribed, thread_sensitive=False)
+    frames = events.stream(channels, faculty_id, check=lambda: check(token, channels))
+
+    async def pump():
+        async for frame in frames:
+            await send({"type": "http.response.body", "body": frame, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    sender = asyncio.ensure_future(pump())
+    listener = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await asyncio.wait({sender, listener}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Cancelling the sender unsubscribes the stream (events.stream's finally)
+        for task in (sender, listener):
+            task.cancel()
+        await asyncio.gather(sender, listener, return_exceptions=True)
+        await frames.aclose()
+
+
+class EventStreamApp:
+    """ASGI app serving `path` itself and everything else through `app` (Django)."""
+
+    def __init__(self, app, path="/api/events/"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == self.path:
+            return await serve(scope, receive, send)
+        return await self.app(scope, receive, send)
+
+
+def unavailable(request):
+    """The /api/events/ route as Django sees it: only reached without EventStreamApp (e.g. WSGI)."""
+    return JsonResponse({"error": "The event stream is only served by the ASGI server."}, status=501)
@@ -1,3 +1,1775 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import tempfile
+import threading
+import time
+import zlib
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Faculty, Student, Project, Application, Committee, DashboardCounter, Job, ProjectReview
+from .allocation import run_allocation
+from .benchmarks import compare, run_suite, uncovered_routes
+from .bulk import import_rows
+from . import events, jobs, passwords, replicas, response_cache, sse, throttling, tokens
+from . import counters
+from .counters import rebuild_counters
+from .metrics import registry
+from .roles import clear_role_cache, resolve_user_role
+from .seed import seed
+from .serializers import RoleTokenObtainPairSerializer
+
+
+def make_faculty(username, department="CSE", committee=False, password=None):
+    user = User.objects.create_user(username=username, password=password, first_name=username.title())
+    faculty = Faculty.objects.create(user=user, department=department)
+    if committee:
+        Committee.objects.create(
+            user=user, degree="PhD", specialization="Systems",
+            years_of_experience=5, approved_by_admin=True,
+        )
+    return faculty
+
+
+def make_student(username, password=None):
+    user = User.objects.create_user(username=username, password=password)
+    return Student.objects.create(user=user, roll_number=f"R-{username}", course="BTech")
+
+
+def bearer(profile):
+    # Plain access token (no role claims): works for the DRF and the async views alike
+    return f"Bearer {AccessToken.for_user(User.objects.get(pk=profile.user_id))}"
+
+
+# Every list endpoint must run a constant number of queries regardless of how
+# many rows it returns. The fixture has enough rows that an N+1 would show up.
+class ListEndpointQueryCountTests(TestCase):
+    ROWS = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reviewer = make_faculty("reviewer", committee=True)
+        cls.owner = make_faculty("owner")
+        cls.student = make_student("student")
+        for i in range(cls.ROWS):
+            approved = i % 2 == 0
+            project = Project.objects.create(
+                faculty=cls.owner, title=f"Project {i}", abstract="Abstract",
+                status="approved" if approved else "pending", is_approved=approved,
+                seats=2, seats_available=2,
+            )
+            project.committee.add(cls.reviewer)
+            Application.objects.create(student=cls.student, project=project)
+            Application.objects.create(student=make_student(f"other{i}"), project=project)
+        cls.project = project
+
+    def setUp(self):
+        self.client = APIClient()
+        # Counts below include the JWT user row and the single cold-cache role lookup
+        clear_role_cache()
+        cache.clear()
+
+    def login(self, profile):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(profile))
+
+    def assertQueries(self, profile, url, num):
+        self.login(profile)
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_project_catalogue_student(self):
+        # One more than faculty: the student's eligibility flags
+        response = self.assertQueries(self.student, "/api/projects/", 4)
+        self.assertEqual(len(response.json()["results"]), self.ROWS // 2)
+        self.assertIn("faculty_name", response.json()["results"][0])
+
+    def test_project_catalogue_faculty(self):
+        response = self.assertQueries(self.owner, "/api/projects/", 3)
+        self.assertEqual(len(response.json()["results"]), self.ROWS)
+
+    def test_project_detail(self):
+        self.assertQueries(self.owner, f"/api/projects/{self.project.pk}/", 4)
+
+    def test_my_projects(self):
+        response = self.assertQueries(self.owner, "/api/projects/my/", 3)
+        self.assertEqual(len(response.json()), self.ROWS)
+
+    def test_pending_review(self):
+        response = self.assertQueries(self.reviewer, "/api/projects/pending_review/", 3)
+        self.assertEqual(len(response.json()["results"]), self.ROWS // 2)
+        self.assertEqual(response.json()["results"][0]["faculty_name"], "Owner")
+
+    def test_application_list(self):
+        response = self.assertQueries(self.student, "/api/applications/", 2)
+        self.assertEqual(len(response.json()), self.ROWS * 2)
+
+    def test_my_applications(self):
+        response = self.assertQueries(self.student, "/api/applications/my/", 3)
+        self.assertEqual(len(response.json()), self.ROWS)
+        self.assertEqual(response.json()[0]["faculty_name"], "Owner")
+        self.assertTrue(response.json()[0]["project_title"].startswith("Project"))
+
+    def test_faculty_applications(self):
+        response = self.assertQueries(self.owner, "/api/applications/faculty_applications/", 3)
+        self.assertEqual(len(response.json()), self.ROWS * 2)
+
+    def test_faculty_list(self):
+        self.assertQueries(self.owner, "/api/faculty/", 3)
+
+    def test_student_list(self):
+        self.assertQueries(self.student, "/api/students/", 3)
+
+    def test_committee_list(self):
+        self.assertQueries(self.reviewer, "/api/committees/", 3)
+
+
+class CatalogueTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        cse, ece = make_faculty("cse", department="CSE"), make_faculty("ece", department="ECE")
+        self.projects = Project.objects.bulk_create([
+            Project(faculty=cse if i % 2 else ece, department="CSE" if i % 2 else "ECE", title=f"P{i}",
+                    abstract="A", status="approved", is_approved=True, difficulty="hard" if i % 3 == 0 else "easy",
+                    seats=2, seats_available=0 if i % 4 == 0 else 2)
+            for i in range(23)
+        ])
+        # Ties on created_at: the id breaks them
+        moment = Project.objects.order_by("created_at").first().created_at
+        Project.objects.filter(pk__in=[p.pk for p in self.projects[5:15]]).update(created_at=moment)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(make_student("stud")))
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            page = self.client.get(url).json()
+            ids += [item["id"] for item in page["results"]]
+            url, pages = page["next"], pages + 1
+            if pages == 2:
+                # A project created mid-walk is newer than the cursor: no shift, no repeats
+                cache.clear()
+                Project.objects.create(faculty=Faculty.objects.first(), title="New", abstract="A",
+                                       status="approved", is_approved=True)
+        return ids, pages
+
+    def test_cursor_order_is_stable(self):
+        ids, pages = self.walk("/api/projects/?page_size=5")
+        expected = list(Project.objects.exclude(title="New").order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 5)
+        self.assertEqual(self.client.get("/api/projects/?cursor=garbage").status_code, 404)
+
+    def test_filters(self):
+        def titles(query):
+            return {item["title"] for item in self.client.get(f"/api/projects/?page_size=100&{query}").json()["results"]}
+
+        self.assertEqual(titles("department=CSE"), {f"P{i}" for i in range(23) if i % 2})
+        self.assertEqual(titles("difficulty=hard"), {f"P{i}" for i in range(23) if i % 3 == 0})
+        self.assertEqual(titles("has_seats=true"), {f"P{i}" for i in range(23) if i % 4})
+        self.assertEqual(
+            titles("department=ECE&difficulty=hard&has_seats=1"),
+            {f"P{i}" for i in range(23) if i % 2 == 0 and i % 3 == 0 and i % 4},
+        )
+
+
+class RoleResolutionTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.faculty = make_faculty("prof")
+        self.student = make_student("stud")
+
+    def test_cached_after_first_lookup(self):
+        with self.assertNumQueries(1):
+            role = resolve_user_role(self.faculty.user_id)
+        with self.assertNumQueries(0):
+            self.assertIs(resolve_user_role(self.faculty.user_id), role)
+        self.assertTrue(role.is_faculty)
+        self.assertEqual(role.department, "CSE")
+        self.assertIsNone(role.committee_approved)
+
+    def test_profile_save_invalidates_cache(self):
+        self.assertFalse(resolve_user_role(self.faculty.user_id).is_committee)
+        Committee.objects.create(
+            user=self.faculty.user, degree="PhD", specialization="AI",
+            years_of_experience=2, approved_by_admin=True,
+        )
+        self.assertTrue(resolve_user_role(self.faculty.user_id).is_committee)
+
+    def test_token_claims_skip_profile_lookup(self):
+        refresh = RoleTokenObtainPairSerializer.get_token(self.student.user)
+        access = AccessToken(str(refresh.access_token))
+        self.assertEqual(access["role"], "student")
+        self.assertEqual(access["student_id"], self.student.pk)
+
+        clear_role_cache()
+        cache.clear()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        # Only the user's token generation (then cached) and the applications themselves
+        with self.assertNumQueries(2):
+            response = client.get("/api/applications/my/")
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            client.get("/api/applications/my/")
+
+
+class TokenUserTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.faculty = make_faculty("prof", password="pw-12345")
+        self.committee = Committee.objects.create(
+            user=self.faculty.user, degree="PhD", specialization="AI", years_of_experience=2,
+        )
+        self.student = make_student("stud", password="pw-12345")
+        self.project = Project.objects.create(
+            faculty=self.faculty, title="P", abstract="A", seats=2, status="approved", is_approved=True,
+        )
+
+    def login(self, username):
+        tokens = APIClient().post(
+            "/api/auth/login/", {"username": username, "password": "pw-12345"}, format="json"
+        ).json()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return client, tokens
+
+    def test_reads_skip_user_row(self):
+        client, _ = self.login("stud")
+        client.get("/api/applications/my/")
+        # No User row, no role lookup: the applications (and the catalogue's eligibility flags) only
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get("/api/applications/my/").status_code, 200)
+        client.get("/api/projects/")
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get("/api/projects/").status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get("/api/me/").json()["username"], "stud")
+
+        with override_settings(JWT_TOKEN_USER=False), self.assertNumQueries(2):
+            client.get("/api/applications/my/")
+
+        # Writes load the User row
+        response = client.post("/api/applications/", {"project": self.project.pk}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Application.objects.get().student, self.student)
+
+    def test_stale_claims_fall_back_to_database(self):
+        client, tokens = self.login("prof")
+        self.assertFalse(AccessToken(tokens["access"])["committee_approved"])
+        self.assertEqual(client.get("/api/projects/pending_review/").status_code, 403)
+
+        # Approval bumps the token generation: the same token now resolves the role from the database
+        self.committee.approved_by_admin = True
+        with self.captureOnCommitCallbacks(execute=True):
+            self.committee.save()
+        self.assertEqual(client.get("/api/projects/pending_review/").status_code, 200)
+
+        # A refresh stamps the current claims
+        refreshed = APIClient().post("/api/auth/refresh/", {"refresh": tokens["refresh"]}, format="json").json()
+        access = AccessToken(refreshed["access"])
+        self.assertTrue(access["committee_approved"])
+        self.assertEqual(access["gen"], AccessToken(tokens["access"])["gen"] + 1)
+
+    def test_deactivated_user_is_refused(self):
+        client, _ = self.login("stud")
+        self.assertEqual(client.get("/api/applications/my/").status_code, 200)
+        self.student.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.user.save()
+        self.assertEqual(client.get("/api/applications/my/").status_code, 401)
+        self.assertEqual(client.get(f"/api/projects/{self.project.pk}/").status_code, 401)
+
+
+class AsyncReadEndpointTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.faculty = make_faculty("prof")
+        self.student = make_student("stud")
+        self.client = APIClient()
+
+    def test_requires_valid_token(self):
+        self.assertEqual(self.client.get("/api/projects/").status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        self.assertEqual(self.client.get("/api/applications/my/").status_code, 401)
+
+    def test_role_checks(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        self.assertEqual(self.client.get("/api/projects/pending_review/").status_code, 403)
+        self.assertEqual(self.client.get("/api/dashboard/").status_code, 403)
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.faculty))
+        self.assertEqual(self.client.get("/api/applications/my/").status_code, 403)
+        # Faculty without a committee profile keep the original error message
+        response = self.client.get("/api/projects/pending_review/")
+        self.assertEqual(response.json()["error"], "Only committee members can review projects.")
+
+    def test_post_still_creates_through_drf(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.faculty))
+        response = self.client.post("/api/projects/", {"title": "T", "abstract": "A", "seats": 2}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        results = self.client.get("/api/projects/?page_size=1").json()["results"]
+        self.assertEqual(results[0]["id"], response.data["id"])
+        self.assertEqual(self.client.put("/api/projects/").status_code, 405)
+
+    def test_head_and_options(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        get = self.client.get("/api/applications/my/")
+        head = self.client.head("/api/applications/my/")
+        self.assertEqual((head.status_code, head.content, head["Content-Type"]), (200, b"", get["Content-Type"]))
+        self.assertEqual(self.client.head("/api/projects/").status_code, 200)
+        options = self.client.options("/api/applications/my/")
+        self.assertEqual((options.status_code, options["Allow"]), (200, "GET, HEAD, OPTIONS"))
+        self.assertEqual(options.json()["name"], "My applications")
+        response = self.client.delete("/api/applications/my/")
+        self.assertEqual((response.status_code, response["Allow"]), (405, "GET, HEAD, OPTIONS"))
+        self.assertEqual(self.client.get("/api/projects/?cursor=garbage").status_code, 404)
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.owner = make_faculty("owner")
+        self.reviewer = make_faculty("reviewer", committee=True)
+        self.student = make_student("stud")
+        self.project = Project.objects.create(
+            faculty=self.owner, title="Live", abstract="A",
+            status="approved", is_approved=True, seats=2, seats_available=2,
+        )
+        self.client = APIClient()
+
+    def published(self, action):
+        with mock.patch.object(events.broker, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+        return [(channel, event["type"]) for (channel, event), _ in publish.call_args_list]
+
+    def test_writes_publish_on_commit(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        post = lambda: self.client.post("/api/applications/", {"project": self.project.pk}, format="json")
+        self.assertEqual(self.published(post), [
+            (f"student:{self.student.pk}", "application.status"),
+            (f"faculty:{self.owner.pk}", "application.created"),
+        ])
+        application = Application.objects.get()
+
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.owner))
+        select = lambda: self.client.post(f"/api/applications/{application.pk}/select/")
+        self.assertEqual(self.published(select), [(f"student:{self.student.pk}", "application.status")])
+
+        # New submissions reach the department's reviewers
+        create = lambda: self.client.post("/api/projects/", {"title": "T", "abstract": "A", "seats": 1}, format="json")
+        self.assertEqual(self.published(create), [("committee:CSE", "project.pending")])
+
+        # Nothing leaves a rolled-back transaction
+        def rolled_back():
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                Project.objects.create(faculty=self.owner, title="Gone", abstract="A")
+                raise DatabaseError
+        self.assertEqual(self.published(rolled_back), [])
+
+    def test_stream_route_needs_asgi(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        self.assertEqual(self.client.get("/api/events/").status_code, 501)
+
+    def test_stream_tickets(self):
+        self.assertEqual(self.client.post("/api/events/ticket/").status_code, 401)
+        # A session has no access token for the ticket to stand for
+        session = APIClient()
+        session.force_login(User.objects.get(pk=self.student.user_id))
+        self.assertEqual(session.post("/api/events/ticket/").status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        response = self.client.post("/api/events/ticket/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+        ticket = response.json()["ticket"]
+        # The ticket stands for the caller's access token, once
+        raw_token = sse.redeem(ticket)
+        self.assertEqual(AccessToken(raw_token)["user_id"], str(self.student.user_id))
+        self.assertIsNone(sse.redeem(ticket))
+        self.assertIsNone(sse.redeem("nope"))
+
+
+# The stream is served in front of Django (core/sse.py), so it is driven
+# through the ASGI application; the user lookup runs on another thread and
+# must see committed rows.
+class EventStreamASGITests(TransactionTestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.owner = make_faculty("owner")
+        self.reviewer = make_faculty("reviewer", committee=True)
+        self.token = str(AccessToken.for_user(self.reviewer.user))
+
+    def issue(self, token):
+        return APIClient().post("/api/events/ticket/", HTTP_AUTHORIZATION=f"Bearer {token}").json()["ticket"]
+
+    async def open(self, query, headers=()):
+        from exhibition_backend.asgi import application
+        messages, disconnect = asyncio.Queue(), asyncio.Event()
+        requested = []
+
+        async def receive():
+            if not requested:
+                requested.append(True)
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/api/events/", "raw_path": b"/api/events/", "root_path": "",
+            "query_string": query.encode(), "headers": [(b"host", b"testserver"), *headers],
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+        task = asyncio.ensure_future(application(scope, receive, messages.put))
+        return task, messages, disconnect
+
+    async def test_stream_delivers_events(self):
+        ticket = await sync_to_async(self.issue)(self.token)
+        # Access tokens are not accepted in the URL
+        for query in ("ticket=nope", f"token={self.token}"):
+            task, messages, _ = await self.open(query)
+            self.assertEqual((await messages.get())["status"], 401)
+            await task
+
+        task, messages, disconnect = await self.open(f"ticket={ticket}", [(b"origin", b"http://localhost:5500")])
+        start = await messages.get()
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        self.assertIn((b"access-control-allow-origin", b"http://localhost:5500"), start["headers"])
+        self.assertIn(b"retry:", (await messages.get())["body"])
+        self.assertEqual(events.broker.count, 1)
+
+        own = Project(pk=1, faculty_id=self.reviewer.pk, department="CSE", status="pending")
+        other = Project(pk=2, faculty_id=self.owner.pk, department="CSE", status="pending")
+        for project in (own, other):
+            for channel, event in events.project_messages(project, created=True):
+                events.broker.publish(channel, event)
+        # The reviewer's own submission is skipped
+        frame = (await messages.get())["body"]
+        self.assertTrue(frame.startswith(b"event: project.pending\n"))
+        self.assertEqual(json.loads(frame.split(b"data: ")[1])["project"], 2)
+
+        disconnect.set()
+        await task
+        self.assertEqual(events.broker.count, 0)
+
+        # A ticket opens one stream
+        task, messages, _ = await self.open(f"ticket={ticket}")
+        self.assertEqual((await messages.get())["status"], 401)
+        await task
+
+    async def test_stream_ends_once_the_token_goes_stale(self):
+        stamped = await sync_to_async(lambda: str(RoleTokenObtainPairSerializer.get_token(self.reviewer.user).access_token))()
+        bump = lambda: tokens.bump_generation(self.reviewer.user_id)
+        deactivate = lambda: User.objects.filter(pk=self.reviewer.user_id).update(is_active=False)
+        with override_settings(EVENTS_HEARTBEAT_SECONDS=0.05):
+            for token, go_stale in ((stamped, bump), (self.token, deactivate)):
+                ticket = await sync_to_async(self.issue)(token)
+                task, messages, _ = await self.open(f"ticket={ticket}")
+                self.assertEqual((await messages.get())["status"], 200)
+                await messages.get()   # retry hint
+                # Heartbeats pass while the token holds
+                self.assertEqual((await messages.get())["body"], b": ping\n\n")
+
+                await sync_to_async(go_stale)()
+                while (message := await messages.get()).get("more_body"):
+                    pass
+                # The server ends the response: no client disconnect needed
+                self.assertEqual(message["body"], b"")
+                await task
+                self.assertEqual(events.broker.count, 0)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.reviewer = make_faculty("reviewer", committee=True)
+        self.owner = make_faculty("owner")
+        self.student = make_student("stud")
+        self.project = Project.objects.create(
+            faculty=self.owner, title="Cached", abstract="A",
+            status="approved", is_approved=True, seats=2, seats_available=2,
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+
+    def test_catalogue_served_from_cache(self):
+        first = self.client.get("/api/projects/")
+        # Only the JWT user row and the student's eligibility flags: role and page come from the caches
+        with self.assertNumQueries(2):
+            second = self.client.get("/api/projects/")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        # Different filters are different pages
+        self.assertEqual(self.client.get("/api/projects/?difficulty=hard").json()["results"], [])
+
+    def test_etag_not_modified(self):
+        etag = self.client.get("/api/projects/")["ETag"]
+        response = self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        detail_etag = self.client.get(f"/api/projects/{self.project.pk}/")["ETag"]
+        response = self.client.get(f"/api/projects/{self.project.pk}/", HTTP_IF_NONE_MATCH=f"W/{detail_etag}")
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_invalidate(self):
+        etag = self.client.get("/api/projects/")["ETag"]
+        detail_etag = self.client.get(f"/api/projects/{self.project.pk}/")["ETag"]
+
+        # Applying changes seats_available through a conditional UPDATE
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/applications/", {"project": self.project.pk}, format="json")
+        response = self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["seats_available"], 1)
+        response = self.client.get(f"/api/projects/{self.project.pk}/", HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.json()["seats_available"], 1)
+
+        # A committee approval shows up in the student catalogue straight away
+        pending = Project.objects.create(faculty=self.owner, title="New", abstract="A", seats=1, seats_available=1)
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.reviewer))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/projects/{pending.pk}/approve/")
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        self.assertEqual(len(self.client.get("/api/projects/").json()["results"]), 2)
+
+
+class PayloadTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.owner = make_faculty("owner")
+        self.student = make_student("stud")
+        self.projects = [
+            Project.objects.create(
+                faculty=self.owner, title=f"Payload {i}", abstract="Long abstract text. " * 40,
+                status="approved", is_approved=True, seats=2, seats_available=2,
+            )
+            for i in range(5)
+        ]
+        Application.objects.create(student=self.student, project=self.projects[0])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+
+    def test_sparse_fieldsets(self):
+        full = self.client.get("/api/projects/")
+        sparse = self.client.get("/api/projects/?fields=id,title,seats_available")
+        self.assertEqual(set(sparse.json()["results"][0]), {"id", "title", "seats_available"})
+        self.assertEqual(len(sparse.json()["results"]), 5)
+        self.assertLess(len(sparse.content) * 5, len(full.content))
+        self.assertNotIn(b", ", full.content)   # compact separators
+
+        # Detail pages are cached per fieldset
+        url = f"/api/projects/{self.projects[0].pk}/"
+        self.assertEqual(set(self.client.get(f"{url}?fields=id,title").json()), {"id", "title"})
+        self.assertIn("abstract", self.client.get(url).json())
+        self.assertEqual(
+            self.client.get("/api/applications/my/?fields=id,status,bogus").json(),
+            [{"id": self.student.applications.get().pk, "status": "pending"}],
+        )
+
+    def test_compression(self):
+        plain = self.client.get("/api/projects/")
+        self.assertEqual(plain.get("Content-Encoding"), None)
+        compressed = self.client.get("/api/projects/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertLess(len(compressed.content) * 5, len(plain.content))
+        # The ETag turns weak and still matches the cached entry
+        self.assertEqual(compressed["ETag"], f"W/{plain['ETag']}")
+        response = self.client.get(
+            "/api/projects/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=compressed["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Small bodies and refused encodings go out as they are
+        self.assertNotIn("Content-Encoding", self.client.get("/api/me/", HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertNotIn("Content-Encoding", self.client.get("/api/projects/", HTTP_ACCEPT_ENCODING="gzip;q=0"))
+
+    def test_compression_breach_mitigations(self):
+        # A random filename pads every gzip body, as GZipMiddleware does
+        bodies = {self.client.get("/api/projects/", HTTP_ACCEPT_ENCODING="gzip").content for _ in range(5)}
+        self.assertGreater(len({len(body) for body in bodies}), 1)
+        self.assertTrue(all(body[3] & gzip.FNAME for body in bodies))
+
+        # Brotli, when installed, is preferred: its output starts with a random-length metadata block
+        class Compressor:
+            def __init__(self, quality):
+                pass
+
+            def flush(self):
+                return b"H"   # window header + alignment
+
+            def process(self, chunk):
+                return zlib.compress(chunk)
+
+            def finish(self):
+                return b"E"
+
+        plain = self.client.get("/api/projects/").content
+        with mock.patch("core.compression.brotli", mock.Mock(Compressor=Compressor)):
+            bodies = {self.client.get("/api/projects/", HTTP_ACCEPT_ENCODING="br, gzip").content for _ in range(5)}
+        self.assertGreater(len({len(body) for body in bodies}), 1)
+        for body in bodies:
+            # ISLAST 0, MNIBBLES 11 (metadata), reserved 0, MSKIPBYTES 01, then MSKIPLEN - 1
+            self.assertEqual((body[:1], body[1] & 0b111111), (b"H", 0b010110))
+            skip = (body[1] >> 6 | body[2] << 2) + 1
+            self.assertEqual(body[3 + skip:], zlib.compress(plain) + b"E")
+
+        # Responses carrying tokens are never compressed
+        User.objects.create_user("tokens", password="pw-12345")
+        with override_settings(COMPRESSION_MIN_BYTES=0):
+            login = self.client.post(
+                "/api/auth/login/", {"username": "tokens", "password": "pw-12345"}, format="json",
+                HTTP_ACCEPT_ENCODING="gzip",
+            )
+            self.assertNotIn("Content-Encoding", login)
+            refresh = self.client.post(
+                "/api/auth/refresh/", {"refresh": login.json()["refresh"]}, format="json", HTTP_ACCEPT_ENCODING="gzip",
+            )
+            self.assertEqual(refresh.status_code, 200)
+            self.assertNotIn("Content-Encoding", refresh)
+
+
+class ReviewQueueTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.reviewer = make_faculty("reviewer", committee=True)
+        self.owner = make_faculty("owner")
+        self.owner.user.last_name = "Smith"
+        self.owner.user.save()
+        self.other_dept = make_faculty("mech", department="MECH")
+        self.pending = [
+            Project.objects.create(faculty=self.owner, title=f"P{i}", abstract="A") for i in range(5)
+        ]
+        Project.objects.create(faculty=self.reviewer, title="Own", abstract="A")
+        Project.objects.create(faculty=self.other_dept, title="Elsewhere", abstract="A")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.reviewer))
+
+    def test_department_copied_and_synced(self):
+        self.assertEqual(self.pending[0].department, "CSE")
+        self.other_dept.department = "CSE"
+        self.other_dept.save()
+        self.assertEqual(Project.objects.get(title="Elsewhere").department, "CSE")
+
+    def test_oldest_first_paginated(self):
+        page = self.client.get("/api/projects/pending_review/?page_size=2").json()
+        ids = [row["id"] for row in page["results"]]
+        while page["next"]:
+            page = self.client.get(page["next"]).json()
+            ids += [row["id"] for row in page["results"]]
+        self.assertEqual(ids, [project.pk for project in self.pending])
+        self.assertEqual(page["results"][0]["faculty_name"], "Owner Smith")
+
+    def test_queue_uses_review_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite query plan")
+        queryset = Project.objects.filter(department="CSE", status="pending", is_approved=False).order_by(
+            "created_at", "id"
+        )
+        self.assertIn("project_review_idx", queryset.explain())
+
+
+class ProjectSearchTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.owner = make_faculty("owner")
+        self.student = make_student("stud")
+
+        def project(title, abstract, approved=True, **extra):
+            return Project.objects.create(
+                faculty=self.owner, title=title, abstract=abstract, is_approved=approved,
+                status="approved" if approved else "pending", seats=2, seats_available=2, **extra
+            )
+
+        self.title_hit = project("Robotic vision for <farms>", "Crop monitoring with drones.")
+        self.abstract_hit = project("Crop yield", "A robot arm guided by computer vision.")
+        self.hidden = project("Robotic vision draft", "Not yet approved.", approved=False)
+        # Enough unrelated rows for BM25 term weights to mean something
+        for i in range(10):
+            project(f"Compilers {i}", "Register allocation.")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+
+    def search(self, query):
+        return self.client.get(f"/api/projects/search/?{query}").json()
+
+    def test_ranked_prefix_matches_with_highlights(self):
+        results = self.search("q=robo+vis")["results"]
+        # Title matches outrank abstract matches; students never see unapproved projects
+        self.assertEqual([row["id"] for row in results], [self.title_hit.pk, self.abstract_hit.pk])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+        self.assertEqual(
+            results[0]["highlight"]["title"], "<mark>Robotic</mark> <mark>vision</mark> for &lt;farms&gt;"
+        )
+        self.assertIn("<mark>robot</mark>", results[1]["highlight"]["abstract"])
+
+    def test_filters_pagination_and_validation(self):
+        page = self.search("q=vision&page_size=1")
+        self.assertEqual(len(page["results"]), 1)
+        self.assertIn("page=2", page["next"])
+        self.assertIsNone(self.client.get(page["next"]).json()["next"])
+        self.assertEqual(self.search("q=vision&department=MECH")["results"], [])
+        self.assertEqual(self.client.get("/api/projects/search/?q=+%21").status_code, 400)
+        # The catalogue's ?search= goes through the same index
+        results = self.client.get("/api/projects/?search=crop").json()["results"]
+        self.assertEqual({row["id"] for row in results}, {self.title_hit.pk, self.abstract_hit.pk})
+
+    def test_index_follows_writes(self):
+        self.assertEqual(len(self.search("q=vision")["results"]), 2)
+        self.abstract_hit.title = "Speech synthesis"
+        self.abstract_hit.abstract = "Neural vocoders."
+        with self.captureOnCommitCallbacks(execute=True):
+            self.abstract_hit.save()
+            self.title_hit.delete()
+        self.assertEqual(self.search("q=vision")["results"], [])
+        self.assertEqual([row["id"] for row in self.search("q=vocoder")["results"]], [self.abstract_hit.pk])
+
+
+@override_settings(REVIEW_QUORUM_SIZE=3)
+class QuorumReviewTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.owner = make_faculty("owner")
+        self.reviewers = [make_faculty(f"rev{i}", committee=True) for i in range(3)]
+        self.project = Project.objects.create(faculty=self.owner, title="Vote", abstract="A")
+        self.client = APIClient()
+
+    def vote(self, reviewer, action):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(reviewer))
+        return self.client.post(f"/api/projects/{self.project.pk}/{action}/")
+
+    def test_majority_decides(self):
+        response = self.vote(self.reviewers[0], "approve")
+        self.assertEqual(response.data["status"], "pending")
+        self.assertEqual(response.data["approve_votes"], 1)
+        self.vote(self.reviewers[1], "reject")
+        response = self.vote(self.reviewers[2], "approve")
+        self.assertEqual(response.data["status"], "approved")
+        self.project.refresh_from_db()
+        self.assertTrue(self.project.is_approved)
+        self.assertEqual((self.project.approve_votes, self.project.disapprove_votes), (2, 1))
+        self.assertEqual(ProjectReview.objects.filter(project=self.project).count(), 3)
+        # Decided projects take no more votes
+        self.assertEqual(self.vote(self.reviewers[1], "approve").status_code, 400)
+
+    def test_status_only_changes_through_votes(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.owner))
+        response = self.client.patch(
+            f"/api/projects/{self.project.pk}/",
+            {"status": "approved", "is_approved": True, "is_discarded": False, "timeline": "3 months"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.status, self.project.is_approved), ("pending", False))
+        self.assertEqual(self.project.timeline, "3 months")
+
+    def test_changed_vote_moves_tally(self):
+        self.vote(self.reviewers[0], "approve")
+        response = self.vote(self.reviewers[0], "reject")
+        self.assertEqual((response.data["approve_votes"], response.data["disapprove_votes"]), (0, 1))
+        self.assertEqual(ProjectReview.objects.get(project=self.project).decision, "disapprove")
+
+    def test_bulk_review(self):
+        projects = [Project.objects.create(faculty=self.owner, title=f"B{i}", abstract="A") for i in range(30)]
+        own = Project.objects.create(faculty=self.reviewers[1], title="Own", abstract="A")
+        elsewhere = Project.objects.create(faculty=make_faculty("mech", department="MECH"), title="M", abstract="A")
+        reviews = [{"project": p.pk, "decision": "approve"} for p in projects]
+        reviews += [{"project": own.pk, "decision": "approve"}, {"project": elsewhere.pk, "decision": "approve"}]
+
+        # Constant number of queries however many projects are reviewed
+        # (the second round also resolves all 30 and updates the counters)
+        for reviewer, queries in zip(self.reviewers, (8, 16)):
+            self.client.credentials(HTTP_AUTHORIZATION=bearer(reviewer))
+            with self.assertNumQueries(queries):
+                response = self.client.post("/api/projects/review/", {"reviews": reviews}, format="json")
+            self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.data["results"]), 30)
+        self.assertEqual({row["status"] for row in response.data["results"]}, {"approved"})
+        self.assertEqual([e["project"] for e in response.data["errors"]], [own.pk, elsewhere.pk])
+        self.assertEqual(Project.objects.filter(pk__in=[p.pk for p in projects], is_approved=True).count(), 30)
+
+        invalid = self.client.post("/api/projects/review/", {"reviews": [{"project": 1, "decision": "maybe"}]},
+                                   format="json")
+        self.assertEqual(invalid.status_code, 400)
+        # A bare list instead of {"reviews": [...]}
+        invalid = self.client.post("/api/projects/review/", reviews, format="json")
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_repeated_vote_writes_nothing(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.reviewers[0]))
+        review = lambda: self.client.post(
+            "/api/projects/review/", {"reviews": [{"project": self.project.pk, "decision": "approve"}]}, format="json",
+        )
+        review()
+        version = response_cache.get_version()
+        response = review()
+        self.assertEqual(response.data["results"][0]["approve_votes"], 1)
+        # Cached pages stay valid
+        self.assertEqual(response_cache.get_version(), version)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BulkImportExportTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("admin", is_staff=True))
+
+    def upload(self, kind, name, content, **extra):
+        return self.client.post(
+            f"/api/admin/import/{kind}/", {"file": SimpleUploadedFile(name, content.encode()), **extra},
+            format="multipart",
+        )
+
+    def test_import_students_csv(self):
+        make_student("taken")
+        content = (
+            "username,password,roll_number,course\n"
+            "ann,pw-ann-1,R1,BTech\n"
+            "bob,,R2,\n"
+            "taken,pw,R3,BTech\n"   # existing username
+            "cat,pw,R1,BTech\n"      # roll number used earlier in the file
+            ",pw,R4,BTech\n"         # missing username
+        )
+        # Uploads hash on the shared pool: no processes started inside the web worker
+        with mock.patch("core.bulk.ProcessPoolExecutor") as processes:
+            response = self.upload("students", "students.csv", content)
+        processes.assert_not_called()
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([e["line"] for e in response.data["errors"]], [4, 5, 6])
+        self.assertTrue(User.objects.get(username="ann").check_password("pw-ann-1"))
+        self.assertFalse(User.objects.get(username="bob").has_usable_password())
+        self.assertEqual(Student.objects.get(user__username="bob").course, "Unknown")
+
+    def test_import_rejects_unknown_format_and_encoding(self):
+        content = "username,password,roll_number,course\nann,pw,R1,BTech\n"
+        response = self.upload("students", "students.csv", content, format="xml")
+        self.assertEqual(response.status_code, 400)
+        # Invalid bytes after a full valid batch: refused before anything is written
+        rows = "username,password,roll_number,course\n" + "".join(f"u{i},pw,R{i},BTech\n" for i in range(600))
+        latin1 = SimpleUploadedFile("students.csv", rows.encode() + "zoë,pw,R9999,BTech\n".encode("latin-1"))
+        response = self.client.post("/api/admin/import/students/", {"file": latin1}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Student.objects.exists())
+
+        dry = self.upload("students", "more.csv", "username,roll_number\ndan,R9\n", dry_run="true")
+        self.assertEqual((dry.data["valid"], dry.data["created"]), (1, 0))
+
+    def test_process_pool_hashing_in_batches(self):
+        rows = [(i, {"username": f"f{i}", "password": f"pw{i}", "department": "CSE"}) for i in range(7)]
+        result = import_rows("faculty", rows, workers=2, batch_size=3)
+        self.assertEqual(result.created, 7)
+        self.assertTrue(User.objects.get(username="f6").check_password("pw6"))
+
+    def test_import_projects_jsonl(self):
+        make_faculty("prof")
+        lines = [
+            {"faculty": "prof", "title": "Robots", "abstract": "A", "seats": 3, "difficulty": "hard"},
+            {"faculty": "ghost", "title": "X", "abstract": "A"},
+            {"faculty": "prof", "title": "Y", "abstract": "A", "seats": "0"},
+        ]
+        content = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+        response = self.upload("projects", "projects.jsonl", content)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(len(response.data["errors"]), 3)
+        project = Project.objects.get(title="Robots")
+        self.assertEqual((project.status, project.seats_available, project.department), ("pending", 3, "CSE"))
+        self.assertEqual(DashboardCounter.objects.get(scope="department", key="CSE").projects_pending, 1)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as handle:
+            handle.write(json.dumps({"username": "cmd", "password": "pw", "department": "EEE"}) + "\n")
+        out = io.StringIO()
+        call_command("import_data", "faculty", handle.name, "--workers", "1", stdout=out)
+        self.assertEqual(Faculty.objects.get(user__username="cmd").department, "EEE")
+        self.assertIn('"created": 1', out.getvalue())
+
+    def test_streaming_exports(self):
+        owner = make_faculty("owner")
+        project = Project.objects.create(faculty=owner, title="P", abstract="A", is_approved=True)
+        for i in range(3):
+            Application.objects.create(
+                student=make_student(f"s{i}"), project=project, status="selected" if i == 0 else "pending"
+            )
+
+        response = self.client.get("/api/admin/export/applications.csv")
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "student", "roll_number"])
+        self.assertEqual(len(lines), 4)
+
+        response = self.client.get("/api/admin/export/allocation.jsonl")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["student"] for row in rows], ["s0"])
+        self.assertEqual(rows[0]["project_title"], "P")
+
+        self.assertEqual(self.client.get("/api/admin/export/applications.xml").status_code, 404)
+        self.client.force_authenticate(User.objects.get(pk=owner.user_id))
+        self.assertEqual(self.client.get("/api/admin/export/applications.csv").status_code, 403)
+
+    async def test_streaming_exports_under_asgi(self):
+        owner = await sync_to_async(make_faculty)("owner")
+        project = await Project.objects.acreate(faculty=owner, title="P", abstract="A", is_approved=True)
+        for i in range(3):
+            student = await sync_to_async(make_student)(f"s{i}")
+            await Application.objects.acreate(student=student, project=project)
+        admin = await User.objects.aget(username="admin")
+        client, authorization = AsyncClient(), f"Bearer {AccessToken.for_user(admin)}"
+
+        # An async iterator: rows are fetched chunk by chunk, not collected into a list first
+        response = await client.get("/api/admin/export/applications.csv", headers={"authorization": authorization})
+        self.assertTrue(response.is_async)
+        lines = b"".join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+
+        response = await client.get("/api/admin/export/applications.jsonl", headers={
+            "authorization": authorization, "accept-encoding": "gzip",
+        })
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(len(body.splitlines()), 3)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("admin", is_staff=True))
+        cse, ece = make_faculty("cse", department="CSE"), make_faculty("ece", department="ECE")
+        self.hot = Project.objects.create(faculty=cse, title="Hot", abstract="A", is_approved=True, seats=1)
+        self.cold = Project.objects.create(faculty=cse, title="Cold", abstract="A", is_approved=True, seats=4)
+        self.empty = Project.objects.create(faculty=ece, title="Empty", abstract="A", is_approved=True, seats=2)
+        for i, (project, cgpa, priority) in enumerate([
+            (self.hot, 9.5, 1), (self.hot, 7.2, 2), (self.hot, None, 1), (self.cold, 4.0, 3),
+        ]):
+            Application.objects.create(
+                student=make_student(f"s{i}"), project=project, cgpa=cgpa, priority=priority,
+                status="selected" if i == 0 else "pending",
+            )
+
+    def test_report(self):
+        report = self.client.get("/api/admin/analytics/").json()
+        self.assertEqual(report["cgpa_buckets"], ["<5", "5-6", "6-7", "7-8", "8-9", "9-10"])
+        totals = report["totals"]
+        self.assertEqual(
+            (totals["projects"], totals["seats"], totals["applications"], totals["selected"]), (3, 7, 4, 1)
+        )
+        self.assertEqual(totals["oversubscribed_projects"], 1)
+        self.assertEqual(totals["priority_histogram"], [2, 1, 1, 0])
+        self.assertEqual(totals["cgpa"], {"mean": 6.9, "missing": 1, "histogram": [1, 0, 0, 1, 0, 1]})
+
+        self.assertEqual([d["department"] for d in report["departments"]], ["CSE", "ECE"])
+        self.assertEqual(report["departments"][1]["applications"], 0)
+        hot, cold = report["projects"]   # most oversubscribed first, none without applications
+        self.assertEqual((hot["id"], hot["oversubscription"], cold["oversubscription"]), (self.hot.pk, 3.0, 0.25))
+        self.assertEqual((hot["cgpa"]["min"], hot["cgpa"]["max"], hot["cgpa"]["missing"]), (7.2, 9.5, 1))
+
+        narrowed = self.client.get("/api/admin/analytics/?department=ECE&limit=5").json()
+        self.assertEqual((narrowed["totals"]["projects"], narrowed["projects"]), (1, []))
+        self.assertEqual(self.client.get("/api/admin/analytics/?limit=x").status_code, 400)
+
+    def test_cached_until_an_application_write(self):
+        first = self.client.get("/api/admin/analytics/")
+        with self.assertNumQueries(0):
+            again = self.client.get("/api/admin/analytics/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(student=make_student("late"), project=self.empty, cgpa=8.1)
+        report = self.client.get("/api/admin/analytics/").json()
+        self.assertEqual(report["totals"]["applications"], 5)
+
+        self.client.force_authenticate(User.objects.get(username="cse"))
+        self.assertEqual(self.client.get("/api/admin/analytics/").status_code, 403)
+
+
+class MeEndpointTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.faculty = make_faculty("prof", committee=True, password="pw-12345")
+
+    def test_me_single_query(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.faculty.user_id))
+        with self.assertNumQueries(1):
+            response = client.get("/api/me/")
+        self.assertEqual(response.data["role"], "faculty")
+        self.assertEqual(response.data["faculty"]["department"], "CSE")
+        self.assertTrue(response.data["committee"]["approved_by_admin"])
+        self.assertIsNone(response.data["student"])
+
+    def test_login_includes_me_payload(self):
+        response = APIClient().post(
+            "/api/auth/login/", {"username": "prof", "password": "pw-12345"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("access", data)
+        self.assertEqual(data["me"]["role"], "faculty")
+        self.assertEqual(data["me"]["name"], "Prof")
+        # The access token works against the API
+        me = APIClient(HTTP_AUTHORIZATION=f"Bearer {data['access']}").get("/api/me/")
+        self.assertEqual(me.data["username"], "prof")
+
+    def test_login_rejects_bad_credentials(self):
+        client = APIClient()
+        response = client.post("/api/auth/login/", {"username": "prof", "password": "wrong"}, format="json")
+        self.assertEqual(response.status_code, 401)
+        response = client.post("/api/auth/login/", {"username": "nobody", "password": "pw-12345"}, format="json")
+        self.assertEqual(response.status_code, 401)
+        response = client.post("/api/auth/login/", {"username": "prof"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json())
+        User.objects.filter(username="prof").update(is_active=False)
+        response = client.post("/api/auth/login/", {"username": "prof", "password": "pw-12345"}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+TUNED_PBKDF2 = "core.hashers.TunedPBKDF2PasswordHasher"
+TUNED_SCRYPT = "core.hashers.TunedScryptPasswordHasher"
+
+
+class PasswordHashingTests(TestCase):
+    def make_user(self, password):
+        user = User.objects.create(username="hash-user")
+        user.set_password(password)
+        user.save()
+        return user
+
+    @override_settings(PASSWORD_HASHERS=[TUNED_PBKDF2], PASSWORD_HASH_COST={"pbkdf2_sha256": {"iterations": 1000}})
+    def test_cost_comes_from_settings(self):
+        self.assertTrue(self.make_user("pw-12345").password.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(
+        PASSWORD_HASHERS=[TUNED_SCRYPT, TUNED_PBKDF2],
+        PASSWORD_HASH_COST={"scrypt": {"work_factor": 2 ** 10, "block_size": 8, "parallelism": 1}},
+    )
+    def test_login_upgrades_outdated_hashes(self):
+        with override_settings(PASSWORD_HASHERS=[TUNED_PBKDF2], PASSWORD_HASH_COST={"pbkdf2_sha256": {"iterations": 1000}}):
+            user = self.make_user("pw-12345")
+        Faculty.objects.create(user=user, department="CSE")
+
+        # Old hasher still verifies, and the password is re-hashed with the preferred one
+        response = APIClient().post("/api/auth/login/", {"username": "hash-user", "password": "pw-12345"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$1024$"))
+
+        # A cost change is an upgrade too
+        with override_settings(PASSWORD_HASH_COST={"scrypt": {"work_factor": 2 ** 11, "block_size": 8, "parallelism": 1}}):
+            response = APIClient().post("/api/auth/login/", {"username": "hash-user", "password": "pw-12345"}, format="json")
+            self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$2048$"))
+
+    @override_settings(PASSWORD_HASHERS=[TUNED_PBKDF2], PASSWORD_HASH_COST={"pbkdf2_sha256": {"iterations": 1000}})
+    def test_signup_and_session_login_use_configured_hasher(self):
+        response = APIClient().post(
+            "/api/signup/", {"username": "new", "password": "pw-12345", "role": "student"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(username="new").password.startswith("pbkdf2_sha256$1000$"))
+        # django.contrib.auth logins (admin / browsable API) go through the pooled backend
+        self.assertTrue(self.client.login(username="new", password="pw-12345"))
+        self.assertFalse(self.client.login(username="new", password="wrong"))
+
+    @override_settings(PASSWORD_HASH_WORKERS=4)
+    def test_bulk_hashing_leaves_workers_for_logins(self):
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def slow_hash(password):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return f"hashed:{password}"
+
+        with mock.patch("core.passwords.make_password", slow_hash):
+            self.assertEqual(passwords.hash_many(["a", "b", "c"] * 4), [f"hashed:{p}" for p in ["a", "b", "c"] * 4])
+        self.assertEqual(peak[0], 2)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        registry.clear()
+        self.student = make_student("student")
+        self.client = APIClient(HTTP_AUTHORIZATION=bearer(self.student))
+
+    def scrape(self):
+        response = self.client.get("/api/_metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return response.content.decode()
+
+    def test_records_latency_queries_and_size_per_route(self):
+        self.client.get("/api/projects/")   # async view
+        self.client.get("/api/projects/")   # cached page: only the JWT user lookup
+        self.client.get("/api/me/")          # DRF view
+        self.client.get("/api/no-such-route/")
+        for method in ("BREW", "PROPFIND"):
+            self.client.generic(method, "/api/me/")
+        body = self.scrape()
+
+        self.assertIn('http_requests_total{route="api/projects/",method="GET",status="200"} 2', body)
+        self.assertIn('http_requests_total{route="api/me/",method="GET",status="200"} 1', body)
+        self.assertIn('http_requests_total{route="<unmatched>",method="GET",status="404"} 1', body)
+        self.assertIn('http_request_duration_seconds_count{route="api/projects/",method="GET"} 2', body)
+        # Queries run by the async view (in sync_to_async threads) are counted too
+        self.assertIn('http_request_db_queries_sum{route="api/projects/",method="GET"} 4', body)
+        self.assertIn('http_request_db_queries_bucket{route="api/projects/",method="GET",le="1"} 1', body)
+        self.assertIn('http_request_db_queries_sum{route="api/me/",method="GET"} 2', body)
+        self.assertIn('http_response_size_bytes_count{route="api/me/",method="GET"} 1', body)
+        self.assertIn("metrics_overhead_seconds_total ", body)
+        # Made-up methods share one label value
+        self.assertIn('http_requests_total{route="api/me/",method="OTHER",status="405"} 2', body)
+        self.assertNotIn("BREW", body)
+
+    def test_endpoint_restricted_to_allowed_ips_and_staff(self):
+        self.assertEqual(APIClient(REMOTE_ADDR="10.1.2.3").get("/api/_metrics").status_code, 403)
+        # Relayed by a local proxy: the loopback address is not the client's
+        forwarded = APIClient(REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.9")
+        self.assertEqual(forwarded.get("/api/_metrics").status_code, 403)
+        staff = User.objects.create_user("ops", password="pw-12345", is_staff=True)
+        client = APIClient(REMOTE_ADDR="10.1.2.3")
+        client.force_login(staff)
+        self.assertEqual(client.get("/api/_metrics").status_code, 200)
+
+    @override_settings(SLOW_REQUEST_MS=0.000001)
+    def test_slow_request_log_includes_sql(self):
+        client = APIClient(HTTP_AUTHORIZATION=bearer(self.student))
+        with self.assertLogs("core.metrics", "WARNING") as logs:
+            client.get("/api/me/")
+        self.assertIn("Slow request GET /api/me/", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+        self.assertIn("http_slow_requests_total 1", registry.render())
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_can_be_disabled(self):
+        APIClient(HTTP_AUTHORIZATION=bearer(self.student)).get("/api/me/")
+        self.assertNotIn('route="api/me/"', registry.render())
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BenchmarkSuiteTests(TestCase):
+    def test_every_route_has_a_scenario(self):
+        self.assertEqual(uncovered_routes(), [])
+
+    def test_suite_runs_on_seeded_data(self):
+        cache.clear()
+        created = seed(students=30, faculty=12, projects=40, applications=60, departments=2, committee_share=0.5)
+        self.assertEqual(created["applications"], 60)
+        self.assertEqual(Application.objects.filter(status="selected").count(), 0)
+        for project in Project.objects.filter(is_approved=True):
+            open_apps = project.applications.exclude(status="rejected").count()
+            self.assertEqual(project.seats_available, project.seats - open_apps)
+
+        results = run_suite(samples=1)
+        for name, result in results.items():
+            self.assertTrue(all(status < 400 for status in result["status"]), (name, result))
+        self.assertEqual(compare(results, results), [])
+        worse = {name: dict(result, queries=result["queries"] + 1) for name, result in results.items()}
+        self.assertEqual(len(compare(worse, results)), len(results))
+
+
+@override_settings(
+    THROTTLE_RATES={"user": "1000/min", "catalogue": "3/min", "apply": "2/min"},
+    THROTTLE_ENDPOINT_RATES={"apply": "3/min"},
+)
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        throttling.store.clear()
+        # Buckets are process-wide: do not leave them drained for later tests
+        self.addCleanup(throttling.store.clear)
+        owner = make_faculty("owner")
+        self.projects = [
+            Project.objects.create(
+                faculty=owner, title=f"P{i}", abstract="A", status="approved", is_approved=True,
+                seats=5, seats_available=5,
+            )
+            for i in range(3)
+        ]
+        self.client = APIClient()
+
+    def as_user(self, profile):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(profile))
+
+    def apply(self, project):
+        return self.client.post("/api/applications/", {"project": project.pk}, format="json")
+
+    def test_token_buckets(self):
+        first, second = make_student("first"), make_student("second")
+        self.as_user(first)
+        self.assertEqual([self.client.get("/api/projects/").status_code for _ in range(4)], [200, 200, 200, 429])
+        self.assertEqual(self.client.get("/api/projects/")["Retry-After"], "20")
+        # Other endpoints and other users have their own buckets
+        self.assertEqual(self.client.get("/api/applications/my/").status_code, 200)
+        self.as_user(second)
+        self.assertEqual(self.client.get("/api/projects/").status_code, 200)
+
+        # Per student: 2 applies a minute
+        self.as_user(first)
+        self.assertEqual([self.apply(project).status_code for project in self.projects], [201, 201, 429])
+        # All students together: 3 a minute
+        self.as_user(second)
+        response = self.apply(self.projects[0])
+        self.assertEqual(response.status_code, 201)
+        response = self.apply(self.projects[1])
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "20")
+
+    @override_settings(THROTTLE_RATES={"login": "2/min", "login_username": "2/min"})
+    def test_login_buckets(self):
+        User.objects.create_user("prof", password="pw-12345")
+        login = lambda username, ip="10.0.0.1": self.client.post(
+            "/api/auth/login/", {"username": username, "password": "wrong"}, format="json", REMOTE_ADDR=ip,
+        ).status_code
+        self.assertEqual([login("prof"), login("Prof")], [401, 401])
+        # Same username from elsewhere, or anyone from the same address
+        self.assertEqual([login("prof", "10.0.0.2"), login("other")], [429, 429])
+        self.assertEqual(login("other", "10.0.0.3"), 401)
+
+        # Without the username bucket only the address counts
+        throttling.store.clear()
+        with override_settings(THROTTLE_RATES={"login": "2/min", "login_username": None}):
+            self.assertEqual([login("prof", f"10.0.1.{i}") for i in range(4)], [401] * 4)
+
+    @override_settings(ADMISSION_MAX_CONCURRENT=1, ADMISSION_QUEUE_SIZE=1, ADMISSION_MAX_WAIT=0.2)
+    def test_admission_control(self):
+        gate = throttling.AdmissionGate("test")
+        holding, release = threading.Event(), threading.Event()
+
+        def hold():
+            with gate.admit():
+                holding.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        holding.wait()
+        # A queued request waits at most ADMISSION_MAX_WAIT for the slot
+        with self.assertRaises(throttling.Overloaded):
+            with gate.admit():
+                pass
+        release.set()
+        holder.join()
+        with gate.admit():
+            self.assertEqual(gate.running, 1)
+
+        # Over the limit with a full queue, applies are shed at once with Retry-After
+        self.as_user(make_student("late"))
+        with mock.patch.object(throttling.apply_gate, "running", 1), \
+                mock.patch.object(throttling.apply_gate, "waiting", 1):
+            response = self.apply(self.projects[0])
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(self.apply(self.projects[0]).status_code, 201)
+
+
+class EligibilityTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        owner = make_faculty("owner")
+        self.student = make_student("stud")
+        self.open, self.full, self.applied, self.other = Project.objects.bulk_create([
+            Project(faculty=owner, title=title, abstract="A", status="approved", is_approved=True,
+                    seats=2, seats_available=0 if title == "Full" else 2)
+            for title in ("Open", "Full", "Applied", "Other")
+        ])
+        Application.objects.create(student=self.student, project=self.applied)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+
+    def apply(self, project):
+        return self.client.post("/api/applications/", {"project": project.pk}, format="json")
+
+    def test_catalogue_flags(self):
+        page = self.client.get("/api/projects/").json()
+        flags = page["eligibility"]
+        self.assertEqual(flags[str(self.open.pk)], {
+            "applied": False, "seats_full": False, "limit_reached": False, "can_apply": True,
+        })
+        self.assertEqual(
+            (flags[str(self.full.pk)]["seats_full"], flags[str(self.full.pk)]["can_apply"]), (True, False)
+        )
+        self.assertEqual(
+            (flags[str(self.applied.pk)]["applied"], flags[str(self.applied.pk)]["can_apply"]), (True, False)
+        )
+        self.assertEqual(len(page["results"]), 4)
+
+        # Reaching the limit turns every button off; the shared page itself stays cached
+        self.assertEqual(self.apply(self.open).status_code, 201)
+        self.assertEqual(self.apply(self.other).status_code, 201)
+        flags = self.client.get("/api/projects/").json()["eligibility"]
+        self.assertTrue(all(item["limit_reached"] and not item["can_apply"] for item in flags.values()))
+
+        faculty = APIClient()
+        faculty.credentials(HTTP_AUTHORIZATION=bearer(Faculty.objects.get()))
+        self.assertNotIn("eligibility", faculty.get("/api/projects/").json())
+
+    def test_apply_checks_in_one_query(self):
+        for project, error in [
+            (self.full, "No seats available for this project."),
+            (self.applied, "You have already applied to this project."),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.apply(project)
+            self.assertEqual(response.json(), [error])
+            checks = [query for query in queries if "core_application" in query["sql"]]
+            self.assertEqual(len(checks), 1, [query["sql"] for query in checks])
+
+        self.apply(self.open)
+        self.apply(self.other)
+        Project.objects.filter(pk=self.full.pk).update(seats_available=1)
+        self.assertEqual(self.apply(self.full).json(), ["You cannot apply to more than 3 projects."])
+        self.assertEqual(Application.objects.filter(student=self.student).count(), 3)
+
+
+# Hundreds of simultaneous applies from real threads against the file-backed
+# test database (see DATABASES['default']['TEST']); seats must never be over-booked.
+# This tests the database guards, so admission control and rate limits are off.
+@override_settings(ADMISSION_CONTROL=False, THROTTLE_ENABLED=False)
+class ConcurrentApplyTests(TransactionTestCase):
+    THREADS = 200
+
+    def setUp(self):
+        clear_role_cache()
+        self.owner = make_faculty("owner")
+
+    def make_project(self, seats, title="Contended"):
+        return Project.objects.create(
+            faculty=self.owner, title=title, abstract="Abstract", status="approved",
+            is_approved=True, seats=seats, seats_available=seats,
+        )
+
+    def run_concurrently(self, calls):
+        barrier = threading.Barrier(len(calls))
+        statuses = []
+
+        def worker(student, project):
+            client = APIClient()
+            client.force_authenticate(User.objects.get(pk=student.user_id))
+            try:
+                barrier.wait()
+                response = client.post("/api/applications/", {"project": project.pk}, format="json")
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=call) for call in calls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def test_no_overbooking_under_contention(self):
+        project = self.make_project(seats=5)
+        students = [make_student(f"s{i}") for i in range(self.THREADS)]
+
+        statuses = self.run_concurrently([(student, project) for student in students])
+
+        project.refresh_from_db()
+        self.assertEqual(statuses.count(201), 5)
+        self.assertEqual(statuses.count(400), self.THREADS - 5)
+        self.assertEqual(project.seats_available, 0)
+        self.assertEqual(Application.objects.filter(project=project).count(), 5)
+
+    def test_application_limit_under_contention(self):
+        student = make_student("eager")
+        projects = [self.make_project(seats=50, title=f"P{i}") for i in range(10)]
+
+        statuses = self.run_concurrently([(student, project) for project in projects])
+
+        self.assertEqual(statuses.count(201), 3)
+        self.assertEqual(Application.objects.filter(student=student).count(), 3)
+        self.assertEqual(sum(50 - p.seats_available for p in Project.objects.all()), 3)
+
+    def test_reject_releases_seat_once(self):
+        project = self.make_project(seats=1)
+        student = make_student("s")
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=student.user_id))
+        app_id = client.post("/api/applications/", {"project": project.pk}, format="json").data["id"]
+
+        client.force_authenticate(User.objects.get(pk=self.owner.user_id))
+        client.post(f"/api/applications/{app_id}/reject/")
+        client.post(f"/api/applications/{app_id}/reject/")
+        project.refresh_from_db()
+        self.assertEqual(project.seats_available, 1)
+
+    def test_select_and_reject_use_the_locked_status(self):
+        # get_object() read the application before a concurrent request changed it
+        project = self.make_project(seats=1)
+        student = make_student("s")
+        app = Application.objects.create(student=student, project=project, status="rejected")
+        stale = Application.objects.select_related("project").get(pk=app.pk)
+        stale.status = "pending"
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.owner.user_id))
+        with mock.patch("core.views.ApplicationViewSet.get_object", return_value=stale):
+            self.assertEqual(client.post(f"/api/applications/{app.pk}/select/").status_code, 200)
+        project.refresh_from_db()
+        # The seat released by the reject is taken back
+        self.assertEqual(project.seats_available, 0)
+
+        stale.status = "pending"
+        with mock.patch("core.views.ApplicationViewSet.get_object", return_value=stale), \
+                mock.patch("core.views.record_application_changes") as record:
+            client.post(f"/api/applications/{app.pk}/reject/")
+        record.assert_called_once_with([(project.pk, "selected", "rejected")])
+
+    def test_application_cannot_move_projects(self):
+        first, second = self.make_project(seats=1, title="A"), self.make_project(seats=1, title="B")
+        student = make_student("s")
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=student.user_id))
+        app_id = client.post("/api/applications/", {"project": first.pk}, format="json").data["id"]
+        response = client.patch(f"/api/applications/{app_id}/", {"project": second.pk, "priority": 2}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Application.objects.values_list("project_id", "priority").get(), (first.pk, 2))
+
+
+class AllocationTests(TestCase):
+    def setUp(self):
+        owner = make_faculty("owner")
+        self.alpha = Project.objects.create(faculty=owner, title="Alpha", abstract="A",
+                                            is_approved=True, seats=1, seats_available=1)
+        self.beta = Project.objects.create(faculty=owner, title="Beta", abstract="B",
+                                           is_approved=True, seats=1, seats_available=1)
+        self.ann = make_student("ann")
+        self.bob = make_student("bob")
+        # Both want Alpha first; Ann has the higher CGPA so Alpha keeps her
+        self.ann_alpha = Application.objects.create(student=self.ann, project=self.alpha, priority=1, cgpa=9.1)
+        self.ann_beta = Application.objects.create(student=self.ann, project=self.beta, priority=2, cgpa=9.1)
+        self.bob_alpha = Application.objects.create(student=self.bob, project=self.alpha, priority=1, cgpa=8.0)
+        self.bob_beta = Application.objects.create(student=self.bob, project=self.beta, priority=2, cgpa=8.0)
+
+    def statuses(self):
+        return dict(Application.objects.values_list("id", "status"))
+
+    def test_dry_run_reports_diff_without_writing(self):
+        before = self.statuses()
+        summary = run_allocation(commit=False).summary()
+        self.assertEqual(self.statuses(), before)
+        self.assertFalse(summary["committed"])
+        self.assertEqual(summary["selected"], 2)
+        self.assertEqual(summary["rejected"], 2)
+
+    def test_commit_applies_stable_matching(self):
+        run_allocation(commit=True)
+        statuses = self.statuses()
+        self.assertEqual(statuses[self.ann_alpha.id], "selected")
+        self.assertEqual(statuses[self.bob_beta.id], "selected")
+        self.assertEqual(statuses[self.bob_alpha.id], "rejected")
+        self.assertEqual(statuses[self.ann_beta.id], "rejected")
+        self.alpha.refresh_from_db()
+        self.assertEqual(self.alpha.seats_available, 0)
+        # Running again is a no-op
+        self.assertEqual(run_allocation(commit=True).summary()["changed"], 0)
+
+    def test_faculty_selection_is_kept(self):
+        Application.objects.filter(pk=self.bob_alpha.pk).update(status="selected")
+        run_allocation(commit=True)
+        statuses = self.statuses()
+        self.assertEqual(statuses[self.bob_alpha.id], "selected")
+        self.assertEqual(statuses[self.ann_beta.id], "selected")
+        self.assertEqual(statuses[self.ann_alpha.id], "rejected")
+
+    def test_admin_only_api(self):
+        client = APIClient()
+        client.force_authenticate(self.ann.user)
+        self.assertEqual(client.post("/api/allocation/").status_code, 403)
+        admin = User.objects.create_user(username="admin", is_staff=True)
+        client.force_authenticate(admin)
+        response = client.post("/api/allocation/", {"commit": False}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["changes"]), 4)
+
+
+class DashboardCounterTests(TestCase):
+    COUNTER_FIELDS = [f.name for f in DashboardCounter._meta.fields if f.name not in ("id", "scope", "key")]
+
+    def setUp(self):
+        clear_role_cache()
+        self.reviewer = make_faculty("reviewer", committee=True)
+        self.owner = make_faculty("owner")
+        self.client = APIClient()
+
+    def as_user(self, profile):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(profile))
+
+    def snapshot(self):
+        counters = {
+            (row["scope"], row["key"]): row
+            for row in DashboardCounter.objects.values("scope", "key", *self.COUNTER_FIELDS)
+        }
+        projects = dict(Project.objects.values_list("id", "applications_count"))
+        return counters, projects
+
+    def test_incremental_counters_match_rebuild(self):
+        self.as_user(self.owner)
+        ids = [
+            self.client.post("/api/projects/", {"title": f"P{i}", "abstract": "A", "seats": 3}, format="json").data["id"]
+            for i in range(3)
+        ]
+        self.as_user(self.reviewer)
+        self.client.post(f"/api/projects/{ids[0]}/approve/")
+        self.client.post(f"/api/projects/{ids[1]}/approve/")
+        self.client.post(f"/api/projects/{ids[2]}/reject/")
+
+        students = [make_student(f"s{i}") for i in range(3)]
+        app_ids = []
+        for student in students:
+            self.as_user(student)
+            for project_id in ids[:2]:
+                app_ids.append(self.client.post("/api/applications/", {"project": project_id}, format="json").data["id"])
+
+        self.as_user(self.owner)
+        self.client.post(f"/api/applications/{app_ids[0]}/select/")
+        self.client.post(f"/api/applications/{app_ids[3]}/reject/")
+        self.client.delete(f"/api/projects/{ids[2]}/")
+
+        incremental = self.snapshot()
+        rebuild_counters()
+        self.assertEqual(incremental, self.snapshot())
+
+        self.as_user(self.owner)
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.json()["faculty"]["projects_total"], 2)
+        self.assertEqual(response.json()["faculty"]["applications_total"], 6)
+        self.assertEqual(response.json()["faculty"]["applications_selected"], 1)
+        self.assertIsNone(response.json()["department"])
+
+    def test_rebuild_keys_departments_like_the_increments(self):
+        self.as_user(self.owner)
+        self.client.post("/api/projects/", {"title": "P", "abstract": "A", "seats": 3}, format="json")
+        # A set-based update sends no signal: the project keeps its department (CSE)
+        Faculty.objects.filter(pk=self.owner.pk).update(department="ECE")
+        incremental = self.snapshot()
+        rebuild_counters()
+        self.assertEqual(incremental, self.snapshot())
+        self.assertFalse(DashboardCounter.objects.filter(key="ECE").exists())
+
+    def test_department_change_moves_the_counters(self):
+        project = Project.objects.create(
+            faculty=self.owner, title="P", abstract="A", status="approved", is_approved=True, seats=3, seats_available=3,
+        )
+        rebuild_counters()
+        self.as_user(make_student("s"))
+        self.client.post("/api/applications/", {"project": project.pk}, format="json")
+
+        self.owner.department = "ECE"
+        self.owner.save()
+        department = lambda key: DashboardCounter.objects.get(scope=DashboardCounter.SCOPE_DEPARTMENT, key=key)
+        self.assertEqual((department("CSE").projects_total, department("CSE").applications_total), (0, 0))
+        self.assertEqual((department("ECE").projects_approved, department("ECE").applications_pending), (1, 1))
+        incremental = self.snapshot()
+        rebuild_counters()
+        # The rebuild has no rows for empty departments
+        counters, projects = incremental
+        counters = {key: row for key, row in counters.items() if any(row[f] for f in self.COUNTER_FIELDS)}
+        self.assertEqual((counters, projects), self.snapshot())
+
+        self.as_user(self.owner)
+        self.client.delete(f"/api/projects/{project.pk}/")
+        self.assertEqual((department("ECE").projects_total, department("ECE").applications_total), (0, 0))
+
+    def test_dashboard_constant_queries(self):
+        self.as_user(self.reviewer)
+        with self.assertNumQueries(3):  # JWT user + role lookup + counter rows
+            response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.json()["department"]["projects_total"], 0)
+
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        clear_role_cache()
+        self.owner = make_faculty("owner")
+        self.other = make_faculty("other")
+        self.student = make_student("student")
+        self.client = APIClient()
+
+    def approved_project(self, faculty, title):
+        return Project.objects.create(
+            faculty=faculty, title=title, abstract="A", status="approved", is_approved=True,
+            seats=2, seats_available=2,
+        )
+
+    def run_jobs(self):
+        batches = []
+        while (result := jobs.run_batch()) != (0, 0):
+            batches.append(result)
+        return batches
+
+    def test_select_queues_follow_ups(self):
+        mine, theirs = self.approved_project(self.owner, "Mine"), self.approved_project(self.other, "Theirs")
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        app_ids = [
+            self.client.post("/api/applications/", {"project": project.pk}, format="json").data["id"]
+            for project in (mine, theirs)
+        ]
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.owner))
+        response = self.client.post(f"/api/applications/{app_ids[0]}/select/")
+        self.assertEqual(response.data["status"], "selected")
+
+        # Only the selection is committed; the rest waits for a worker
+        self.assertEqual(Application.objects.get(pk=app_ids[1]).status, "pending")
+        self.assertEqual(Project.objects.get(pk=theirs.pk).applications_count, 0)
+        self.assertEqual(Job.objects.filter(kind="counters.applications").count(), 3)
+
+        with mock.patch("core.counters.apply_application_changes", wraps=counters.apply_application_changes) as apply:
+            self.run_jobs()
+        # The three queued counter jobs ran as one call, the rejection's own as another
+        self.assertEqual([len(call.args[0]) for call in apply.call_args_list], [3, 1])
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(Application.objects.get(pk=app_ids[1]).status, "rejected")
+        self.assertEqual(Project.objects.get(pk=theirs.pk).seats_available, 2)
+
+        # (the projects were created directly, so only application counters are tracked)
+        fields = [name for name in DashboardCounterTests.COUNTER_FIELDS if name.startswith("applications_")]
+        snapshot = lambda: (  # noqa: E731
+            list(DashboardCounter.objects.order_by("scope", "key").values_list(*fields)),
+            list(Project.objects.order_by("pk").values_list("applications_count", "selected_count")),
+        )
+        queued = snapshot()
+        rebuild_counters()
+        self.assertEqual(queued, snapshot())
+
+    def test_rebuild_drops_queued_counter_jobs(self):
+        project = self.approved_project(self.owner, "Mine")
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        self.client.post("/api/applications/", {"project": project.pk}, format="json")
+        self.assertEqual(Job.objects.filter(kind="counters.applications").count(), 1)
+
+        # The rebuild counts the application; its queued delta must not be applied on top
+        rebuild_counters()
+        self.assertFalse(Job.objects.exists())
+        self.run_jobs()
+        project.refresh_from_db()
+        self.assertEqual(project.applications_count, 1)
+        self.assertEqual(DashboardCounter.objects.get(scope="faculty", key=str(self.owner.pk)).applications_total, 1)
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2)
+    def test_failing_job_is_retried_then_kept(self):
+        jobs.enqueue("counters.projects", {"changes": [[self.owner.pk, "CSE", None, "pending"]]})
+        bad = jobs.enqueue("counters.projects", {"changes": [["not", "a", "change"]]})
+
+        # The good payload is applied even though the batch was coalesced with the bad one
+        with self.assertLogs("core.jobs", "WARNING"):
+            self.assertEqual(jobs.run_batch(), (1, 1))
+        self.assertEqual(DashboardCounter.objects.get(scope="faculty", key=str(self.owner.pk)).projects_pending, 1)
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts), (Job.QUEUED, 1))
+        self.assertIn("ValueError", bad.last_error)
+        self.assertEqual(jobs.run_batch(), (0, 0))   # backing off
+
+        Job.objects.filter(pk=bad.pk).update(run_after=bad.created_at)
+        with self.assertLogs("core.jobs", "WARNING"):
+            self.assertEqual(jobs.run_batch(), (0, 1))
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts), (Job.FAILED, 2))
+
+        self.assertEqual(jobs.retry_failed(), 1)
+        self.assertEqual(Job.objects.get(pk=bad.pk).status, Job.QUEUED)
+
+
+# Primary and replica are two SQLite files (test_db.sqlite3 / test_db_replica.sqlite3);
+# the replication simulator copies one into the other when the test says so.
+@override_settings(REPLICA_READS=True, THROTTLE_ENABLED=False)
+class ReadReplicaTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        clear_role_cache()
+        cache.clear()
+        self.faculty = make_faculty("prof")
+        self.student = make_student("stud")
+        self.project = Project.objects.create(
+            faculty=self.faculty, title="Old", abstract="A", seats=2, seats_available=2,
+            status="approved", is_approved=True,
+        )
+        replicas.replicate()
+
+    def client_for(self, profile):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=bearer(profile))
+        return client
+
+    def test_reads_lag_until_replicated(self):
+        client = self.client_for(self.student)
+        late = Project.objects.create(
+            faculty=self.faculty, title="Late", abstract="A", seats=2, seats_available=2,
+            status="approved", is_approved=True,
+        )
+        catalogue = lambda: {row["id"] for row in client.get("/api/projects/").json()["results"]}  # noqa: E731
+        self.assertEqual(catalogue(), {self.project.pk})
+        self.assertEqual(client.get(f"/api/projects/{late.pk}/").status_code, 404)
+
+        replicas.replicate()
+        # Pages cached from the replica live REPLICA_PIN_SECONDS; once gone the replica's data shows
+        self.assertEqual(catalogue(), {self.project.pk})
+        cache.clear()
+        self.assertEqual(catalogue(), {self.project.pk, late.pk})
+        self.assertEqual(client.get(f"/api/projects/{late.pk}/").status_code, 200)
+
+    def test_read_your_writes(self):
+        faculty = self.client_for(self.faculty)
+        response = faculty.post("/api/projects/", {"title": "New", "abstract": "A", "seats": 1}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        mine = lambda: {row["id"] for row in faculty.get("/api/projects/my/").json()}  # noqa: E731
+        # The writer is pinned to the primary; everyone else reads the replica
+        self.assertIn(response.data["id"], mine())
+        other = self.client_for(make_faculty("other"))
+        self.assertNotIn(response.data["id"], {row["id"] for row in other.get("/api/projects/").json()["results"]})
+
+        student = self.client_for(self.student)
+        self.assertEqual(student.post("/api/applications/", {"project": self.project.pk}, format="json").status_code, 201)
+        self.assertEqual(len(student.get("/api/applications/my/").json()), 1)
+
+        # Pins expired: back on the replica until it catches up
+        cache.clear()
+        self.assertNotIn(response.data["id"], mine())
+        self.assertEqual(student.get("/api/applications/my/").json(), [])
+        replicas.replicate()
+        self.assertIn(response.data["id"], mine())
+        self.assertEqual(len(student.get("/api/applications/my/").json()), 1)
+
+    @override_settings(REPLICA_READS=False)
+    def test_disabled(self):
+        Project.objects.filter(pk=self.project.pk).update(title="Renamed")
+        client = self.client_for(self.student)
+        self.assertEqual(client.get(f"/api/projects/{self.project.pk}/").json()["title"], "Renamed")
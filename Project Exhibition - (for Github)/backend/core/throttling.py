@@ -0,0 +1,173 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+
+# Rate limiting and admission control for the application-window burst.
+#
+# Token buckets: a bucket holds up to N tokens and refills at N per period
+# ("10/min"); a request takes one token or is refused with 429 and a
+# Retry-After of the time until the next token. Buckets are per user (per IP
+# when anonymous) for every scope in THROTTLE_RATES, and shared by all users
+# for THROTTLE_ENDPOINT_RATES. DRF views use TokenBucketThrottle (the 'user'
+# scope plus the view's throttle_scope); the async views take their tokens in
+# core/async_views.read_endpoint.
+#
+# The buckets live in a process-local store shared by all threads: a dict
+# under one lock, no cache round-trip per request. With several worker
+# processes every process has its own buckets, so the effective limits are
+# multiplied by the number of workers.
+#
+# Admission control: at most ADMISSION_MAX_CONCURRENT requests of a gate
+# (application create) run at once; up to ADMISSION_QUEUE_SIZE more wait for
+# a slot, at most ADMISSION_MAX_WAIT seconds. Anything beyond is answered 503
+# with Retry-After straight away. Against SQLite's single writer, a few
+# admitted writers get through faster than dozens of threads queueing on the
+# database lock until busy_timeout.
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (capacity 10, refill 10/60 tokens per second); None -> None."""
+    if rate is None:
+        return None
+    count, period = rate.split('/')
+    return int(count), int(count) / PERIODS[period[0]]
+
+
+class BucketStore:
+    """Token buckets keyed by (scope, ident): {key: (tokens, updated_at, capacity, refill)}."""
+
+    PRUNE_EVERY = 10000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.prune_at = self.PRUNE_EVERY
+
+    def take(self, key, capacity, refill):
+        """Take a token; returns 0 if granted, else the seconds until one is available."""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+                if len(self.buckets) >= self.prune_at:
+                    self._prune(now)
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill)
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now, capacity, refill)
+                return 0
+            self.buckets[key] = (tokens, now, capacity, refill)
+            return (1 - tokens) / refill
+
+    def _prune(self, now):
+        # Buckets idle long enough to be full again: forgetting them changes nothing
+        self.buckets = {
+            key: bucket for key, bucket in self.buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[3] < bucket[2]
+        }
+        self.prune_at = len(self.buckets) + self.PRUNE_EVERY
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+store = BucketStore()
+
+
+def take(scope, ident):
+    """Take a token of `scope` for `ident` (and of the scope's shared bucket); returns the wait, 0 if granted."""
+    if not settings.THROTTLE_ENABLED:
+        return 0
+    wait = 0
+    per_user = parse_rate(settings.THROTTLE_RATES.get(scope))
+    if per_user is not None:
+        wait = store.take((scope, ident), *per_user)
+    shared = parse_rate(settings.THROTTLE_ENDPOINT_RATES.get(scope))
+    if shared is not None and not wait:
+        wait = store.take((scope, None), *shared)
+    return wait
+
+
+def retry_after(wait):
+    return str(max(1, math.ceil(wait)))
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """The 'user' bucket on every DRF request, plus the view's `throttle_scope` bucket if it has one."""
+
+    def allow_request(self, request, view):
+        ident = request.user.pk if request.user and request.user.is_authenticated else self.get_ident(request)
+        self.wait_seconds = 0
+        for scope in ('user', getattr(view, 'throttle_scope', None)):
+            if scope is not None:
+                self.wait_seconds = take(scope, ident)
+                if self.wait_seconds:
+                    return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+# ---- Admission control ----
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy, retry shortly.'
+    default_code = 'overloaded'
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait   # DRF's exception handler turns it into Retry-After
+
+
+class AdmissionGate:
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.running = 0
+        self.waiting = 0
+        self.slot_freed = threading.Condition(self.lock)
+
+    @contextmanager
+    def admit(self):
+        """Run the block once a slot is free; raises Overloaded if the queue is full or the wait too long."""
+        if not settings.ADMISSION_CONTROL:
+            yield
+            return
+        with self.lock:
+            if self.running >= settings.ADMISSION_MAX_CONCURRENT:
+                if self.waiting >= settings.ADMISSION_QUEUE_SIZE:
+                    raise Overloaded(settings.ADMISSION_MAX_WAIT)
+                self.waiting += 1
+                try:
+                    deadline = time.monotonic() + settings.ADMISSION_MAX_WAIT
+                    while self.running >= settings.ADMISSION_MAX_CONCURRENT:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise Overloaded(settings.ADMISSION_MAX_WAIT)
+                        self.slot_freed.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.running += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.slot_freed.notify()
+
+
+# POST /api/applications/ (ApplicationViewSet.create)
+apply_gate = AdmissionGate('apply')
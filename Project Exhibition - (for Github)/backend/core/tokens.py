@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenGeneration
+from .roles import role_of
+
+
+# Token-user mode for JWT requests (settings.JWT_TOKEN_USER).
+#
+# Access tokens carry everything a read needs to know about the user: id,
+# username, staff flags, role, profile ids, department, committee approval,
+# plus `gen`, the user's token generation (core.models.TokenGeneration) at
+# issue time. Role, committee approval and account changes bump the
+# generation (core/signals.py), which makes the claims of older tokens stale.
+#
+# A read (GET/HEAD/OPTIONS) whose token is current is served with a TokenUser
+# built from the claims: no User row, no role lookup. Writes, stale tokens and
+# tokens without `gen` load the User row (and the role) from the database as
+# before. The current generation is read through the cache (one query per
+# user per TOKEN_GENERATION_TTL seconds); an inactive or deleted user has
+# none, so their tokens are never current. A bump deletes the cached entry, so
+# with a per-process cache (locmem) other processes notice it within the TTL,
+# as with the role cache. A refresh stamps fresh claims.
+
+NO_USER = -1
+
+
+def _key(user_id):
+    return f'token:gen:{user_id}'
+
+
+def _ttl():
+    return getattr(settings, 'TOKEN_GENERATION_TTL', 300)
+
+
+def _generation_query(user_id):
+    # One row (NULL if the user never got a token) for an active user, none otherwise; from the primary
+    return User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id, is_active=True).values_list('token_generation__generation', flat=True)[:1]
+
+
+def _generation(rows):
+    return NO_USER if not rows else rows[0] or 0
+
+
+def current_generation(user_id):
+    generation = cache.get(_key(user_id))
+    if generation is None:
+        generation = _generation(list(_generation_query(user_id)))
+        cache.set(_key(user_id), generation, _ttl())
+    return generation
+
+
+async def acurrent_generation(user_id):
+    generation = await cache.aget(_key(user_id))
+    if generation is None:
+        generation = _generation([row async for row in _generation_query(user_id)])
+        await cache.aset(_key(user_id), generation, _ttl())
+    return generation
+
+
+def bump_generation(user_id):
+    """Make the claims of the user's tokens stale (once the transaction commits)."""
+    # Users without a row never got a token with claims: nothing to invalidate
+    TokenGeneration.objects.filter(user_id=user_id).update(generation=F('generation') + 1)
+    transaction.on_commit(lambda: cache.delete(_key(user_id)))
+
+
+def is_current(token):
+    """Whether the claims of a validated access token are current; remembered on the token."""
+    current = getattr(token, 'current', None)
+    if current is None:
+        # Tokens without a generation (plain AccessToken.for_user) cost no lookup
+        current = token.current = (
+            token.get('gen') is not None
+            and token['gen'] == current_generation(token[jwt_settings.USER_ID_CLAIM])
+        )
+    return current
+
+
+async def ais_current(token):
+    current = getattr(token, 'current', None)
+    if current is None:
+        current = token.current = (
+            token.get('gen') is not None
+            and token['gen'] == await acurrent_generation(token[jwt_settings.USER_ID_CLAIM])
+        )
+    return current
+
+
+def claims(user_id):
+    """The claims of a new access token for a user, read from the database."""
+    user = User.objects.select_related('student', 'faculty', 'committee_profile', 'token_generation').get(pk=user_id)
+    generation = getattr(user, 'token_generation', None)
+    if generation is None:
+        generation, _ = TokenGeneration.objects.get_or_create(user=user)
+    return {
+        **role_of(user).claims(),
+        'username': user.username,
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+        'gen': generation.generation,
+    }
+
+
+def stamp(token, user_id):
+    for claim, value in claims(user_id).items():
+        token[claim] = value
+    return token
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens get fresh claims instead of copies of its own."""
+
+    @property
+    def access_token(self):
+        return stamp(super().access_token, self[jwt_settings.USER_ID_CLAIM])
+
+
+class TokenUserAuthentication(JWTAuthentication):
+    """JWTAuthentication serving reads with a current token from a TokenUser, without a User query."""
+
+    def authenticate(self, request):
+        self.read_only = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        current = is_current(validated_token)   # also decides whether get_role trusts the claims
+        if current and self.read_only and settings.JWT_TOKEN_USER:
+            return jwt_settings.TOKEN_USER_CLASS(validated_token)
+        return super().get_user(validated_token)
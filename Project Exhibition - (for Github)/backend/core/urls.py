@@ -1,6 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import FacultyViewSet, StudentViewSet, ProjectViewSet, ApplicationViewSet, signup, CommitteeViewSet
+from .views import (
+    FacultyViewSet, StudentViewSet, ProjectViewSet, ApplicationViewSet, signup, me, allocate,
+    bulk_import, bulk_export, analytics_report, CommitteeViewSet,
+)
+from . import async_views
+from .metrics import metrics_view
+from . import sse
 
 # Router will automatically generate API routes for us
 router = DefaultRouter()
@@ -12,6 +18,20 @@ router.register(r'committees', CommitteeViewSet, basename='committee')
 
 
 urlpatterns = [
+    # Hot read endpoints are async views (core/async_views.py); listed before the router so they win
+    path('projects/', async_views.projects_root, name='project-list'),
+    path('projects/pending_review/', async_views.pending_review, name='project-pending-review'),
+    path('applications/my/', async_views.my_applications, name='application-my'),
+    path('dashboard/', async_views.dashboard, name='dashboard'),
+    # Served by core.sse.EventStreamApp under ASGI; this route only answers 501 elsewhere
+    path('events/', sse.unavailable, name='events'),
+    path('events/ticket/', sse.ticket, name='events-ticket'),
     path('', include(router.urls)),
     path('signup/', signup, name='signup'),  # ✅ add this line
+    path('me/', me, name='me'),
+    path('allocation/', allocate, name='allocation'),
+    path('admin/import/<str:kind>/', bulk_import, name='bulk-import'),
+    path('admin/export/<str:kind>.<str:fmt>', bulk_export, name='bulk-export'),
+    path('admin/analytics/', analytics_report, name='analytics'),
+    path('_metrics', metrics_view, name='metrics'),
 ]
@@ -1,36 +1,46 @@
+import io
+
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Faculty, Student, Project, Application, Committee
-from .serializers import FacultySerializer, StudentSerializer, ProjectSerializer, ApplicationSerializer, CommitteeSerializer
+from .serializers import (
+    FacultySerializer, StudentSerializer, ProjectSerializer, ProjectSummarySerializer,
+    ApplicationSerializer, ApplicationListSerializer, CommitteeSerializer,
+    MeSerializer, load_me, requested_fields,
+    ReviewDecisionSerializer, ProjectTallySerializer,
+)
+from .pagination import ProjectCursorPagination, SearchPagination
+from .filters import ProjectCatalogueFilter
+from .replicas import ReplicaReadsMixin
+from .roles import get_role
+from .allocation import run_allocation
+from .counters import record_application_changes, record_project_change
+from .reviews import cast_votes, votes_needed
+from . import analytics, bulk, eligibility, events, jobs, passwords, response_cache, search as fulltext, throttling
 from django.contrib.auth.models import User
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
-from django.contrib.auth.hashers import make_password
-from django.db.models import Count
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 
-# Custom permission: only allow access based on user role
+# Custom permission: only allow access based on user role.
+# The role is resolved once per request (token claims / cache), see core/roles.py
 class IsFacultyUser(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user.is_authenticated:
             return False
-        try:
-            Faculty.objects.get(user=request.user)
-            return True
-        except Faculty.DoesNotExist:
-            return False
+        return get_role(request).is_faculty
 
 class IsStudentUser(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user.is_authenticated:
             return False
-        try:
-            Student.objects.get(user=request.user)
-            return True
-        except Student.DoesNotExist:
-            return False
+        return get_role(request).is_student
 
 # Faculty API
 class FacultyViewSet(viewsets.ModelViewSet):
@@ -54,242 +64,384 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.student.user == request.user
 
 # Project API
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ProjectCursorPagination
+    filter_backends = [ProjectCatalogueFilter]
+    # GETs may read from the replica (core/replicas.py)
+    replica_actions = ('list', 'retrieve', 'search', 'my')
+
+    def get_serializer_class(self):
+        # List-style endpoints use the compact summary (no committee M2M)
+        if self.action in ('list', 'my'):
+            return ProjectSummarySerializer
+        return ProjectSerializer
 
     def get_queryset(self):
-        queryset = Project.objects.annotate(applications_count=Count('applications'))
+        queryset = Project.objects.select_related('faculty__user')
         # Students can only see approved projects
-        if hasattr(self.request.user, 'student'):
+        if get_role(self.request).is_student:
             return queryset.filter(is_approved=True)
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        # Detail is served from the response cache (ETag / 304), see core/response_cache.py
+        scope = 'student' if get_role(request).is_student else 'all'
+        key = response_cache.project_key(
+            response_cache.get_version(), scope, kwargs['pk'], request.query_params.get('fields', '')
+        )
+        entry = response_cache.load(key)
+        if entry is None:
+            entry = response_cache.make_entry(self.get_serializer(self.get_object()).data)
+            response_cache.store(key, entry)
+        return response_cache.respond(request, entry)
+
     def perform_create(self, serializer):
-        try:
-            faculty = Faculty.objects.get(user=self.request.user)
-        except Faculty.DoesNotExist:
+        role = get_role(self.request)
+        if not role.is_faculty:
             raise ValidationError("Only faculty members can create projects.")
         
         seats = serializer.validated_data.get('seats', 1)
         # All new projects start as pending and not approved
-        serializer.save(
-            faculty=faculty, 
-            seats_available=seats,
-            status='pending',
-            is_approved=False
+        with transaction.atomic():
+            serializer.save(
+                faculty_id=role.faculty_id, 
+                department=role.department,
+                seats_available=seats,
+                status='pending',
+                is_approved=False
+            )
+            record_project_change(role.faculty_id, role.department, None, 'pending')
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # Applications are deleted by the cascade; take them out of the counters first
+            record_application_changes(
+                (instance.pk, app_status, None)
+                for app_status in instance.applications.values_list('status', flat=True)
+            )
+            record_project_change(instance.faculty_id, instance.department, instance.status, None)
+            instance.delete()
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Ranked full-text search: ?q=robot vis (every word, as a prefix) plus the catalogue filters."""
+        words = fulltext.terms(request.query_params.get('q', ''))
+        if not words:
+            return Response({"error": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if not fulltext.supported():
+            return Response({"error": "Full-text search is not available on this database."},
+                            status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        scope = 'student' if get_role(request).is_student else 'all'
+        key = response_cache.catalogue_key(
+            response_cache.get_version(), f'search:{scope}', request.get_host(), request.query_params
         )
+        entry = response_cache.load(key)
+        if entry is None:
+            # Catalogue filters narrow the ranked query; the ranking itself runs in the index
+            queryset = ProjectCatalogueFilter.apply(self.get_queryset(), request.query_params)
+            paginator = SearchPagination()
+            hits = paginator.paginate(request, lambda limit, offset: fulltext.search(queryset, words, limit, offset))
+            projects = Project.objects.select_related('faculty__user').in_bulk([hit[0] for hit in hits])
+            hits = [hit for hit in hits if hit[0] in projects]   # drop rows deleted since the index was read
+            results = ProjectSummarySerializer(
+                [projects[hit[0]] for hit in hits], many=True, context={'request': request}
+            ).data
+            wanted = requested_fields(request)
+            for row, (_, score, title, abstract) in zip(results, hits):
+                if wanted is None or 'rank' in wanted:
+                    row['rank'] = round(score, 4)
+                if wanted is None or 'highlight' in wanted:
+                    row['highlight'] = {'title': title, 'abstract': abstract}
+            entry = response_cache.make_entry(paginator.get_paginated_data(results))
+            response_cache.store(key, entry)
+        return response_cache.respond(request, entry)
 
     @action(detail=False, methods=['get'], permission_classes=[IsFacultyUser])
     def my(self, request):
         """Return projects created by the currently logged-in faculty."""
-        try:
-            faculty = Faculty.objects.get(user=request.user)
-            faculty_projects = Project.objects.filter(faculty=faculty).annotate(
-                applications_count=Count('applications')
-            )
-            serializer = self.get_serializer(faculty_projects, many=True)
-            return Response(serializer.data)
-        except Faculty.DoesNotExist:
-            return Response({"error": "Faculty profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        faculty_projects = Project.objects.filter(faculty_id=get_role(request).faculty_id).select_related(
+            'faculty__user'
+        )
+        serializer = self.get_serializer(faculty_projects, many=True)
+        return Response(serializer.data)
 
-    @action(detail=False, methods=['get'], permission_classes=[IsFacultyUser])
-    def pending_review(self, request):
-        """Return projects pending review for committee members."""
-        try:
-            # Check if user is a committee member
-            if not hasattr(request.user, 'committee_profile'):
-                return Response({"error": "Only committee members can review projects."}, 
-                              status=status.HTTP_403_FORBIDDEN)
-            
-            committee_profile = request.user.committee_profile
-            if not committee_profile.approved_by_admin:
-                return Response({"error": "Only approved committee members can review projects."}, 
-                              status=status.HTTP_403_FORBIDDEN)
-            
-            # Get faculty profile to determine department
-            try:
-                faculty = Faculty.objects.get(user=request.user)
-            except Faculty.DoesNotExist:
-                return Response({"error": "Committee member must also have faculty profile"}, 
-                              status=status.HTTP_400_BAD_REQUEST)
-            
-            # Get projects from same department that are pending (exclude own projects)
-            pending_projects = Project.objects.filter(
-                faculty__department=faculty.department,
-                status='pending',
-                is_approved=False
-            ).exclude(faculty=faculty).select_related('faculty__user')
-            
-            # Add faculty name to the serialized data
-            projects_data = []
-            for project in pending_projects:
-                project_data = self.get_serializer(project).data
-                project_data['faculty_name'] = f"{project.faculty.user.first_name} {project.faculty.user.last_name}".strip() or project.faculty.user.username
-                projects_data.append(project_data)
-            
-            return Response(projects_data)
-            
-        except Exception as e:
-            return Response({"error": f"Error fetching pending projects: {str(e)}"}, 
-                          status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    def vote(self, request, decision, verb):
+        """Record the committee member's vote on one project (approve / reject actions)."""
+        project = self.get_object()
+        role = get_role(request)
+
+        # Check if user is committee member
+        if not role.is_committee:
+            return Response({"error": f"Only approved committee members can {verb} projects."},
+                            status=status.HTTP_403_FORBIDDEN)
+        
+        # Check if it's same department
+        if project.department != role.department:
+            return Response({"error": "You can only review projects from your department."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        comment = request.data.get("comment", "")
+        projects, errors = cast_votes(role, [(project.pk, decision, comment)])
+        if errors:
+            return Response({"error": errors[0].message}, status=status.HTTP_400_BAD_REQUEST)
+
+        project = projects[0]
+        if project.status == "pending":
+            message = f"Vote recorded for '{project.title}' ({votes_needed()} votes decide)."
+        else:
+            message = f"Project '{project.title}' {project.status} successfully!"
+        return Response({"message": message, **ProjectTallySerializer(project).data})
 
     @action(detail=True, methods=["post"], permission_classes=[IsFacultyUser])
     def approve(self, request, pk=None):
-        project = self.get_object()
-        try:
-            # Check if user is committee member
-            if not hasattr(request.user, "committee_profile") or not request.user.committee_profile.approved_by_admin:
-                return Response({"error": "Only approved committee members can approve projects."},
-                                status=status.HTTP_403_FORBIDDEN)
-            
-            # Get faculty profile to check department
-            faculty = Faculty.objects.get(user=request.user)
-            
-            # Check if it's same department
-            if project.faculty.department != faculty.department:
-                return Response({"error": "You can only review projects from your department."},
-                                status=status.HTTP_403_FORBIDDEN)
-
-            project.status = "approved"
-            project.is_approved = True
-            project.is_discarded = False
-            project.save()
-            return Response({"message": f"Project '{project.title}' approved successfully!"})
-        except Faculty.DoesNotExist:
-            return Response({"error": "Faculty profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return self.vote(request, "approve", "approve")
 
     @action(detail=True, methods=["post"], permission_classes=[IsFacultyUser])
     def reject(self, request, pk=None):
-        project = self.get_object()
-        try:
-            # Check if user is committee member
-            if not hasattr(request.user, "committee_profile") or not request.user.committee_profile.approved_by_admin:
-                return Response({"error": "Only approved committee members can reject projects."},
-                                status=status.HTTP_403_FORBIDDEN)
-            
-            # Get faculty profile to check department
-            faculty = Faculty.objects.get(user=request.user)
-            
-            # Check if it's same department
-            if project.faculty.department != faculty.department:
-                return Response({"error": "You can only review projects from your department."},
-                                status=status.HTTP_403_FORBIDDEN)
-
-            project.status = "rejected"
-            project.is_approved = False
-            project.is_discarded = True
-            project.save()
-            return Response({"message": f"Project '{project.title}' rejected successfully!"})
-        except Faculty.DoesNotExist:
-            return Response({"error": "Faculty profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return self.vote(request, "disapprove", "reject")
+
+    @action(detail=False, methods=["post"], permission_classes=[IsFacultyUser])
+    def review(self, request):
+        """Bulk review: {"reviews": [{"project": id, "decision": "approve"|"disapprove", "comment": ""}, ...]}"""
+        role = get_role(request)
+        if not role.is_committee:
+            return Response({"error": "Only approved committee members can review projects."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        if not isinstance(request.data, dict):
+            return Response({"error": 'Send {"reviews": [...]}.'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ReviewDecisionSerializer(data=request.data.get("reviews"), many=True, max_length=100)
+        serializer.is_valid(raise_exception=True)
+        projects, errors = cast_votes(
+            role, [(item["project"], item["decision"], item["comment"]) for item in serializer.validated_data]
+        )
+        return Response({
+            "results": ProjectTallySerializer(projects, many=True).data,
+            "errors": [{"project": error.project_id, "error": error.message} for error in errors],
+        })
 
 # Application API
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_actions = ('faculty_applications',)   # applications/my/ is async_views.my_applications
+
+    def get_serializer_class(self):
+        # List-style endpoints embed project title / faculty / student names
+        if self.action in ('list', 'faculty_applications'):
+            return ApplicationListSerializer
+        return ApplicationSerializer
+
+    def get_queryset(self):
+        return Application.objects.select_related('project__faculty__user', 'student__user')
+
+    @property
+    def throttle_scope(self):
+        # Applying has its own token buckets (per student and for everyone), see core/throttling.py
+        return 'apply' if self.action == 'create' else None
+
+    def create(self, request, *args, **kwargs):
+        # Bounded number of concurrent applies; the overflow waits briefly or gets 503 + Retry-After
+        with throttling.apply_gate.admit():
+            return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         """Students can apply to projects."""
-        try:
-            student = Student.objects.get(user=self.request.user)
-        except Student.DoesNotExist:
+        role = get_role(self.request)
+        if not role.is_student:
             raise ValidationError("Only students can apply to projects.")
-        
-        # Check application limit
-        if Application.objects.filter(student=student).count() >= 3:
-            raise ValidationError("You cannot apply to more than 3 projects.")
-        
+        student_id = role.student_id
         project = serializer.validated_data.get('project')
-        
-        # Check for duplicate applications
-        if Application.objects.filter(student=student, project=project).exists():
-            raise ValidationError("You have already applied to this project.")
 
-        # Check if project has available seats
-        if project.seats_available <= 0:
-            raise ValidationError("No seats available for this project.")
+        # Checks and writes run in one transaction. Locking the student row
+        # serialises concurrent applies by the same student (limit/duplicate
+        # checks); the seat is reserved with a conditional UPDATE so concurrent
+        # applies to the same project can never over-book it.
+        try:
+            with transaction.atomic():
+                Student.objects.select_for_update().filter(pk=student_id).first()
 
-        # Check if project is approved
-        if not project.is_approved:
-            raise ValidationError("This project is not yet approved for applications.")
+                # Limit, duplicate, approval and seats in one query (the catalogue's eligibility flags)
+                flags = eligibility.check(student_id, [project.pk]).get(project.pk)
+                if flags is None:
+                    raise ValidationError("This project no longer exists.")
+                if flags.refusal:
+                    raise ValidationError(flags.refusal)
 
-        # Create the application
-        application = serializer.save(student=student)
-        
-        # Decrease available seats
-        if project.seats_available > 0:
-            project.seats_available -= 1
-            project.save()
+                # Reserve a seat: UPDATE ... WHERE is_approved AND seats_available > 0
+                reserved = Project.objects.filter(
+                    pk=project.pk, is_approved=True, seats_available__gt=0
+                ).update(seats_available=F('seats_available') - 1)
+                if not reserved:
+                    # Taken since the check by a concurrent apply
+                    raise ValidationError("No seats available for this project.")
 
-    @action(detail=False, methods=["get"], permission_classes=[IsStudentUser])
-    def my(self, request):
-        """Return applications submitted by the logged-in student."""
-        try:
-            student = Student.objects.get(user=request.user)
-            apps = Application.objects.filter(student=student)
-            serializer = self.get_serializer(apps, many=True)
-            return Response(serializer.data)
-        except Student.DoesNotExist:
-            return Response({"error": "Student profile not found"}, status=status.HTTP_404_NOT_FOUND)
+                # Create the application
+                serializer.save(student_id=student_id)
+                record_application_changes([(project.pk, None, 'pending')])
+        except IntegrityError:
+            raise ValidationError("You have already applied to this project.")
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            # A withdrawn application gives its reserved seat back
+            if instance.status != 'rejected':
+                Project.objects.filter(pk=instance.project_id).update(
+                    seats_available=F('seats_available') + 1
+                )
+            record_application_changes([(instance.project_id, instance.status, None)])
 
     @action(detail=False, methods=["get"], permission_classes=[IsFacultyUser])
     def faculty_applications(self, request):
         """Return all applications for projects created by the logged-in faculty."""
-        try:
-            faculty = Faculty.objects.get(user=request.user)
-            apps = Application.objects.filter(project__faculty=faculty)
-            serializer = self.get_serializer(apps, many=True)
-            return Response(serializer.data)
-        except Faculty.DoesNotExist:
-            return Response({"error": "Faculty profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        apps = self.get_queryset().filter(project__faculty_id=get_role(request).faculty_id)
+        serializer = self.get_serializer(apps, many=True)
+        return Response(serializer.data)
 
     @action(detail=True, methods=["post"], permission_classes=[IsFacultyUser])
     def select(self, request, pk=None):
         """Faculty selects a student for their project."""
         app = self.get_object()
-        try:
-            faculty = Faculty.objects.get(user=request.user)
-            if app.project.faculty != faculty:
-                return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
-            
+        if app.project.faculty_id != get_role(request).faculty_id:
+            return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
+        
+        with transaction.atomic():
+            # Lock the student so two faculty cannot select them concurrently
+            Student.objects.select_for_update().filter(pk=app.student_id).first()
+            # Branch on the status as it is now, not as get_object() read it:
+            # a reject committed in between has already released the seat
+            app = Application.objects.select_for_update().get(pk=app.pk)
+
             # Check if student is already selected for another project
-            if Application.objects.filter(student=app.student, status='selected').exists():
+            if Application.objects.filter(student_id=app.student_id, status='selected').exists():
                 return Response({"error": "Student is already selected for another project"}, 
                               status=status.HTTP_400_BAD_REQUEST)
-            
+
+            if app.status == 'rejected':
+                # The seat was released on rejection, take it back
+                reserved = Project.objects.filter(
+                    pk=app.project_id, seats_available__gt=0
+                ).update(seats_available=F('seats_available') - 1)
+                if not reserved:
+                    return Response({"error": "No seats available for this project."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+
+            old_status = app.status
             app.status = "selected"
-            app.save()
-            
-            # Reject all other applications for this student
-            Application.objects.filter(student=app.student).exclude(id=app.id).update(status='rejected')
-            
-            return Response(self.get_serializer(app).data)
-        except Faculty.DoesNotExist:
-            return Response({"error": "Faculty profile not found"}, status=status.HTTP_404_NOT_FOUND)
+            app.save(update_fields=['status'])
+
+            record_application_changes([(app.project_id, old_status, 'selected')])
+            # Rejecting the student's other applications (and releasing their
+            # seats) is a background job, see core/selection.py
+            jobs.enqueue('applications.reject_others', {'student': app.student_id, 'selected': app.pk})
+        
+        return Response(self.get_serializer(app).data)
 
     @action(detail=True, methods=["post"], permission_classes=[IsFacultyUser])
     def reject(self, request, pk=None):
         """Faculty rejects an application."""
         app = self.get_object()
-        try:
-            faculty = Faculty.objects.get(user=request.user)
-            if app.project.faculty != faculty:
-                return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
-            
-            app.status = "rejected"
-            app.save()
-            
-            # Increase seats_available when rejecting
-            project = app.project
-            project.seats_available += 1
-            project.save()
-            
-            return Response(self.get_serializer(app).data)
-        except Faculty.DoesNotExist:
-            return Response({"error": "Faculty profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        if app.project.faculty_id != get_role(request).faculty_id:
+            return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
+        
+        with transaction.atomic():
+            # Lock the row and replace its current status: a concurrent select /
+            # reject may have changed it since get_object(). Only the request
+            # that actually flips the status releases the seat
+            old_status = Application.objects.select_for_update().values_list('status', flat=True).get(pk=app.pk)
+            if old_status != 'rejected':
+                Application.objects.filter(pk=app.pk).update(status='rejected')
+
+                # Increase seats_available when rejecting
+                Project.objects.filter(pk=app.project_id).update(
+                    seats_available=F('seats_available') + 1
+                )
+                record_application_changes([(app.project_id, old_status, 'rejected')])
+                events.publish(*events.application_status(app.pk, app.student_id, app.project_id, 'rejected'))
+        
+        app.refresh_from_db()
+        return Response(self.get_serializer(app).data)
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def me(request):
+    """Return the logged-in user with role, student/faculty profile and committee status."""
+    return Response(MeSerializer(load_me(request.user.pk)).data)
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def allocate(request):
+    """Run the batch stable allocation. Dry run (diff only) unless {"commit": true}."""
+    commit = str(request.data.get("commit", "")).lower() in ("1", "true", "yes")
+    result = run_allocation(commit=commit)
+    summary = result.summary()
+    summary["changes"] = [
+        {"application": app_id, "from": old, "to": new}
+        for app_id, old, new in result.changes[:500]
+    ]
+    return Response(summary)
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def bulk_import(request, kind):
+    """Import a CSV/JSONL upload ("file") of students, faculty or projects; see core/bulk.py."""
+    if kind not in bulk.IMPORTERS:
+        return Response({"error": f"Unknown import '{kind}'."}, status=status.HTTP_404_NOT_FOUND)
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"error": "Upload the rows as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+
+    fmt = request.data.get("format") or bulk.detect_format(upload.name)
+    if fmt not in bulk.FORMATS:
+        return Response({"error": f"Unknown format '{fmt}', use one of: {', '.join(bulk.FORMATS)}."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    # A decoding error halfway through would leave the earlier batches imported
+    if not bulk.is_utf8(upload):
+        return Response({"error": "The file is not UTF-8 encoded."}, status=status.HTTP_400_BAD_REQUEST)
+    dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes")
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    result = bulk.import_rows(kind, bulk.read_rows(stream, fmt), dry_run=dry_run)
+    return Response(result.summary())
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def bulk_export(request, kind, fmt):
+    """Stream applications / allocation results as CSV or JSONL without loading the table."""
+    if kind not in bulk.EXPORTS or fmt not in bulk.FORMATS:
+        return Response({"error": f"Unknown export '{kind}.{fmt}'."}, status=status.HTTP_404_NOT_FOUND)
+    content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    # Under ASGI Django buffers a sync iterator whole; an async one streams (and is compressed chunk by chunk)
+    lines = bulk.aexport_lines(kind, fmt) if isinstance(request._request, ASGIRequest) else bulk.export_lines(kind, fmt)
+    return StreamingHttpResponse(
+        lines,
+        content_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{fmt}"'},
+    )
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def analytics_report(request):
+    """Demand, CGPA and priority analytics over applications; ?department= narrows, ?limit= projects (default 100)."""
+    try:
+        limit = min(max(int(request.query_params.get("limit", 100)), 0), 1000)
+    except ValueError:
+        return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+    department = request.query_params.get("department", "")
+    # Cached until the next Application / Project write bumps the version (core/response_cache.py)
+    key = response_cache.catalogue_key(
+        response_cache.get_version(), "analytics", "", {"department": department, "limit": limit}
+    )
+    entry = response_cache.load(key)
+    if entry is None:
+        entry = response_cache.make_entry(analytics.report(department=department, limit=limit))
+        response_cache.store(key, entry)
+    return response_cache.respond(request, entry)
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -309,7 +461,7 @@ def signup(request):
 
     user = User.objects.create(
         username=username,
-        password=make_password(password)
+        password=passwords.hash_password(password)
     )
 
     if role == "student":
@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exhibition_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# /api/events/ (server-sent events) is served in front of Django, see core/sse.py
+from core.sse import EventStreamApp  # noqa: E402  (needs the apps loaded above)
+
+application = EventStreamApp(django_application)
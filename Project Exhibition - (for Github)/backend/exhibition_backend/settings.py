@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -45,6 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole middleware stack
+    'core.metrics.MetricsMiddleware',
+    # Before anything that reads or changes the body; metrics see the compressed size
+    'core.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -53,6 +58,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # After authentication: pins writers to the primary (read replica, core/replicas.py)
+    'core.replicas.PinMiddleware',
 ]
 
 ROOT_URLCONF = 'exhibition_backend.urls'
@@ -78,13 +85,193 @@ WSGI_APPLICATION = 'exhibition_backend.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# Selected with DB_ENGINE:
+#   sqlite   (default) local file, tuned with the pragmas in SQLITE_PRAGMAS
+#   postgres production: DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT,
+#            DB_POOL=true for psycopg connection pooling (DB_POOL_MIN_SIZE /
+#            DB_POOL_MAX_SIZE), otherwise persistent connections kept for
+#            DB_CONN_MAX_AGE seconds with health checks
+#
+# Read replica (alias 'replica', used with REPLICA_READS=true, see
+# core/replicas.py): on postgres a hot standby at DB_REPLICA_HOST
+# (DB_REPLICA_PORT, same name and credentials); on sqlite a second file,
+# DB_REPLICA_NAME, filled by `manage.py simulate_replication`.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.environ.get('DB_POOL', 'false').lower() in ('1', 'true', 'yes')
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'exhibition'),
+            'USER': os.environ.get('DB_USER', 'exhibition'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # A pool and persistent connections are mutually exclusive in Django
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '20')),
+                    'timeout': 10,
+                },
+            } if DB_POOL else {},
+        }
+    }
+    if os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': os.environ['DB_REPLICA_HOST'],
+            'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+            # Tests run against the primary only
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # SQLite has no SELECT ... FOR UPDATE: take the write lock when an
+                # atomic block starts so concurrent applies queue instead of failing
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+            'TEST': {
+                # File-backed test database so threaded concurrency tests hit real locking
+                'NAME': BASE_DIR / 'test_db.sqlite3',
+            },
+        }
+    }
+    # Only opened when reads are routed to it (or by tests that ask for it)
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DB_REPLICA_NAME', BASE_DIR / 'db_replica.sqlite3'),
+        'TEST': {'NAME': BASE_DIR / 'test_db_replica.sqlite3'},
+    }
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+# Serve the catalogue / dashboard reads from the 'replica' database. A user who
+# has just written reads from the primary for REPLICA_PIN_SECONDS, which should
+# exceed the replication lag.
+REPLICA_READS = os.environ.get('REPLICA_READS', 'false').lower() in ('1', 'true', 'yes')
+REPLICA_PIN_SECONDS = float(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# Applied to every new SQLite connection (core/db.py). WAL lets readers run
+# alongside the single writer; set SQLITE_TUNED=false to benchmark the defaults.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,          # KiB
+    'temp_store': 'MEMORY',
+} if os.environ.get('SQLITE_TUNED', 'true').lower() in ('1', 'true', 'yes') else {}
+
+
+# Cache (catalogue pages / project detail, see core/response_cache.py)
+# CACHE_BACKEND=locmem (default, per process - dev only), file or redis.
+# With several worker processes use file or redis so they share the version counter.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    # Needs the redis package
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'exhibition',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Seconds a cached catalogue page / project detail is kept. Entries are keyed
+# on a version counter bumped by every Project/Application write, so this only
+# bounds memory, never staleness.
+CATALOGUE_CACHE_TTL = 600
+
+
+# Request metrics (core/metrics.py), scraped from /api/_metrics by Prometheus.
+# The endpoint answers METRICS_ALLOWED_IPS and logged-in staff users.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+# Log requests slower than this (with their SQL) to the "core.metrics" logger; 0 disables
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 0))
+
+
+# Server-sent events (/api/events/, core/events.py; ASGI only).
+# Open streams per worker process; further clients get 503 and retry later
+EVENTS_MAX_CONNECTIONS = int(os.environ.get('EVENTS_MAX_CONNECTIONS', 10000))
+# A comment line is sent on idle streams this often so proxies keep them open
+EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 20))
+# Lifetime of a stream ticket (POST /api/events/ticket/): it only has to outlive the connect
+EVENTS_TICKET_SECONDS = 30
+# Events buffered per stream; a client that falls this far behind is disconnected
+EVENTS_QUEUE_SIZE = 100
+
+
+# Background jobs (core/jobs.py): follow-ups of selections and counter updates.
+# JOBS_EAGER=true (default) runs them inside the request, no worker needed;
+# set it to false in production and run `manage.py run_jobs`.
+JOBS_EAGER = os.environ.get('JOBS_EAGER', 'true').lower() in ('1', 'true', 'yes')
+# Jobs claimed (and coalesced) per worker transaction
+JOBS_BATCH_SIZE = int(os.environ.get('JOBS_BATCH_SIZE', 500))
+# A failing job is retried after 10 s, 20 s, 40 s, ... and kept as failed after the last attempt
+JOBS_RETRY_DELAY = 10
+JOBS_MAX_ATTEMPTS = 5
+
+
+# Response compression (core/compression.py): brotli (pip install brotli) or gzip.
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Smaller bodies are sent as they are
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+# Levels for dynamic responses: most of the size win for a fraction of the maximum's CPU
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+
+# Rate limiting (core/throttling.py): token buckets of "<requests>/<s|min|hour|day>",
+# the burst being the same number. Per process (see core/throttling.py).
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Per user (per IP when anonymous); 'user' applies to every API request
+THROTTLE_RATES = {
+    'user': '1200/min',
+    'catalogue': '300/min',     # GET /api/projects/
+    'apply': '20/min',          # POST /api/applications/ (a student needs 3, plus withdrawals)
+    'login': '20/min',          # POST /api/auth/login/, per client IP
+    # Per username, from any IP: also lets anyone keep an account from logging in
+    # with a stream of wrong passwords. None drops it (per-IP buckets only).
+    'login_username': os.environ.get('THROTTLE_LOGIN_USERNAME_RATE', '20/min') or None,
 }
+# Shared by all users of the endpoint
+THROTTLE_ENDPOINT_RATES = {
+    'apply': os.environ.get('THROTTLE_APPLY_RATE', '200/s'),
+}
+
+# Admission control for application creates: this many run at once (SQLite has
+# a single writer), up to ADMISSION_QUEUE_SIZE more wait at most
+# ADMISSION_MAX_WAIT seconds for a slot, the rest get 503 + Retry-After.
+ADMISSION_CONTROL = os.environ.get('ADMISSION_CONTROL', 'true').lower() in ('1', 'true', 'yes')
+ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', 2))
+ADMISSION_QUEUE_SIZE = int(os.environ.get('ADMISSION_QUEUE_SIZE', 32))
+ADMISSION_MAX_WAIT = float(os.environ.get('ADMISSION_MAX_WAIT', 2))
 
 
 # Password validation
@@ -105,6 +292,40 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (core/hashers.py, core/passwords.py)
+# PASSWORD_HASHER picks the hasher for new passwords: pbkdf2 (default), scrypt
+# or argon2 (needs argon2-cffi). The others stay installed to verify existing
+# hashes, which are upgraded on the user's next login.
+# PASSWORD_HASH_COST_PARAMS overrides the cost of the chosen hasher, e.g.
+#   PASSWORD_HASHER=scrypt PASSWORD_HASH_COST_PARAMS=work_factor=65536
+# Measure before changing it: python manage.py bench_login
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': ('pbkdf2_sha256', 'core.hashers.TunedPBKDF2PasswordHasher'),
+    'scrypt': ('scrypt', 'core.hashers.TunedScryptPasswordHasher'),
+    'argon2': ('argon2', 'core.hashers.TunedArgon2PasswordHasher'),
+}
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER][1]] + [
+    path for name, (_, path) in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+]
+# Keyed by algorithm; anything not listed keeps Django's default cost
+PASSWORD_HASH_COST = {
+    'pbkdf2_sha256': {'iterations': 1_000_000},
+    'scrypt': {'work_factor': 2 ** 15, 'block_size': 8, 'parallelism': 1},
+    'argon2': {'time_cost': 2, 'memory_cost': 64 * 1024, 'parallelism': 1},
+}
+PASSWORD_HASH_COST[PASSWORD_HASHER_CHOICES[PASSWORD_HASHER][0]].update(
+    (key, int(value)) for key, value in (
+        item.split('=', 1) for item in os.environ.get('PASSWORD_HASH_COST_PARAMS', '').split(',') if item
+    )
+)
+# Hashing / verification runs on a bounded thread pool (hashlib and argon2
+# release the GIL): at most this many passwords are hashed at once, the rest
+# queue, and async logins never block the event loop. Defaults to the CPU count.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) or os.cpu_count() or 1
+
+AUTHENTICATION_BACKENDS = ['core.backends.PooledModelBackend']
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -154,15 +375,22 @@ CSRF_USE_SESSIONS = False
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication with token users for reads (core/tokens.py)
+        'core.tokens.TokenUserAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Compact JSON through orjson when installed (core/renderers.py);
+    # the browsable HTML API only while developing
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.renderers.FastJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
+    # Token buckets, see THROTTLE_RATES below
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
     ],
 }
 
@@ -176,4 +404,20 @@ SIMPLE_JWT = {
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
-}
\ No newline at end of file
+    "TOKEN_OBTAIN_SERIALIZER": "core.serializers.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.serializers.RoleTokenRefreshSerializer",
+}
+
+# Token users (core/tokens.py): reads with an access token whose claims are
+# current skip the User query. Claims go stale when the user's token
+# generation is bumped; the current generation is cached this many seconds.
+JWT_TOKEN_USER = os.environ.get('JWT_TOKEN_USER', 'true').lower() in ('1', 'true', 'yes')
+TOKEN_GENERATION_TTL = 300
+
+# Seconds a resolved user role (student/faculty/committee) stays in the
+# process-local cache; profile changes invalidate it immediately
+ROLE_CACHE_TTL = 300
+# Committee review quorum (core/reviews.py): a project is approved or rejected
+# once one side has a majority of this many votes (3 -> 2 matching votes).
+# 1 keeps single-reviewer decisions.
+REVIEW_QUORUM_SIZE = int(os.environ.get('REVIEW_QUORUM_SIZE', 1))
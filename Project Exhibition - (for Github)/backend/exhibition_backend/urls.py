@@ -16,18 +16,18 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
+from core.async_views import login
+from core.compression import uncompressed
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),   # your app routes
 
     # JWT authentication endpoints
-    path('api/auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    # Token responses are never compressed (BREACH, see core/compression.py)
+    path('api/auth/login/', uncompressed(login), name='token_obtain_pair'),
+    path('api/auth/refresh/', uncompressed(TokenRefreshView.as_view()), name='token_refresh'),
 ]
 
 
@@ -41,8 +41,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 const data = await response.json();
                 console.log('Login successful:', data);
 
-                // Verify user's actual role by checking their profile
-                const actualRole = await verifyUserRole(data.access);
+                // The login response carries the /api/me/ payload (role + profiles)
+                const actualRole = data.me.role;
                 
                 if (actualRole !== role) {
                     throw new Error(`Access denied: You are a ${actualRole}, not a ${role}`);
@@ -52,9 +52,12 @@ document.addEventListener('DOMContentLoaded', function() {
                 localStorage.setItem("access", data.access);
                 localStorage.setItem("refresh", data.refresh);
                 localStorage.setItem("currentUser", JSON.stringify({
-                    username: username,
+                    id: data.me.id,
+                    username: data.me.username,
                     role: actualRole,
-                    name: username
+                    name: data.me.name,
+                    department: data.me.faculty ? data.me.faculty.department : null,
+                    committee: data.me.committee
                 }));
 
                 // Redirect based on actual role
@@ -94,62 +97,12 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
-// Verify user role by checking their profiles
-async function verifyUserRole(token) {
-    try {
-        // Check if user is a student
-        const studentResponse = await fetch("http://127.0.0.1:8000/api/students/", {
-            headers: {
-                "Authorization": `Bearer ${token}`,
-                "Content-Type": "application/json"
-            }
-        });
-
-        if (studentResponse.ok) {
-            const students = await studentResponse.json();
-            const currentUserId = getCurrentUserId(token);
-            if (students.some(student => student.user === currentUserId)) {
-                return 'student';
-            }
-        }
-
-        // Check if user is faculty
-        const facultyResponse = await fetch("http://127.0.0.1:8000/api/faculty/", {
-            headers: {
-                "Authorization": `Bearer ${token}`,
-                "Content-Type": "application/json"
-            }
-        });
-
-        if (facultyResponse.ok) {
-            const faculties = await facultyResponse.json();
-            const currentUserId = getCurrentUserId(token);
-            if (faculties.some(faculty => faculty.user === currentUserId)) {
-                return 'faculty';
-            }
-        }
-
-        throw new Error('Unable to determine user role');
-    } catch (error) {
-        console.error('Role verification failed:', error);
-        throw new Error('Role verification failed');
-    }
-}
-
-// Helper function to get user ID from JWT token
-function getCurrentUserId(token) {
-    try {
-        const payload = JSON.parse(atob(token.split('.')[1]));
-        return payload.user_id;
-    } catch (e) {
-        return null;
-    }
-}
-
-// Load projects for student dashboard
-async function loadProjects() {
+// Load projects for student dashboard.
+// The catalogue is cursor-paginated: pass the `next` URL of the previous page to append more cards.
+async function loadProjects(pageUrl = null) {
     const projectsList = document.getElementById("projectsList");
     if (!projectsList) return;
+    const append = pageUrl !== null;
 
     // Check if user is actually a student
     const userData = JSON.parse(localStorage.getItem('currentUser'));
@@ -163,7 +116,8 @@ async function loadProjects() {
     try {
         const token = localStorage.getItem("access");
         
-        const response = await fetch("http://127.0.0.1:8000/api/projects/", {
+        // Only the fields the cards show; the next-page link keeps the same fieldset
+        const response = await fetch(pageUrl || "http://127.0.0.1:8000/api/projects/?fields=id,title,abstract,timeline,difficulty,seats,seats_available", {
             headers: {
                 "Authorization": `Bearer ${token}`,
                 "Content-Type": "application/json"
@@ -180,18 +134,26 @@ async function loadProjects() {
             throw new Error(`HTTP ${response.status}`);
         }
 
-        const projects = await response.json();
-        console.log('Projects loaded:', projects);
+        const page = await response.json();
+        console.log('Projects loaded:', page);
 
-        // Filter only approved projects
-        const approvedProjects = projects.filter(project => project.is_approved === true);
+        // The server only returns approved projects to students
+        const approvedProjects = page.results;
 
-        if (approvedProjects.length === 0) {
+        if (!append && approvedProjects.length === 0) {
             projectsList.innerHTML = '<div class="empty-state"><h3>No Approved Projects</h3><p>No projects are currently approved for applications.</p></div>';
             return;
         }
 
-        projectsList.innerHTML = '';
+        if (!append) {
+            projectsList.innerHTML = '';
+        }
+        const existingLoadMore = document.getElementById("loadMoreProjects");
+        if (existingLoadMore) existingLoadMore.remove();
+
+        // Per-project flags for this student: applied / seats full / limit reached
+        const eligibility = page.eligibility || {};
+
         approvedProjects.forEach(project => {
             const projectCard = document.createElement('div');
             projectCard.className = 'project-card';
@@ -199,6 +161,11 @@ async function loadProjects() {
             const seatsInfo = project.seats_available > 0 ? 
                 `<span style="color: green;">Seats Available: ${project.seats_available}</span>` :
                 `<span style="color: red;">No Seats Available</span>`;
+            const flags = eligibility[project.id] || { can_apply: project.seats_available > 0 };
+            const buttonLabel = flags.can_apply ? 'Apply'
+                : flags.applied ? 'Applied'
+                : flags.limit_reached ? 'Limit reached'
+                : 'Full';
             
             projectCard.innerHTML = `
                 <h3>${project.title}</h3>
@@ -207,15 +174,24 @@ async function loadProjects() {
                 <p><strong>Difficulty:</strong> ${project.difficulty}</p>
                 <p><strong>Total Seats:</strong> ${project.seats}</p>
                 <p>${seatsInfo}</p>
-                <button class="apply-btn" data-id="${project.id}" ${project.seats_available <= 0 ? 'disabled' : ''}>
-                    ${project.seats_available > 0 ? 'Apply' : 'Full'}
+                <button class="apply-btn" data-id="${project.id}" ${flags.can_apply ? '' : 'disabled'}>
+                    ${buttonLabel}
                 </button>
             `;
             projectsList.appendChild(projectCard);
         });
 
-        // Apply button logic
-        document.querySelectorAll(".apply-btn").forEach(btn => {
+        if (page.next) {
+            const loadMoreBtn = document.createElement('button');
+            loadMoreBtn.id = 'loadMoreProjects';
+            loadMoreBtn.textContent = 'Load more projects';
+            loadMoreBtn.addEventListener('click', () => loadProjects(page.next));
+            projectsList.appendChild(loadMoreBtn);
+        }
+
+        // Apply button logic (only bind buttons rendered by this page)
+        projectsList.querySelectorAll(".apply-btn:not([data-bound])").forEach(btn => {
+            btn.dataset.bound = "true";
             btn.addEventListener("click", async () => {
                 if (btn.disabled) return;
                 
@@ -264,7 +240,7 @@ async function loadMyApplications() {
 
     try {
         const token = localStorage.getItem("access");
-        const response = await fetch("http://127.0.0.1:8000/api/applications/my/", {
+        const response = await fetch("http://127.0.0.1:8000/api/applications/my/?fields=project_title,faculty_name,status,applied_at", {
             headers: {
                 "Authorization": `Bearer ${token}`,
                 "Content-Type": "application/json"
@@ -292,7 +268,8 @@ async function loadMyApplications() {
                 };
                 
                 appDiv.innerHTML = `
-                    <h4>Application Status</h4>
+                    <h4>${app.project_title}</h4>
+                    <p><strong>Faculty:</strong> ${app.faculty_name}</p>
                     <p><strong>Status:</strong> <span style="color: ${statusColor[app.status] || '#333'}">${app.status}</span></p>
                     <p><strong>Applied:</strong> ${new Date(app.applied_at).toLocaleDateString()}</p>
                 `;
@@ -308,7 +285,7 @@ async function loadMyApplications() {
 }
 
 // Load projects when page loads (for students)
-document.addEventListener("DOMContentLoaded", loadProjects);
+document.addEventListener("DOMContentLoaded", () => loadProjects());
 document.addEventListener("DOMContentLoaded", loadMyApplications);
 
 // Faculty dashboard functionality
@@ -326,7 +303,8 @@ async function loadFacultyDashboard() {
     try {
         const token = localStorage.getItem("access");
         
-        const response = await fetch("http://127.0.0.1:8000/api/projects/my/", {
+        // One request: counters are maintained server-side (see /api/dashboard/)
+        const response = await fetch("http://127.0.0.1:8000/api/dashboard/", {
             headers: {
                 "Authorization": `Bearer ${token}`,
                 "Content-Type": "application/json"
@@ -340,47 +318,25 @@ async function loadFacultyDashboard() {
         }
 
         if (!response.ok) {
-            throw new Error("Failed to load faculty projects");
+            throw new Error("Failed to load faculty dashboard");
         }
 
-        const projects = await response.json();
-
-        // Update stats
-        const total = projects.length;
-        const approved = projects.filter(p => p.is_approved === true).length;
-        const pending = projects.filter(p => p.status === "pending").length;
-
-        // Get applications count
-        let totalApplications = 0;
-        try {
-            const appsResponse = await fetch("http://127.0.0.1:8000/api/applications/faculty_applications/", {
-                headers: {
-                    "Authorization": `Bearer ${token}`,
-                    "Content-Type": "application/json"
-                }
-            });
-            if (appsResponse.ok) {
-                const applications = await appsResponse.json();
-                totalApplications = applications.length;
-            }
-        } catch (e) {
-            console.log("Could not fetch applications count");
-        }
+        const stats = (await response.json()).faculty;
 
         // Update stat cards
         const statCards = document.querySelectorAll(".stat-card .count");
         if (statCards.length >= 4) {
-            statCards[0].textContent = total;
-            statCards[1].textContent = approved;
-            statCards[2].textContent = pending;
-            statCards[3].textContent = totalApplications;
+            statCards[0].textContent = stats.projects_total;
+            statCards[1].textContent = stats.projects_approved;
+            statCards[2].textContent = stats.projects_pending;
+            statCards[3].textContent = stats.applications_total;
         }
 
         // Show/hide empty state
         const emptyState = document.querySelector(".empty-state");
-        if (projects.length > 0 && emptyState) {
+        if (stats.projects_total > 0 && emptyState) {
             emptyState.style.display = 'none';
-        } else if (projects.length === 0 && emptyState) {
+        } else if (stats.projects_total === 0 && emptyState) {
             emptyState.style.display = 'block';
         }
 
@@ -389,14 +345,16 @@ async function loadFacultyDashboard() {
     }
 }
 
-// Load pending projects for committee review
-async function loadPendingProjects() {
+// Load pending projects for committee review.
+// The queue is cursor-paginated, oldest submission first: pass the `next` URL to append more.
+async function loadPendingProjects(pageUrl = null) {
     const reviewProjectsList = document.getElementById("reviewProjectsList");
     if (!reviewProjectsList) return;
+    const append = pageUrl !== null;
 
     try {
         const token = localStorage.getItem("access");
-        const response = await fetch("http://127.0.0.1:8000/api/projects/pending_review/", {
+        const response = await fetch(pageUrl || "http://127.0.0.1:8000/api/projects/pending_review/", {
             headers: {
                 "Authorization": `Bearer ${token}`,
                 "Content-Type": "application/json"
@@ -404,16 +362,21 @@ async function loadPendingProjects() {
         });
 
         if (response.ok) {
-            const projects = await response.json();
+            const page = await response.json();
+            const projects = page.results;
             
-            if (projects.length === 0) {
+            if (!append && projects.length === 0) {
                 reviewProjectsList.innerHTML = `<p>No projects pending review.</p>`;
                 document.getElementById("noReviewProjects").style.display = 'block';
                 return;
             }
 
             document.getElementById("noReviewProjects").style.display = 'none';
-            reviewProjectsList.innerHTML = "";
+            if (!append) {
+                reviewProjectsList.innerHTML = "";
+            }
+            const existingLoadMore = document.getElementById("loadMoreReview");
+            if (existingLoadMore) existingLoadMore.remove();
             
             projects.forEach(project => {
                 const projectDiv = document.createElement("div");
@@ -438,6 +401,14 @@ async function loadPendingProjects() {
                 `;
                 reviewProjectsList.appendChild(projectDiv);
             });
+
+            if (page.next) {
+                const loadMoreBtn = document.createElement('button');
+                loadMoreBtn.id = 'loadMoreReview';
+                loadMoreBtn.textContent = 'Load more projects';
+                loadMoreBtn.addEventListener('click', () => loadPendingProjects(page.next));
+                reviewProjectsList.appendChild(loadMoreBtn);
+            }
         } else {
             reviewProjectsList.innerHTML = `<p>Error loading projects for review.</p>`;
         }
@@ -460,7 +431,9 @@ window.approveProject = async function(projectId) {
         });
 
         if (response.ok) {
-            alert("Project approved successfully!");
+            // With a review quorum the vote may not decide the project yet
+            const result = await response.json();
+            alert(result.message || "Project approved successfully!");
             loadPendingProjects(); // Reload the list
         } else {
             const error = await response.json();
@@ -484,7 +457,9 @@ window.rejectProject = async function(projectId) {
         });
 
         if (response.ok) {
-            alert("Project rejected successfully!");
+            // With a review quorum the vote may not decide the project yet
+            const result = await response.json();
+            alert(result.message || "Project rejected successfully!");
             loadPendingProjects(); // Reload the list
         } else {
             const error = await response.json();
@@ -498,4 +473,61 @@ window.rejectProject = async function(projectId) {
 
 // Load faculty dashboard when page loads
 document.addEventListener("DOMContentLoaded", loadFacultyDashboard);
-document.addEventListener("DOMContentLoaded", loadPendingProjects);
\ No newline at end of file
+document.addEventListener("DOMContentLoaded", () => loadPendingProjects());
+// Live updates: the server pushes application / review status changes as
+// server-sent events (/api/events/, ASGI server only), and the page refetches
+// the list that changed instead of waiting for a manual reload.
+// Bursts (e.g. a batch allocation) are coalesced into one refetch.
+async function subscribeToUpdates(refreshers, reopened = false) {
+    const token = localStorage.getItem("access");
+    if (!token || !window.EventSource) return;
+    const reconnect = () => setTimeout(() => subscribeToUpdates(refreshers, true), 5000);
+
+    // The stream is opened with a single-use ticket, so the access token never appears in a URL
+    let ticket;
+    try {
+        const response = await fetch("http://127.0.0.1:8000/api/events/ticket/", {
+            method: "POST",
+            headers: { "Authorization": `Bearer ${token}` }
+        });
+        if (!response.ok) return;   // logged out or token expired
+        ticket = (await response.json()).ticket;
+    } catch (error) {
+        reconnect();
+        return;
+    }
+
+    const source = new EventSource(`http://127.0.0.1:8000/api/events/?ticket=${encodeURIComponent(ticket)}`);
+    const timers = new Map();
+    Object.entries(refreshers).forEach(([eventType, refresh]) => {
+        source.addEventListener(eventType, () => {
+            clearTimeout(timers.get(refresh));
+            timers.set(refresh, setTimeout(() => refresh(), 300));
+        });
+    });
+    // Events sent while the stream was down are lost: refetch once it is back
+    source.addEventListener("open", () => {
+        if (reopened) new Set(Object.values(refreshers)).forEach(refresh => refresh());
+    });
+    // The ticket is spent: reconnect with a new one (the server also ends streams whose token went stale)
+    source.onerror = () => {
+        source.close();
+        reconnect();
+    };
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    if (document.getElementById("myApplicationsList")) {
+        subscribeToUpdates({"application.status": loadMyApplications});
+    } else if (document.getElementById("reviewProjectsList") && document.getElementById("noReviewProjects")) {
+        subscribeToUpdates({
+            "project.pending": () => loadPendingProjects(),
+            "project.status": () => loadPendingProjects(),
+        });
+    } else if (document.getElementById("facultyProjectsContainer")) {
+        subscribeToUpdates({
+            "application.created": loadFacultyDashboard,
+            "project.status": loadFacultyDashboard,
+        });
+    }
+});